@@ -0,0 +1,81 @@
+""" accesor.py
+
+Accesor de pandas df.psicro que agrega las variables psicrométricas (PVS, PV, WS, W, MU, VEH, TPR,
+H, TBH) como columnas de un DataFrame. Las columnas de temperatura, humedad relativa y presión se
+leen como arreglos de NumPy (sin copiar si ya son float64) y se calculan con
+variables_psicrometricas_np, sin listas intermedias.
+
+Al importar este módulo se registra el accesor. Por defecto se usan los nombres de columna de las
+EMA (carga_datos.COLUMNAS_EMA), RH en porcentaje y P en hPa.
+
+Example
+    >>> import pandas as pd
+    >>> import accesor
+    >>> df = pd.read_csv("zacatecas.csv", encoding="latin-1", names=["TBS", "RH", "P"], header=0)
+    >>> df.psicro.calcular(tbs="TBS", RH="RH", P="P").head()
+    >>> for trozo in accesor.por_trozos(pd.read_csv(..., chunksize=100_000), tbs="TBS", RH="RH", P="P"):
+    ...     trozo.to_csv("salida.csv", mode="a")
+"""
+
+import numpy as np
+import pandas as pd
+
+import variables_psicrometricas_np as vpn
+from carga_datos import COLUMNAS_EMA
+
+#Factor para convertir cada unidad a las de variables_psicrometricas_np (fracción y kPa)
+UNIDADES_RH = {'%': 1/100, 'fraccion': 1}
+UNIDADES_P = {'hPa': 1/10, 'kPa': 1, 'Pa': 1/1000}
+
+def _columna(df: pd.DataFrame, nombre: str) -> np.ndarray:
+    return df[nombre].to_numpy(dtype=float, copy=False)
+
+@pd.api.extensions.register_dataframe_accessor("psicro")
+class Psicro:
+    """
+    Accesor df.psicro con las variables psicrométricas de un DataFrame.
+    """
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+
+    def propiedades(self, tbs: str = COLUMNAS_EMA['TBS'], RH: str = COLUMNAS_EMA['RH'], P: str = COLUMNAS_EMA['P'],
+                    unidades_RH: str = '%', unidades_P: str = 'hPa', P_atm: float = None,
+                    columnas: tuple = vpn.COLUMNAS, precision: str = 'estandar') -> dict:
+        """
+        Retorna las variables psicrométricas de las filas del DataFrame sin modificarlo.
+
+        Args:
+            tbs: Columna de temperatura de bulbo seco en °C
+            RH: Columna de humedad relativa
+            P: Columna de presión atmosférica (se ignora si se da P_atm)
+            unidades_RH: '%' o 'fraccion'
+            unidades_P: 'hPa', 'kPa' o 'Pa'
+            P_atm: Presión atmosférica constante en kPa (opcional, para datos sin columna de presión)
+            columnas: Variables a calcular (subconjunto de variables_psicrometricas_np.COLUMNAS)
+            precision: Nivel de precisión de TPR y TBH (llave de variables_psicrometricas_np.PRECISIONES)
+
+        Returns:
+            Diccionario de arreglos con las llaves de columnas
+        """
+        df = self._df
+        if P_atm is None:
+            P_atm = _columna(df, P) * UNIDADES_P[unidades_P]
+        return vpn.propiedades(_columna(df, tbs), _columna(df, RH) * UNIDADES_RH[unidades_RH], P_atm, columnas,
+                               precision=precision)
+
+    def calcular(self, prefijo: str = '', **kwargs) -> pd.DataFrame:
+        """
+        Agrega las variables psicrométricas como columnas del DataFrame (con el prefijo dado) y lo
+        retorna. Recibe los mismos argumentos que propiedades().
+        """
+        for columna, valores in self.propiedades(**kwargs).items():
+            self._df[prefijo + columna] = valores
+        return self._df
+
+def por_trozos(lector, **kwargs):
+    """
+    Generador que agrega las variables psicrométricas a cada trozo de un iterador de DataFrames,
+    por ejemplo pd.read_csv(..., chunksize=n). Recibe los mismos argumentos que Psicro.calcular().
+    """
+    for trozo in lector:
+        yield trozo.psicro.calcular(**kwargs)
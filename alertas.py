@@ -0,0 +1,193 @@
+""" alertas.py
+
+Alertas de condensación y helada evaluadas de forma incremental sobre lecturas en vivo. Cada regla
+compara una variable (temperatura de punto de rocío, margen entre la temperatura de una superficie
+y el punto de rocío, bulbo humedo, ...) con un umbral y exige que la condición se mantenga durante
+un tiempo mínimo; la alerta termina cuando la variable sale del umbral más una histéresis.
+
+El estado de cada regla y estación son dos valores (inicio de la condición y si la alerta está
+activa), guardados en arreglos (regla × estación), de modo que una lectura de miles de estaciones
+se evalúa en una sola llamada vectorizada y los eventos se emiten en la misma lectura en la que
+se cumple la duración.
+
+Example
+    >>> import numpy as np
+    >>> import alertas
+    >>> motor = alertas.Alertas(["ZACATECAS", "FRESNILLO"])
+    >>> motor.actualizar(["ZACATECAS", "FRESNILLO"], np.datetime64("2023-01-10T06:00"),
+    ...                  TBS=[-0.4, 4.0], RH=[95, 60], P=[779.5, 801.2], T_superficie=[-0.5, 3.0])
+    [{'estacion': 'ZACATECAS', 'regla': 'Helada', 'tipo': 'inicio', 'fecha': ..., 'valor': -0.719...}]
+"""
+
+import numpy as np
+
+import variables_psicrometricas_np as vpn
+
+#Reglas: la condición es variable <= umbral (o >=) durante al menos 'duracion' minutos;
+#la alerta termina cuando la variable se aleja del umbral más de 'histeresis'
+REGLAS = [
+    {
+        'nombre': 'Condensación',
+        'variable': 'MARGEN_ROCIO',     #Temperatura de la superficie menos punto de rocío (°C)
+        'condicion': '<=',
+        'umbral': 1.0,
+        'duracion': 30,
+        'histeresis': 0.5,
+    },
+    {
+        'nombre': 'Helada',
+        'variable': 'TBH',
+        'condicion': '<=',
+        'umbral': 0.0,
+        'duracion': 0,
+        'histeresis': 0.5,
+    },
+]
+
+#Comparaciones de las reglas y signo de la histéresis
+CONDICIONES = {
+    '<=': (np.less_equal, 1),
+    '>=': (np.greater_equal, -1),
+}
+
+NAT = np.datetime64('NaT', 's')
+
+def variables(nombres: set, TBS, RH, P_atm, T_superficie=None, precision: str = 'estandar') -> dict:
+    """
+    Retorna las variables que usan las reglas, calculando solo las pedidas.
+
+    Args:
+        nombres: Variables pedidas ('TBS', 'RH', 'TPR', 'TBH', 'MARGEN_ROCIO', 'VPD')
+        TBS: Temperatura de bulbo seco en °C
+        RH: Humedad relativa en fracción
+        P_atm: Presión atmosférica en kPa
+        T_superficie: Temperatura de la superficie u hoja en °C (por defecto, TBS)
+        precision: Nivel de precisión de TPR y TBH
+
+    Returns:
+        Diccionario de arreglos
+    """
+    TBS = np.asarray(TBS, dtype=float)
+    RH = np.asarray(RH, dtype=float)
+    valores = {'TBS': TBS, 'RH': RH}
+    if nombres & {'TPR', 'MARGEN_ROCIO', 'VPD'}:
+        pv = vpn.presion_vapor(RH, TBS)
+        valores['TPR'] = vpn.temp_punto_rocio(TBS, pv, precision=precision)
+        valores['VPD'] = vpn.pres_vapor_sat(TBS) - pv
+    if 'MARGEN_ROCIO' in nombres:
+        superficie = TBS if T_superficie is None else np.asarray(T_superficie, dtype=float)
+        valores['MARGEN_ROCIO'] = superficie - valores['TPR']
+    if 'TBH' in nombres:
+        valores['TBH'] = vpn.temp_bulbo_humedo(TBS, RH, P_atm, precision=precision)
+    return valores
+
+
+class Alertas:
+    """
+    Motor de reglas incremental para un conjunto de estaciones.
+
+    Args:
+        estaciones: Identificadores de las estaciones
+        reglas: Lista de reglas (ver REGLAS)
+        precision: Nivel de precisión de TPR y TBH (llave de variables_psicrometricas_np.PRECISIONES)
+    """
+    def __init__(self, estaciones: list, reglas: list = REGLAS, precision: str = 'estandar'):
+        self.estaciones = list(estaciones)
+        self.indice = {estacion: i for i, estacion in enumerate(self.estaciones)}
+        self.reglas = reglas
+        self.precision = precision
+        self.nombres = {regla['variable'] for regla in reglas}
+
+        forma = (len(reglas), len(self.estaciones))
+        self.inicio = np.full(forma, NAT)               #Inicio de la condición de cada regla
+        self.activa = np.zeros(forma, dtype=bool)       #Alerta activa
+        self.ultima = np.full(len(self.estaciones), NAT)
+
+    def actualizar(self, estaciones: list, fecha, TBS, RH, P, T_superficie=None) -> list:
+        """
+        Evalúa una lectura de varias estaciones y retorna los eventos generados.
+
+        Args:
+            estaciones: Identificadores de las estaciones de la lectura
+            fecha: Fecha (datetime64) de la lectura, una para todas o una por estación
+            TBS: Temperatura de bulbo seco en °C
+            RH: Humedad relativa en porcentaje
+            P: Presión atmosférica en hPa
+            T_superficie: Temperatura de la superficie u hoja en °C (opcional)
+
+        Returns:
+            Lista de eventos {'estacion', 'regla', 'tipo' ('inicio' o 'fin'), 'fecha', 'desde', 'valor'}
+        """
+        i = np.array([self.indice[estacion] for estacion in estaciones], dtype=int)
+        #Cada estación avanza una vez por lectura; varias lecturas de una estación se envían por separado
+        unicas, veces = np.unique(i, return_counts=True)
+        if (veces > 1).any():
+            repetidas = [self.estaciones[j] for j in unicas[veces > 1]]
+            raise ValueError(f"Estaciones repetidas en la misma lectura: {', '.join(map(str, repetidas))}")
+        fecha = np.broadcast_to(np.asarray(fecha, dtype='datetime64[s]'), i.shape)
+
+        #Las lecturas repetidas o fuera de orden se ignoran
+        nueva = np.isnat(self.ultima[i]) | (fecha > self.ultima[i])
+        self.ultima[i] = np.where(nueva, fecha, self.ultima[i])
+
+        valores = variables(self.nombres, TBS, np.asarray(RH, dtype=float)/100, np.asarray(P, dtype=float)/10,
+                            T_superficie, self.precision)
+
+        eventos = []
+        for k, regla in enumerate(self.reglas):
+            comparar, signo = CONDICIONES[regla['condicion']]
+            x = np.broadcast_to(valores[regla['variable']], i.shape)
+            dato = nueva & ~np.isnan(x)
+            with np.errstate(invalid='ignore'):
+                cumple = dato & comparar(x, regla['umbral'])
+                libera = dato & ~comparar(x, regla['umbral'] + signo*regla['histeresis'])
+
+            inicio = self.inicio[k, i]
+            activa = self.activa[k, i]
+
+            #Sin alerta: la condición inicia o reinicia el tiempo; con alerta: solo la histéresis la termina
+            inicio = np.where(cumple & np.isnat(inicio), fecha, inicio)
+            inicio = np.where(dato & ~cumple & ~activa, NAT, inicio)
+            duracion = np.where(np.isnat(inicio), -1, (fecha - inicio).astype('timedelta64[s]').astype(float)/60)
+            empieza = ~activa & cumple & (duracion >= regla['duracion'])
+            termina = activa & libera
+
+            eventos += self._eventos(i, regla, 'inicio', empieza, fecha, inicio, x)
+            eventos += self._eventos(i, regla, 'fin', termina, fecha, inicio, x)
+
+            self.inicio[k, i] = np.where(termina, NAT, inicio)
+            self.activa[k, i] = (activa | empieza) & ~termina
+
+        return eventos
+
+    def _eventos(self, i, regla: dict, tipo: str, mascara, fecha, inicio, x) -> list:
+        return [{'estacion': self.estaciones[i[j]], 'regla': regla['nombre'], 'tipo': tipo,
+                 'fecha': fecha[j], 'desde': inicio[j], 'valor': float(x[j])}
+                for j in np.flatnonzero(mascara)]
+
+    def activas(self) -> dict:
+        """
+        Retorna {regla: [estaciones con la alerta activa]}.
+        """
+        return {regla['nombre']: [self.estaciones[j] for j in np.flatnonzero(self.activa[k])]
+                for k, regla in enumerate(self.reglas)}
+
+def reproducir(ruta: str, reglas: list = REGLAS, precision: str = 'estandar'):
+    """
+    Generador que reproduce un archivo de EMA en orden cronológico, lectura por lectura, y
+    produce los eventos de las reglas. Sirve para probar reglas con datos históricos.
+    """
+    import os
+
+    import carga_datos
+
+    nombres = carga_datos.COLUMNAS_EMA
+    datos = carga_datos.cargar(ruta)
+    fecha = np.asarray(datos[nombres['FECHA']])
+    orden = np.argsort(fecha, kind='stable')
+
+    estacion = os.path.splitext(os.path.basename(ruta))[0]
+    motor = Alertas([estacion], reglas, precision)
+    for j in orden:
+        yield from motor.actualizar([estacion], fecha[j], [datos[nombres['TBS']][j]], [datos[nombres['RH']][j]],
+                                    [datos[nombres['P']][j]])
@@ -0,0 +1,274 @@
+""" almacen.py
+
+Almacén de datos de estación ordenados por fecha. Las exportaciones de las EMA vienen de la más
+reciente a la más antigua y cada una repite parte de la anterior; al importarlas se ordenan por
+fecha, se descartan las lecturas que ya estaban y las nuevas se guardan como un segmento más (un
+archivo .npy por columna), sin reescribir los segmentos anteriores.
+
+Un índice (indice.json) guarda las columnas, los metadatos de la estación y el intervalo de fechas
+de cada segmento. Una consulta por rango de fechas solo abre los segmentos que lo intersectan, busca
+los límites con búsqueda binaria sobre la columna de fechas (abierta con memory mapping) y lee solo
+esas filas; con un solo segmento el resultado son vistas del archivo, sin copias.
+
+Example
+    >>> import almacen
+    >>> estacion = almacen.importar("Estacion_ZACATECAS_EMA.csv")      #Crea estaciones/ZACATECAS_EMA
+    >>> estacion.importar("Estacion_ZACATECAS_EMA_febrero.csv")         #Solo agrega las lecturas nuevas
+    >>> abril = estacion.mes(2023, 4, ['TBS', 'RH', 'P'])
+    >>> invierno = estacion.meses((12, 1, 2), ['TBS', 'RH'])
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+import carga_datos
+
+#Directorio por defecto del almacén (un subdirectorio por estación)
+DIRECTORIO = "estaciones"
+
+#Subdirectorio de la estación con la caché de carga_datos de los archivos importados
+CACHE = ".cache"
+
+#Columna de fechas y resolución con la que se guarda
+FECHA = carga_datos.COLUMNAS_EMA['FECHA']
+UNIDAD = 'datetime64[s]'
+
+def _escribir_json(ruta: str, datos: dict) -> None:
+    #Se escribe en un archivo temporal y se renombra, para no dejar el índice incompleto
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            json.dump(datos, file, ensure_ascii=False, indent=1)
+        os.replace(temporal, ruta)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+
+class Almacen:
+    """
+    Datos de una estación guardados en segmentos ordenados por fecha.
+
+    Args:
+        directorio: Directorio de la estación (se crea al importar el primer archivo)
+    """
+    def __init__(self, directorio: str):
+        self.directorio = directorio
+        self.archivo_indice = os.path.join(directorio, "indice.json")
+        if os.path.exists(self.archivo_indice):
+            with open(self.archivo_indice, "r", encoding="utf-8") as file:
+                self.indice = json.load(file)
+        else:
+            self.indice = {"metadatos": {}, "columnas": [], "segmentos": []}
+        self._fechas = {}
+
+    def __len__(self) -> int:
+        return sum(segmento["filas"] for segmento in self.indice["segmentos"])
+
+    @property
+    def columnas(self) -> list:
+        return list(self.indice["columnas"])
+
+    @property
+    def metadatos(self) -> dict:
+        return dict(self.indice["metadatos"])
+
+    @property
+    def desde(self) -> np.datetime64:
+        segmentos = self.indice["segmentos"]
+        return min(np.datetime64(s["desde"]) for s in segmentos) if segmentos else np.datetime64('NaT')
+
+    @property
+    def hasta(self) -> np.datetime64:
+        segmentos = self.indice["segmentos"]
+        return max(np.datetime64(s["hasta"]) for s in segmentos) if segmentos else np.datetime64('NaT')
+
+    def _columna(self, segmento: dict, nombre: str) -> np.ndarray:
+        """
+        Retorna una columna de un segmento con memory mapping; si el segmento no la tiene, NaN.
+        """
+        if nombre not in segmento["columnas"]:
+            return np.full(segmento["filas"], np.nan)
+        return np.load(os.path.join(self.directorio, segmento["nombre"], segmento["columnas"][nombre]), mmap_mode="r")
+
+    def _fecha(self, segmento: dict) -> np.ndarray:
+        if segmento["nombre"] not in self._fechas:
+            self._fechas[segmento["nombre"]] = self._columna(segmento, FECHA)
+        return self._fechas[segmento["nombre"]]
+
+    def importar(self, ruta: str, encoding: str = "latin-1") -> int:
+        """
+        Agrega las lecturas de una exportación que no estén ya en el almacén.
+
+        Args:
+            ruta: Archivo .xlsx, .xls o .csv de la EMA
+            encoding: Codificación de los archivos CSV
+
+        Returns:
+            Número de lecturas agregadas
+        """
+        #La caché de la conversión queda dentro del almacén y no en el directorio de trabajo
+        datos = carga_datos.cargar(ruta, encoding=encoding, directorio=os.path.join(self.directorio, CACHE))
+        fecha = np.asarray(datos[FECHA], dtype=UNIDAD)
+        orden = np.argsort(fecha, kind='stable')
+        fecha = fecha[orden]
+
+        #Lecturas nuevas: fecha válida, no repetida en el archivo y no presente en ningún segmento
+        nueva = ~np.isnat(fecha)
+        nueva[1:] &= fecha[1:] != fecha[:-1]
+        for segmento in self.indice["segmentos"]:
+            existentes = self._fecha(segmento)
+            i = np.clip(np.searchsorted(existentes, fecha), 0, len(existentes) - 1)
+            nueva &= existentes[i] != fecha
+        if not nueva.any():
+            return 0
+        filas = orden[nueva]
+
+        if not self.indice["segmentos"]:
+            self.indice["metadatos"] = carga_datos.metadatos(ruta, encoding) if ruta.lower().endswith(".csv") else {}
+        os.makedirs(self.directorio, exist_ok=True)
+        numero = max((int(s["nombre"][1:]) for s in self.indice["segmentos"]), default=-1) + 1
+        nombre = f"s{numero:05d}"
+
+        #Se escribe en un directorio temporal y se renombra, para no dejar segmentos incompletos
+        temporal = tempfile.mkdtemp(dir=self.directorio)
+        try:
+            columnas = {}
+            for i, columna in enumerate(datos):
+                valores = np.asarray(datos[columna])[filas]
+                if columna == FECHA:
+                    valores = valores.astype(UNIDAD)
+                columnas[columna] = f"c{i}.npy"
+                np.save(os.path.join(temporal, columnas[columna]), valores, allow_pickle=False)
+            os.replace(temporal, os.path.join(self.directorio, nombre))
+        finally:
+            shutil.rmtree(temporal, ignore_errors=True)
+
+        self.indice["columnas"] += [c for c in columnas if c not in self.indice["columnas"]]
+        self.indice["segmentos"].append({
+            "nombre": nombre,
+            "origen": os.path.abspath(ruta),
+            "filas": len(filas),
+            "desde": str(fecha[nueva][0]),
+            "hasta": str(fecha[nueva][-1]),
+            "columnas": columnas,
+        })
+        _escribir_json(self.archivo_indice, self.indice)
+        return len(filas)
+
+    def rango(self, desde=None, hasta=None, columnas: list = None) -> dict:
+        """
+        Retorna las lecturas con desde <= fecha < hasta, ordenadas por fecha.
+
+        Args:
+            desde: Fecha inicial (datetime64 o texto ISO), None para el inicio
+            hasta: Fecha final, sin incluir, None para el final
+            columnas: Columnas que se leen (nombres del archivo o llaves de carga_datos.COLUMNAS_EMA);
+                la fecha siempre se incluye
+
+        Returns:
+            Diccionario {columna: arreglo} con las columnas como se pidieron
+        """
+        #Llave del resultado (como se pidió) y nombre de la columna en el almacén
+        pedidas = {FECHA: FECHA}
+        for c in columnas or self.indice["columnas"]:
+            pedidas.setdefault(c if carga_datos.COLUMNAS_EMA.get(c, c) != FECHA else FECHA, carga_datos.COLUMNAS_EMA.get(c, c))
+        desde = None if desde is None else np.datetime64(desde, 's')
+        hasta = None if hasta is None else np.datetime64(hasta, 's')
+
+        #Solo se abren los segmentos cuyo intervalo intersecta el rango
+        partes = []
+        for segmento in self.indice["segmentos"]:
+            if desde is not None and np.datetime64(segmento["hasta"]) < desde:
+                continue
+            if hasta is not None and np.datetime64(segmento["desde"]) >= hasta:
+                continue
+            fecha = self._fecha(segmento)
+            i = 0 if desde is None else np.searchsorted(fecha, desde, side='left')
+            j = len(fecha) if hasta is None else np.searchsorted(fecha, hasta, side='left')
+            if j > i:
+                partes.append({c: self._columna(segmento, nombre)[i:j] for c, nombre in pedidas.items()})
+
+        if len(partes) == 1:
+            return partes[0]
+        if not partes:
+            return {c: np.empty(0, dtype=UNIDAD if c == FECHA else float) for c in pedidas}
+
+        #Varios segmentos: se unen y se ordenan por fecha (pueden intercalarse si se llenaron huecos)
+        resultado = {c: np.concatenate([parte[c] for parte in partes]) for c in pedidas}
+        orden = np.argsort(resultado[FECHA], kind='stable')
+        if (np.diff(orden) != 1).any():
+            resultado = {c: x[orden] for c, x in resultado.items()}
+        return resultado
+
+    def mes(self, anio: int, mes: int, columnas: list = None) -> dict:
+        """
+        Retorna las lecturas de un mes.
+        """
+        inicio = np.datetime64(f"{anio:04d}-{mes:02d}", 'M')
+        return self.rango(inicio, inicio + 1, columnas)
+
+    def meses(self, meses: tuple, columnas: list = None) -> dict:
+        """
+        Retorna las lecturas de los meses dados de todos los años (por ejemplo (12, 1, 2) para el
+        invierno), ordenadas por fecha.
+        """
+        if not self.indice["segmentos"]:
+            return self.rango(columnas=columnas)
+        primero = self.desde.astype('datetime64[M]')
+        ultimo = self.hasta.astype('datetime64[M]')
+        partes = [self.rango(m, m + 1, columnas) for m in np.arange(primero, ultimo + 1)
+                  if m.astype(int) % 12 + 1 in meses]
+        if not partes:
+            #Ningún mes del periodo coincide: un rango vacío da las columnas pedidas sin filas
+            return self.rango(primero, primero, columnas)
+        return {c: np.concatenate([parte[c] for parte in partes]) for c in partes[0]}
+
+    def compactar(self) -> None:
+        """
+        Une todos los segmentos en uno solo. Solo es necesario si se acumulan muchos segmentos.
+        """
+        if len(self.indice["segmentos"]) < 2:
+            return
+        anteriores = [segmento["nombre"] for segmento in self.indice["segmentos"]]
+        datos = self.rango()
+        nombre = f"s{max(int(n[1:]) for n in anteriores) + 1:05d}"
+
+        temporal = tempfile.mkdtemp(dir=self.directorio)
+        try:
+            columnas = {}
+            for i, columna in enumerate(self.indice["columnas"]):
+                columnas[columna] = f"c{i}.npy"
+                np.save(os.path.join(temporal, columnas[columna]), datos[columna], allow_pickle=False)
+            os.replace(temporal, os.path.join(self.directorio, nombre))
+        finally:
+            shutil.rmtree(temporal, ignore_errors=True)
+
+        self.indice["segmentos"] = [{
+            "nombre": nombre,
+            "origen": None,
+            "filas": len(datos[FECHA]),
+            "desde": str(datos[FECHA][0]),
+            "hasta": str(datos[FECHA][-1]),
+            "columnas": columnas,
+        }]
+        _escribir_json(self.archivo_indice, self.indice)
+        self._fechas = {}
+        for anterior in anteriores:
+            shutil.rmtree(os.path.join(self.directorio, anterior), ignore_errors=True)
+
+def importar(ruta: str, directorio: str = DIRECTORIO, encoding: str = "latin-1") -> Almacen:
+    """
+    Importa una exportación de EMA al almacén de su estación (el nombre se toma de los metadatos
+    del archivo o, si no tiene, del nombre del archivo) y retorna el almacén.
+    """
+    estacion = carga_datos.metadatos(ruta, encoding).get('Estación') if ruta.lower().endswith(".csv") else None
+    if not estacion:
+        estacion = os.path.splitext(os.path.basename(ruta))[0]
+    almacen = Almacen(os.path.join(directorio, str(estacion)))
+    almacen.importar(ruta, encoding)
+    return almacen
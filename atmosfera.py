@@ -0,0 +1,166 @@
+""" atmosfera.py
+
+Modelo de atmósfera estándar vectorizado (presión y temperatura en función de la altitud) y
+llenado de huecos de la presión medida por las estaciones. La altitud de cada estación se toma del
+encabezado de la exportación de la EMA.
+
+Los huecos cortos de la presión se interpolan linealmente en el tiempo; los largos (y los del inicio
+o final de la serie) se llenan con la presión de la atmósfera estándar a la altitud de la estación
+más la diferencia mediana entre la presión medida y la del modelo, de modo que el valor llenado
+quede en el nivel de la estación. Con datos de forma (tiempo, estación) y una altitud por estación
+todo se calcula en una sola pasada, y el resultado se puede pasar directamente a las funciones de
+variables_psicrometricas_np.
+
+Example
+    >>> import atmosfera
+    >>> atmosfera.presion_altitud([0, 2250, 2270])
+    array([101.325     ,  77.05835542,  76.86605775])
+    >>> P_atm, llenados = atmosfera.rellenar_presion(P/10, atmosfera.altitud("Estacion_ZACATECAS_EMA.csv"), fecha)
+"""
+
+import numpy as np
+
+#Rango de altitud (m) de las correlaciones de ASHRAE
+ALTITUD_MIN = -5000
+ALTITUD_MAX = 11000
+
+#Huecos más largos que este se llenan con el modelo en lugar de interpolar
+HUECO_MAX = np.timedelta64(3, 'h')
+
+def presion_altitud(Z, out=None) -> np.ndarray:
+    """
+    Retorna la presión atmosférica de la atmósfera estándar. Fuera del rango de -5000 a 11000
+    metros el resultado es NaN.
+
+    Args:
+        Z: Altitud en metros
+        out: Arreglo preasignado donde se escribe el resultado (opcional)
+
+    Returns:
+        Presión atmosférica en kPa
+    """
+    Z = np.asarray(Z, dtype=float)
+    with np.errstate(invalid='ignore'):
+        valida = (Z >= ALTITUD_MIN) & (Z <= ALTITUD_MAX)
+    P = np.where(valida, 101.325 * (1 - 2.25577e-05 * np.where(valida, Z, 0))**5.2559, np.nan)
+    if out is None:
+        return P
+    out[...] = P
+    return out
+
+def temperatura_altitud(Z, out=None) -> np.ndarray:
+    """
+    Retorna la temperatura de la atmósfera estándar en °C (NaN fuera del rango de altitud).
+    """
+    Z = np.asarray(Z, dtype=float)
+    with np.errstate(invalid='ignore'):
+        T = np.where((Z >= ALTITUD_MIN) & (Z <= ALTITUD_MAX), 15 - 0.0065*Z, np.nan)
+    if out is None:
+        return T
+    out[...] = T
+    return out
+
+def pres_atm_temp(Z) -> tuple:
+    """
+    Versión vectorizada de variables_psicrometricas.pres_atm_temp.
+
+    Returns:
+        Presión atmosférica en kPa
+        Temperatura en °C
+    """
+    return presion_altitud(Z), temperatura_altitud(Z)
+
+def altitud(ruta: str, encoding: str = "latin-1", defecto: float = None) -> float:
+    """
+    Retorna la altitud en metros del encabezado de una exportación de EMA, o defecto si el
+    archivo no la tiene (si defecto es None se lanza ValueError).
+    """
+    import carga_datos
+
+    Z = carga_datos.metadatos(ruta, encoding).get('Altitud') if ruta.lower().endswith(".csv") else None
+    if isinstance(Z, float):
+        return Z
+    if defecto is None:
+        raise ValueError(f"El archivo no tiene la altitud en el encabezado: {ruta}")
+    return defecto
+
+def rellenar_presion(P_atm, Z, fecha=None, hueco_max=HUECO_MAX) -> tuple:
+    """
+    Llena los datos faltantes (NaN) de la presión atmosférica medida.
+
+    Args:
+        P_atm: Presión atmosférica medida en kPa, de forma (tiempo,) o (tiempo, estación)
+        Z: Altitud en metros, escalar o una por estación
+        fecha: Fechas (datetime64) de cada fila, ordenadas; si no se dan las filas se consideran
+            equiespaciadas y hueco_max es un número de filas
+        hueco_max: Duración máxima (timedelta64 o número de filas) de los huecos que se interpolan
+
+    Returns:
+        Presión atmosférica en kPa sin huecos (salvo estaciones con altitud fuera de rango)
+        Máscara de los datos llenados
+    """
+    P_atm = np.asarray(P_atm, dtype=float)
+    n = P_atm.shape[0]
+    if fecha is None:
+        t = np.arange(n, dtype=float)
+        limite = float(hueco_max) if not isinstance(hueco_max, np.timedelta64) else np.inf
+    else:
+        t = (np.asarray(fecha, dtype='datetime64[s]') - np.datetime64(0, 's')).astype(float)
+        limite = hueco_max / np.timedelta64(1, 's')
+    forma = (n,) + (1,)*(P_atm.ndim - 1)
+    t = t.reshape(forma)
+
+    #Dato válido anterior y siguiente de cada fila (-1 o n si no hay)
+    valido = ~np.isnan(P_atm)
+    fila = np.arange(n).reshape(forma)
+    anterior = np.maximum.accumulate(np.where(valido, fila, -1), axis=0)
+    siguiente = np.minimum.accumulate(np.where(valido, fila, n)[::-1], axis=0)[::-1]
+    a = np.clip(anterior, 0, n - 1)
+    b = np.clip(siguiente, 0, n - 1)
+
+    #Interpolación lineal en el tiempo dentro de los huecos cortos
+    ta = np.take_along_axis(np.broadcast_to(t, P_atm.shape), a, axis=0)
+    tb = np.take_along_axis(np.broadcast_to(t, P_atm.shape), b, axis=0)
+    Pa = np.take_along_axis(P_atm, a, axis=0)
+    Pb = np.take_along_axis(P_atm, b, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        interpolada = Pa + (t - ta)/(tb - ta)*(Pb - Pa)
+    corto = (anterior >= 0) & (siguiente < n) & (tb - ta <= limite)
+
+    #Modelo más la diferencia mediana con la presión medida de cada estación
+    modelo = presion_altitud(Z)
+    with np.errstate(invalid='ignore'):
+        diferencia = np.nanmedian(np.where(valido, P_atm - modelo, np.nan), axis=0) if valido.any() else 0
+    diferencia = np.where(np.isnan(diferencia), 0, diferencia)
+
+    llenado = ~valido
+    resultado = np.where(valido, P_atm, np.where(corto, interpolada, modelo + diferencia))
+    return resultado, llenado
+
+def propiedades(tbs, RH, P_atm, Z, fecha=None, columnas: tuple = None, precision: str = 'estandar',
+                hueco_max=HUECO_MAX) -> dict:
+    """
+    Retorna variables_psicrometricas_np.propiedades() con la presión de cada estación: la medida
+    con los huecos llenados o, si no hay presión medida (P_atm None), la del modelo a la altitud de
+    cada estación, que hace broadcasting con los datos de forma (tiempo, estación).
+
+    Args:
+        tbs: Temperatura de bulbo seco en °C
+        RH: Humedad relativa en fracción
+        P_atm: Presión atmosférica medida en kPa, o None
+        Z: Altitud en metros, escalar o una por estación
+        fecha: Fechas (datetime64) de cada fila (ver rellenar_presion)
+        columnas: Columnas que se calculan (por defecto variables_psicrometricas_np.COLUMNAS)
+        precision: Nivel de precisión (llave de variables_psicrometricas_np.PRECISIONES)
+        hueco_max: Duración máxima de los huecos que se interpolan
+
+    Returns:
+        Diccionario de arreglos
+    """
+    import variables_psicrometricas_np as vpn
+
+    if P_atm is None:
+        P_atm = presion_altitud(Z)
+    else:
+        P_atm = rellenar_presion(P_atm, Z, fecha, hueco_max)[0]
+    return vpn.propiedades(tbs, RH, P_atm, columnas or vpn.COLUMNAS, precision=precision)
@@ -0,0 +1,166 @@
+""" cache_resultados.py
+
+Caché en disco de resultados de cálculos por lotes, direccionada por contenido. La llave de cada
+resultado es un hash de los arreglos de entrada, de la versión de la librería (hash del código de
+variables_psicrometricas.py y variables_psicrometricas_np.py), del código del módulo de la función
+que se calcula, de los parámetros del solucionador (TOLERANCIA, MAX_ITER, MIN_HUM_RATIO) y del
+método y sus argumentos, de modo que cualquier cambio en los datos, el código o los parámetros
+invalida el resultado sin intervención. Solo se sigue el archivo del módulo de la función: si
+este llama a funciones de otros módulos (fuera de los dos núcleos) que cambian, hay que usar
+limpiar().
+
+Los resultados se guardan como .npz sin compresión y al escribir se eliminan los menos usados
+recientemente hasta que el directorio quede por debajo de LIMITE bytes.
+
+Example
+    >>> import cache_resultados
+    >>> resultados = cache_resultados.propiedades(TBS, RH/100, P/10)   #La segunda vez se lee del disco
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+import variables_psicrometricas_np as vpn
+
+#Directorio y tamaño máximo de la caché
+DIRECTORIO = os.path.join(".cache_vp", "resultados")
+LIMITE = 256 * 2**20
+
+#Errores al leer un resultado incompleto o dañado; se recalcula
+ERRORES_LECTURA = (OSError, ValueError, EOFError, zipfile.BadZipFile)
+
+@functools.lru_cache(maxsize=1)
+def version() -> str:
+    """
+    Retorna el hash del código de los núcleos de cálculo.
+    """
+    h = hashlib.sha1()
+    for modulo in ("variables_psicrometricas.py", "variables_psicrometricas_np.py"):
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), modulo), "rb") as file:
+            h.update(file.read())
+    return h.hexdigest()[:16]
+
+@functools.lru_cache(maxsize=64)
+def _hash_archivo(ruta: str, modificado: int) -> str:
+    #modificado (mtime en ns) es parte de la llave del lru_cache para releer el archivo si cambia
+    with open(ruta, "rb") as file:
+        return hashlib.sha1(file.read()).hexdigest()[:16]
+
+def version_funcion(funcion) -> str:
+    """
+    Retorna el hash del archivo del módulo donde está definida una función, o '' si no tiene
+    archivo (funciones compiladas o definidas en el intérprete).
+    """
+    try:
+        ruta = inspect.getsourcefile(funcion)
+        return _hash_archivo(os.path.abspath(ruta), os.stat(ruta).st_mtime_ns) if ruta else ""
+    except (TypeError, OSError):
+        return ""
+
+def llave(entradas: tuple, metodo: str, parametros: dict = None) -> str:
+    """
+    Retorna la llave (hash) de un cálculo.
+
+    Args:
+        entradas: Arreglos de entrada
+        metodo: Nombre de la función que se calcula
+        parametros: Argumentos adicionales de la función (deben tener una representación estable)
+
+    Returns:
+        Llave hexadecimal
+    """
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"{version()}|{vpn.TOLERANCIA}|{vpn.MAX_ITER}|{vpn.MIN_HUM_RATIO}|{metodo}|"
+             f"{sorted((parametros or {}).items())}".encode())
+    for x in entradas:
+        x = np.ascontiguousarray(x, dtype=float)
+        h.update(f"{x.shape}".encode())
+        h.update(x.view(np.uint8))
+    return h.hexdigest()
+
+def _recortar(directorio: str, limite: int) -> None:
+    """
+    Elimina los resultados usados menos recientemente hasta que el directorio ocupe menos de limite bytes.
+    """
+    archivos = []
+    for nombre in os.listdir(directorio):
+        if nombre.endswith(".npz"):
+            info = os.stat(os.path.join(directorio, nombre))
+            archivos.append((info.st_mtime, info.st_size, nombre))
+
+    total = sum(tamano for _, tamano, _ in archivos)
+    for _, tamano, nombre in sorted(archivos):
+        if total <= limite:
+            break
+        try:
+            os.remove(os.path.join(directorio, nombre))
+        except FileNotFoundError:
+            pass
+        total -= tamano
+
+def calcular(funcion, entradas: tuple, parametros: dict = None, directorio: str = None,
+             limite: int = LIMITE) -> dict:
+    """
+    Retorna funcion(*entradas, **parametros) desde la caché o, si no está, la calcula y la guarda.
+    La función debe regresar un diccionario de arreglos.
+
+    Args:
+        funcion: Función de cálculo por lotes
+        entradas: Arreglos de entrada
+        parametros: Argumentos adicionales de la función
+        directorio: Directorio de la caché (por defecto DIRECTORIO)
+        limite: Tamaño máximo de la caché en bytes
+
+    Returns:
+        Diccionario de arreglos
+    """
+    parametros = parametros or {}
+    directorio = directorio or DIRECTORIO
+    metodo = f"{funcion.__module__}.{funcion.__qualname__}@{version_funcion(funcion)}"
+    archivo = os.path.join(directorio, llave(entradas, metodo, parametros) + ".npz")
+
+    try:
+        with np.load(archivo, allow_pickle=False) as datos:
+            resultado = {columna: datos[columna] for columna in datos.files}
+        os.utime(archivo)       #Se marca como usado recientemente
+        return resultado
+    except ERRORES_LECTURA:
+        pass
+
+    resultado = funcion(*entradas, **parametros)
+
+    #Se escribe en un archivo temporal y se renombra, para no dejar archivos incompletos
+    os.makedirs(directorio, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            np.savez(file, **resultado)
+        os.replace(temporal, archivo)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+    _recortar(directorio, limite)
+    return resultado
+
+def propiedades(tbs, RH, P_atm, columnas: tuple = vpn.COLUMNAS, directorio: str = None,
+                limite: int = LIMITE, precision: str = 'estandar') -> dict:
+    """
+    Retorna variables_psicrometricas_np.propiedades(tbs, RH, P_atm, columnas, precision=precision)
+    usando la caché; el nivel de precisión forma parte de la llave.
+    """
+    tbs, RH, P_atm = np.broadcast_arrays(np.asarray(tbs, dtype=float), np.asarray(RH, dtype=float),
+                                         np.asarray(P_atm, dtype=float))
+    return calcular(vpn.propiedades, (tbs, RH, P_atm), {'columnas': tuple(columnas), 'precision': precision}, directorio, limite)
+
+def limpiar(directorio: str = None) -> None:
+    """
+    Elimina todos los resultados de la caché.
+    """
+    import shutil
+    shutil.rmtree(directorio or DIRECTORIO, ignore_errors=True)
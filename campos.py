@@ -0,0 +1,91 @@
+""" campos.py
+
+Cálculo de campos psicrométricos sobre mallas (por ejemplo tiempo × latitud × longitud) de
+temperatura, humedad relativa y presión, como las de un reanálisis.
+
+El campo se recorre en bloques de a lo más BLOQUE elementos: los resultados intermedios de
+variables_psicrometricas_np solo ocupan la memoria de un bloque y cada resultado se escribe
+directamente en la vista correspondiente del arreglo de salida preasignado.
+
+Example
+    >>> import numpy as np
+    >>> import campos
+    >>> tbs = np.random.uniform(0, 35, (24, 180, 360))       #tiempo × lat × lon
+    >>> RH = np.random.uniform(0.1, 1, (24, 180, 360))
+    >>> P = np.full((180, 360), 80.0)                         #Presión por punto de malla (kPa)
+    >>> resultado = campos.evaluar(tbs, RH, P, columnas=('W', 'H', 'TBH'))
+    >>> resultado['TBH'].shape
+    (24, 180, 360)
+"""
+
+import math
+
+import numpy as np
+
+import variables_psicrometricas_np as vpn
+
+#Número máximo de elementos por bloque (2**16 elementos float64 = 512 KiB por arreglo intermedio)
+BLOQUE = 2**16
+
+def bloques(forma: tuple, bloque: int = BLOQUE):
+    """
+    Genera tuplas de índices (slices) que recorren un arreglo de la forma dada en bloques
+    contiguos de a lo más `bloque` elementos, partiendo primero los ejes externos.
+
+    Args:
+        forma: Forma del arreglo
+        bloque: Número máximo de elementos por bloque
+    """
+    if len(forma) == 0:
+        yield ()
+        return
+
+    resto = math.prod(forma[1:])
+    if resto <= bloque:
+        paso = max(1, bloque // max(resto, 1))
+        for i in range(0, forma[0], paso):
+            yield (slice(i, min(i + paso, forma[0])),)
+    else:
+        #Un solo índice del primer eje no cabe en un bloque: se parte el siguiente eje
+        for i in range(forma[0]):
+            for sub in bloques(forma[1:], bloque):
+                yield (i,) + sub
+
+def evaluar(tbs, RH, P_atm, columnas: tuple = vpn.COLUMNAS, out: dict = None, bloque: int = BLOQUE,
+            precision: str = 'estandar') -> dict:
+    """
+    Retorna las variables psicrométricas de un campo N-dimensional calculadas por bloques.
+
+    Args:
+        tbs: Temperatura de bulbo seco en °C
+        RH: Humedad relativa en fracción
+        P_atm: Presión atmosférica en kPa
+        columnas: Variables a calcular (subconjunto de variables_psicrometricas_np.COLUMNAS)
+        out: Diccionario {columna: arreglo preasignado} con la forma del campo (opcional)
+        bloque: Número máximo de elementos por bloque
+
+    Returns:
+        Diccionario {columna: arreglo} con la forma del campo (broadcast de las entradas)
+    """
+    tbs = np.asarray(tbs)
+    RH = np.asarray(RH)
+    P_atm = np.asarray(P_atm)
+    forma = np.broadcast_shapes(tbs.shape, RH.shape, P_atm.shape)
+
+    out = dict(out or {})
+    for columna in columnas:
+        if columna not in out:
+            out[columna] = np.empty(forma)
+        elif out[columna].shape != forma:
+            raise ValueError(f"La salida {columna} tiene forma {out[columna].shape}, se esperaba {forma}")
+
+    #Vistas (sin copia) de las entradas con la forma del campo
+    tbs = np.broadcast_to(tbs, forma)
+    RH = np.broadcast_to(RH, forma)
+    P_atm = np.broadcast_to(P_atm, forma)
+
+    for indice in bloques(forma, bloque):
+        vpn.propiedades(tbs[indice], RH[indice], P_atm[indice], columnas, precision=precision,
+                        out={columna: out[columna][indice + (...,)] for columna in columnas})
+
+    return {columna: out[columna] for columna in columnas}
@@ -0,0 +1,271 @@
+""" carga_datos.py
+
+Lectura de hojas de datos de estaciones (.xlsx, .xls o .csv) con caché en disco. La primera vez
+que se lee un archivo se convierte a un formato columnar binario (un archivo .npy por columna) en
+el directorio de caché; las lecturas siguientes cargan las columnas con memory mapping, sin volver
+a interpretar la hoja de cálculo.
+
+La llave de la caché se forma con la ruta absoluta del archivo, su fecha de modificación y su
+tamaño, de modo que si el archivo cambia se vuelve a convertir y la entrada anterior se elimina.
+Al convertir un archivo se eliminan las entradas cuyo archivo de origen ya no existe y, si la caché
+ocupa más de LIMITE bytes, las usadas menos recientemente.
+
+Example
+    >>> import carga_datos
+    >>> datos = carga_datos.cargar("zacatecas.xlsx")     #Primera vez: lee el Excel
+    >>> datos = carga_datos.cargar("zacatecas.xlsx")     #Siguientes: memory mapping
+    >>> list(datos)
+    ['Temperatura del Aire (°C)', 'Humedad relativa (%)', 'Presión Atmosférica (hpa)']
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+
+import numpy as np
+
+#Directorio y tamaño máximo de la caché por defecto
+DIRECTORIO_CACHE = ".cache_vp"
+LIMITE = 512 * 2**20
+
+#Nombres de las columnas en las exportaciones de las EMA del Servicio Meteorológico Nacional
+COLUMNAS_EMA = {
+    'FECHA': 'Fecha Local',
+    'FECHA_UTC': 'Fecha UTC',
+    'TBS': 'Temperatura del Aire (°C)',
+    'RH': 'Humedad relativa (%)',
+    'P': 'Presión Atmosférica (hpa)',
+    'VIENTO': 'Rapidez de viento (km/h)',
+    'RADIACION': 'Radiación Solar (W/m²)',
+}
+
+#Espacios de nombres de Strict Open XML (ISO 29500 estricto) y sus equivalentes del formato
+#transicional; Excel guarda así los libros con "Hoja de cálculo Strict Open XML" (por ejemplo abril.xlsx)
+OOXML_ESTRICTO = (
+    (b"http://purl.oclc.org/ooxml/spreadsheetml/main", b"http://schemas.openxmlformats.org/spreadsheetml/2006/main"),
+    (b"http://purl.oclc.org/ooxml/officeDocument/relationships", b"http://schemas.openxmlformats.org/officeDocument/2006/relationships"),
+    (b"http://purl.oclc.org/ooxml/drawingml/main", b"http://schemas.openxmlformats.org/drawingml/2006/main"),
+)
+
+def _llave(ruta: str) -> tuple:
+    """
+    Retorna el prefijo (ruta) y la llave completa (ruta, fecha de modificación y tamaño)
+    de la entrada de caché de un archivo.
+    """
+    ruta = os.path.abspath(ruta)
+    info = os.stat(ruta)
+    prefijo = hashlib.sha1(ruta.encode()).hexdigest()[:16]
+    version = hashlib.sha1(f"{info.st_mtime_ns}|{info.st_size}".encode()).hexdigest()[:16]
+    return prefijo, f"{prefijo}-{version}"
+
+def fila_encabezado(ruta: str, encoding: str) -> int:
+    """
+    Retorna el número de la fila con los nombres de las columnas de un CSV. Las exportaciones de
+    las EMA tienen líneas de metadatos (estación, latitud, altitud) antes de la tabla.
+    """
+    with open(ruta, "r", encoding=encoding) as file:
+        for i, linea in enumerate(file):
+            if linea.count(",") >= 1:
+                return i
+    return 0
+
+def metadatos(ruta: str, encoding: str = "latin-1") -> dict:
+    """
+    Retorna las líneas de metadatos de una exportación de EMA ('Estación', 'Latitud (N)',
+    'Longitud (O)', 'Altitud', ...) como diccionario; los valores numéricos se convierten a float.
+    """
+    datos = {}
+    with open(ruta, "r", encoding=encoding) as file:
+        for linea in file:
+            if linea.count(",") >= 1:
+                break
+            llave, separador, valor = linea.partition(":")
+            if not separador:
+                continue
+            valor = valor.strip()
+            try:
+                datos[llave.strip()] = float(valor)
+            except ValueError:
+                datos[llave.strip()] = valor
+    return datos
+
+def es_ooxml_estricto(ruta: str) -> bool:
+    """
+    Retorna True si el libro .xlsx está guardado en formato Strict Open XML, que openpyxl no
+    reconoce (lee 0 hojas).
+    """
+    try:
+        with zipfile.ZipFile(ruta) as libro:
+            return OOXML_ESTRICTO[0][0] in libro.read("xl/workbook.xml")
+    except (zipfile.BadZipFile, KeyError):
+        return False
+
+def _transicional(ruta: str) -> io.BytesIO:
+    """
+    Retorna una copia en memoria de un libro Strict Open XML con los espacios de nombres del formato
+    transicional, que sí puede leer openpyxl. El contenido de las celdas no cambia.
+    """
+    salida = io.BytesIO()
+    with zipfile.ZipFile(ruta) as libro, zipfile.ZipFile(salida, "w", zipfile.ZIP_DEFLATED) as copia:
+        for info in libro.infolist():
+            datos = libro.read(info)
+            if info.filename.endswith((".xml", ".rels")):
+                for estricto, transicional in OOXML_ESTRICTO:
+                    datos = datos.replace(estricto, transicional)
+            copia.writestr(info, datos)
+    salida.seek(0)
+    return salida
+
+def _leer_hoja(ruta: str, hoja, encoding: str):
+    """
+    Lee un archivo .xlsx/.xls/.csv y retorna un DataFrame sin columnas vacías.
+    """
+    import pandas as pd
+
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".xlsx" and es_ooxml_estricto(ruta):
+        df = pd.read_excel(_transicional(ruta), sheet_name=hoja)
+    elif extension in (".xlsx", ".xls"):
+        df = pd.read_excel(ruta, sheet_name=hoja)
+    elif extension == ".csv":
+        df = pd.read_csv(ruta, encoding=encoding, skiprows=fila_encabezado(ruta, encoding))
+    else:
+        raise ValueError(f"Formato no soportado: {extension}")
+
+    return df.dropna(axis=1, how="all")
+
+def _columna(serie) -> np.ndarray:
+    """
+    Convierte una columna de pandas a un arreglo de NumPy que se pueda guardar sin pickle:
+    numérica (float), fecha (datetime64) o texto (unicode).
+    """
+    import pandas as pd
+
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie.to_numpy(dtype=float)
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie.to_numpy(dtype="datetime64[ns]")
+
+    numerica = pd.to_numeric(serie, errors="coerce")
+    if numerica.notna().sum() == serie.notna().sum():
+        return numerica.to_numpy(dtype=float)
+    fecha = pd.to_datetime(serie, errors="coerce", format="%Y-%m-%d %H:%M:%S")
+    if fecha.notna().sum() == serie.notna().sum():
+        return fecha.to_numpy(dtype="datetime64[ns]")
+    return serie.fillna("").astype(str).to_numpy(dtype=str)
+
+def convertir(ruta: str, destino: str, hoja=0, encoding: str = "latin-1") -> None:
+    """
+    Convierte un archivo de datos al formato columnar de la caché.
+
+    Args:
+        ruta: Archivo .xlsx, .xls o .csv
+        destino: Directorio donde se escriben las columnas
+        hoja: Hoja del libro de Excel (nombre o índice)
+        encoding: Codificación de los archivos CSV
+    """
+    df = _leer_hoja(ruta, hoja, encoding)
+    os.makedirs(destino)
+
+    columnas = []
+    for i, nombre in enumerate(df.columns):
+        archivo = f"c{i}.npy"
+        np.save(os.path.join(destino, archivo), _columna(df[nombre]), allow_pickle=False)
+        columnas.append({"nombre": str(nombre), "archivo": archivo})
+
+    with open(os.path.join(destino, "columnas.json"), "w", encoding="utf-8") as file:
+        json.dump({"origen": os.path.abspath(ruta), "filas": len(df), "columnas": columnas},
+                  file, ensure_ascii=False)
+
+def _tamano(entrada: str) -> int:
+    return sum(os.path.getsize(os.path.join(entrada, nombre)) for nombre in os.listdir(entrada))
+
+def _recortar(directorio: str, limite: int, conservar: str) -> None:
+    """
+    Elimina las entradas cuyo archivo de origen ya no existe y, después, las usadas menos
+    recientemente hasta que la caché ocupe menos de limite bytes. La entrada conservar (la que se
+    está leyendo) nunca se elimina.
+    """
+    entradas = []
+    for nombre in os.listdir(directorio):
+        entrada = os.path.join(directorio, nombre)
+        try:
+            with open(os.path.join(entrada, "columnas.json"), "r", encoding="utf-8") as file:
+                origen = json.load(file)["origen"]
+            uso = os.stat(entrada).st_mtime
+            tamano = _tamano(entrada)
+        except (OSError, ValueError, KeyError):
+            continue        #Directorios temporales de otras conversiones en curso
+        if entrada != conservar and not os.path.exists(origen):
+            shutil.rmtree(entrada, ignore_errors=True)
+        else:
+            entradas.append((uso, tamano, entrada))
+
+    total = sum(tamano for _, tamano, _ in entradas)
+    for _, tamano, entrada in sorted(entradas):
+        if total <= limite:
+            break
+        if entrada != conservar:
+            shutil.rmtree(entrada, ignore_errors=True)
+            total -= tamano
+
+def cargar(ruta: str, hoja=0, encoding: str = "latin-1", directorio: str = None, limite: int = LIMITE) -> dict:
+    """
+    Retorna las columnas de un archivo de datos de estación, convirtiéndolo a la caché la
+    primera vez. Las columnas se abren con memory mapping en modo de solo lectura.
+
+    Args:
+        ruta: Archivo .xlsx, .xls o .csv
+        hoja: Hoja del libro de Excel (nombre o índice)
+        encoding: Codificación de los archivos CSV
+        directorio: Directorio de la caché (por defecto DIRECTORIO_CACHE)
+        limite: Tamaño máximo de la caché en bytes
+
+    Returns:
+        Diccionario {nombre de columna: arreglo} en el orden del archivo
+    """
+    directorio = directorio or DIRECTORIO_CACHE
+    prefijo, llave = _llave(ruta)
+    if hoja != 0:
+        entrada = os.path.join(directorio, f"{llave}-{hashlib.sha1(str(hoja).encode()).hexdigest()[:8]}")
+    else:
+        entrada = os.path.join(directorio, llave)
+
+    if not os.path.isdir(entrada):
+        os.makedirs(directorio, exist_ok=True)
+        #Se convierte en un directorio temporal y se renombra, para no dejar entradas incompletas
+        temporal = tempfile.mkdtemp(dir=directorio)
+        try:
+            convertir(ruta, os.path.join(temporal, "datos"), hoja, encoding)
+            try:
+                os.replace(os.path.join(temporal, "datos"), entrada)
+            except OSError:
+                #Otro proceso convirtió el mismo archivo al mismo tiempo
+                if not os.path.isdir(entrada):
+                    raise
+        finally:
+            shutil.rmtree(temporal, ignore_errors=True)
+
+        #Se eliminan las entradas de versiones anteriores del mismo archivo
+        for nombre in os.listdir(directorio):
+            if nombre.startswith(prefijo + "-") and not nombre.startswith(llave):
+                shutil.rmtree(os.path.join(directorio, nombre), ignore_errors=True)
+        _recortar(directorio, limite, entrada)
+    else:
+        os.utime(entrada)       #Se marca como usada recientemente
+
+    with open(os.path.join(entrada, "columnas.json"), "r", encoding="utf-8") as file:
+        indice = json.load(file)
+
+    return {columna["nombre"]: np.load(os.path.join(entrada, columna["archivo"]), mmap_mode="r")
+            for columna in indice["columnas"]}
+
+def limpiar(directorio: str = None) -> None:
+    """
+    Elimina todas las entradas de la caché.
+    """
+    shutil.rmtree(directorio or DIRECTORIO_CACHE, ignore_errors=True)
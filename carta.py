@@ -0,0 +1,120 @@
+""" carta.py
+
+Geometría y dibujo de la carta psicrométrica, compartidos por los scripts (carta_zacatecas.py,
+carta_psicrometrica.py, vp.py), la línea de comandos y el renderizado en paralelo (render.py).
+
+La geometría (líneas de humedad relativa, bulbo humedo, entalpía y bulbo seco) se calcula con
+arreglos de NumPy y se guarda en caché por presión atmosférica, de modo que se calcula una sola
+vez por altitud sin importar cuántas cartas se dibujen.
+
+Example
+    >>> import matplotlib.pyplot as plt
+    >>> import carta
+    >>> _, ax = plt.subplots()
+    >>> carta.dibujar(ax, carta.geometria_altitud(2270), TBS, W)
+    >>> plt.show()
+"""
+
+import functools
+
+import numpy as np
+
+import variables_psicrometricas as vp
+import variables_psicrometricas_np as vpn
+
+TBS_ARRAY = np.arange(0, 45, 0.1)           #Vector para temperatura de bulbo seco
+RH_ARRAY = np.linspace(0, 1, 11)            #Vector para Humedad relativa
+TBH_ARRAY = np.arange(-10, 46, 2)           #Vector para temperatura de bulbo humedo
+ENTALPIA_ARRAY = np.arange(0, 100, 5)       #Vector de entalpias
+TBS_LINEAS = np.arange(0, 40, 5)            #Lineas verticales de temperatura de bulbo seco
+
+@functools.lru_cache(maxsize=32)
+def geometria(P_atm: float) -> dict:
+    """
+    Retorna las líneas de la carta psicrométrica a la presión dada. Cada llave contiene una
+    matriz (línea × tbs) de razones de humedad; los puntos que no existen son NaN.
+
+    Args:
+        P_atm: Presión atmosférica en kPa
+
+    Returns:
+        Diccionario con las llaves 'tbs', 'RH', 'TBH', 'H' y 'vlineas' (x, y máxima)
+    """
+    tbs = TBS_ARRAY[np.newaxis, :]
+    return {
+        'tbs': TBS_ARRAY,
+        'RH': vpn.razon_humedad(tbs, RH_ARRAY[:, np.newaxis], P_atm),
+        'TBH': vpn.razon_humedad_TBH(tbs, TBH_ARRAY[:, np.newaxis], P_atm),
+        'H': vpn.razon_hum_entalpia(tbs, ENTALPIA_ARRAY[:, np.newaxis]),
+        'vlineas': (TBS_LINEAS, vpn.razon_hum_saturacion(P_atm, TBS_LINEAS)),
+    }
+
+def geometria_altitud(Z: float) -> dict:
+    """
+    Retorna la geometría de la carta a la presión atmosférica de la altitud Z (metros).
+    """
+    P_atm, _ = vp.pres_atm_temp(Z)
+    return geometria(P_atm)
+
+def dibujar(ax, geo: dict, TBS=None, W=None, titulo: str = "Carta Psicrométrica",
+            xlim: tuple = (0, 40), ylim: tuple = (0, 0.025), extras: list = ()) -> list:
+    """
+    Dibuja la carta psicrométrica y los datos (TBS, W) en los ejes dados.
+
+    Args:
+        ax: Ejes de matplotlib
+        geo: Geometría de la carta (ver geometria())
+        TBS: Temperatura de bulbo seco de los datos en °C (opcional)
+        W: Razón de humedad de los datos (opcional)
+        titulo: Título de la gráfica
+        xlim: Límites de temperatura de bulbo seco
+        ylim: Límites de razón de humedad
+        extras: Parches adicionales para la leyenda
+
+    Returns:
+        Lista de parches de la leyenda
+    """
+    import matplotlib.patches as mpatches
+
+    #Se generan las lineas de humedad relativa, saturación y entalpía
+    ax.plot(geo['tbs'], geo['RH'].T, 'k')
+    ax.plot(geo['tbs'], geo['TBH'].T, 'b')
+    ax.plot(geo['tbs'], geo['H'].T, 'g')
+
+    #Se generan las lineas de temperatura de bulbo seco
+    x, y_max = geo['vlineas']
+    ax.vlines(x, ymin=0, ymax=y_max, color='purple')
+
+    #Se grafican los datos con TBS y W
+    if TBS is not None:
+        ax.plot(TBS, W, 'x', color="r")
+
+    #Se generan las leyendas
+    pathc = [mpatches.Patch(color='k', label='Humedad relativa'),
+             mpatches.Patch(color='blue', label='Lineas de saturación'),
+             mpatches.Patch(color='green', label='Entalpía'),
+             mpatches.Patch(color='purple', label='Temp bulbo seco'),
+             mpatches.Patch(color='red', label='Datos')] + list(extras)
+
+    #Se establecen los limites de la grafica
+    ax.set(ylim=ylim, xlim=xlim, ylabel=r"Razón de humedad [$kg_{agua}/kg_{aire}$]", xlabel=r"Temperatura de bulbo seco [°C]")
+    ax.yaxis.tick_right()
+    ax.yaxis.set_label_position('right')
+    ax.set_title(titulo)
+    ax.legend(handles=pathc)
+    return pathc
+
+def figura(geo: dict, TBS=None, W=None, figsize: tuple = (8, 6), **kwargs):
+    """
+    Retorna una figura de matplotlib con la carta, sin usar pyplot (backend Agg), para
+    guardarla con figura.savefig() en procesos sin pantalla.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    dibujar(ax, geo, TBS, W, **kwargs)
+    fig.tight_layout()
+    return fig
@@ -0,0 +1,193 @@
+""" carta_vivo.py
+
+Carta psicrométrica en vivo para pantallas de monitoreo. Las líneas de la carta se dibujan una sola
+vez y se guardan como fondo; cada cuadro restaura el fondo y dibuja solo los puntos (blitting).
+Los puntos se guardan en un buffer circular de tamaño fijo, así que el costo de cada cuadro no
+crece con las horas de historia; la trayectoria muestra solo las últimas horas.
+
+Example
+    $ python carta_vivo.py Estacion_ZACATECAS_EMA.csv --velocidad 600
+
+    >>> import numpy as np
+    >>> import matplotlib.pyplot as plt
+    >>> import carta_vivo
+    >>> fig, ax = plt.subplots()
+    >>> vivo = carta_vivo.CartaEnVivo(ax, P_atm=77.9)
+    >>> vivo.agregar(np.datetime64("2023-01-10T16:30"), 19.7, 15, 779.5)
+    >>> vivo.actualizar()
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+import carta
+import variables_psicrometricas_np as vpn
+
+#Variables Globales
+MAX_PUNTOS = 5000           #Tamaño del buffer de puntos
+HORAS = 6                   #Horas de la trayectoria reciente
+CUADROS_MS = 100            #Intervalo entre cuadros en milisegundos
+
+
+class CartaEnVivo:
+    """
+    Carta psicrométrica que agrega puntos (tbs, W) y redibuja solo los puntos con blitting.
+
+    Args:
+        ax: Ejes de matplotlib
+        P_atm: Presión atmosférica en kPa
+        horas: Horas de la trayectoria reciente
+        maximo: Número máximo de puntos que se conservan
+    """
+    def __init__(self, ax, P_atm: float, horas: float = HORAS, maximo: int = MAX_PUNTOS, **kwargs):
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.horas = np.timedelta64(int(horas*3600), 's')
+
+        #Buffer circular
+        self.fecha = np.full(maximo, np.datetime64('NaT', 's'))
+        self.tbs = np.full(maximo, np.nan)
+        self.W = np.full(maximo, np.nan)
+        self.siguiente = 0
+
+        #Líneas estáticas, se dibujan una sola vez
+        carta.dibujar(ax, carta.geometria(P_atm), **kwargs)
+        self.P_atm = P_atm
+
+        #Artistas animados, no forman parte del fondo
+        self.puntos, = ax.plot([], [], 'x', color='r', markersize=3, animated=True)
+        self.trayectoria, = ax.plot([], [], '-', color='orange', linewidth=1.5, animated=True)
+        self.actual, = ax.plot([], [], 'o', color='darkred', animated=True)
+        self.artistas = (self.puntos, self.trayectoria, self.actual)
+
+        self.fondo = None
+        self.canvas.mpl_connect('draw_event', self._guardar_fondo)
+
+    def _guardar_fondo(self, event=None) -> None:
+        #Se vuelve a guardar cuando la figura se redibuja completa (por ejemplo, al cambiar de tamaño)
+        self.fondo = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._dibujar_artistas()
+
+    def agregar(self, fecha, TBS, RH, P) -> None:
+        """
+        Agrega una o varias lecturas al buffer.
+
+        Args:
+            fecha: Fecha (datetime64) de cada lectura
+            TBS: Temperatura de bulbo seco en °C
+            RH: Humedad relativa en porcentaje
+            P: Presión atmosférica en hPa (NaN o None para usar la de la carta)
+        """
+        TBS = np.atleast_1d(np.asarray(TBS, dtype=float))
+        P = self.P_atm if P is None else np.where(np.isnan(np.asarray(P, dtype=float)), self.P_atm*10, P)/10
+        W = vpn.razon_humedad(TBS, np.asarray(RH, dtype=float)/100, P)
+        fecha = np.broadcast_to(np.asarray(fecha, dtype='datetime64[s]'), TBS.shape)
+
+        #Si llegan más lecturas que el tamaño del buffer solo se conservan las últimas
+        n = len(self.tbs)
+        fecha, TBS, W = fecha[-n:], TBS[-n:], np.broadcast_to(W, TBS.shape)[-n:]
+        indice = (self.siguiente + np.arange(len(TBS))) % n
+        self.fecha[indice] = fecha
+        self.tbs[indice] = TBS
+        self.W[indice] = W
+        self.siguiente = (self.siguiente + len(TBS)) % n
+
+    def _dibujar_artistas(self) -> None:
+        orden = np.roll(np.arange(len(self.tbs)), -self.siguiente)     #Del más antiguo al más reciente
+        fecha, tbs, W = self.fecha[orden], self.tbs[orden], self.W[orden]
+        validos = ~np.isnat(fecha)
+
+        self.puntos.set_data(tbs[validos], W[validos])
+        if validos.any():
+            ultima = fecha[validos][-1]
+            recientes = validos & (fecha > ultima - self.horas)
+            self.trayectoria.set_data(tbs[recientes], W[recientes])
+            self.actual.set_data(tbs[validos][-1:], W[validos][-1:])
+
+        for artista in self.artistas:
+            self.ax.draw_artist(artista)
+
+    def actualizar(self) -> None:
+        """
+        Dibuja un cuadro: restaura el fondo, dibuja los puntos y copia solo el área de los ejes.
+        """
+        if self.fondo is None:
+            self.canvas.draw()      #Primer cuadro: dibuja el fondo y lo guarda (_guardar_fondo)
+        else:
+            self.canvas.restore_region(self.fondo)
+            self._dibujar_artistas()
+        self.canvas.blit(self.ax.bbox)
+        self.canvas.flush_events()
+
+    def animar(self, fuente, intervalo: int = CUADROS_MS):
+        """
+        Inicia un temporizador que cada intervalo (ms) agrega las lecturas nuevas de la fuente y
+        dibuja un cuadro. La fuente es una función que retorna (fecha, TBS, RH, P) o None.
+
+        Returns:
+            Temporizador de matplotlib (se debe conservar una referencia)
+        """
+        def cuadro():
+            lecturas = fuente()
+            if lecturas is not None:
+                self.agregar(*lecturas)
+            self.actualizar()
+
+        temporizador = self.canvas.new_timer(interval=intervalo)
+        temporizador.add_callback(cuadro)
+        temporizador.start()
+        return temporizador
+
+def reproductor(ruta: str, velocidad: float, intervalo: int = CUADROS_MS):
+    """
+    Retorna una fuente para CartaEnVivo.animar() que reproduce un archivo de EMA en orden
+    cronológico, velocidad veces más rápido que el tiempo real. Cada cuadro avanza
+    velocidad*intervalo milisegundos de datos.
+    """
+    import carga_datos
+
+    nombres = carga_datos.COLUMNAS_EMA
+    datos = carga_datos.cargar(ruta)
+    fecha = np.asarray(datos[nombres['FECHA']], dtype='datetime64[s]')
+    orden = np.argsort(fecha, kind='stable')
+    fecha = fecha[orden]
+    TBS, RH, P = (np.asarray(datos[nombres[c]])[orden] for c in ('TBS', 'RH', 'P'))
+
+    paso = np.timedelta64(round(velocidad*intervalo), 'ms')
+    if paso <= np.timedelta64(0, 'ms'):
+        raise ValueError(f"La velocidad {velocidad} no avanza la reproducción en cuadros de {intervalo} ms")
+    estado = {'hasta': fecha[0], 'i': 0}
+
+    def fuente():
+        estado['hasta'] += paso
+        j = np.searchsorted(fecha, estado['hasta'], side='right')
+        i, estado['i'] = estado['i'], j
+        if i == j:
+            return None
+        return fecha[i:j], TBS[i:j], RH[i:j], P[i:j]
+
+    return fuente
+
+def main(argv: list = None) -> int:
+    import matplotlib.pyplot as plt
+
+    import atmosfera
+
+    parser = argparse.ArgumentParser(description="Carta psicrométrica en vivo de un archivo de EMA")
+    parser.add_argument("archivo", help="Archivo de la EMA")
+    parser.add_argument("--velocidad", type=float, default=600, help="Segundos de datos por segundo real (default: 600)")
+    parser.add_argument("--horas", type=float, default=HORAS, help=f"Horas de la trayectoria (default: {HORAS})")
+    args = parser.parse_args(argv)
+
+    Z = atmosfera.altitud(args.archivo, defecto=0)
+    fig, ax = plt.subplots()
+    vivo = CartaEnVivo(ax, float(atmosfera.presion_altitud(Z)), horas=args.horas, titulo=f"Carta Psicrométrica - {args.archivo}")
+    temporizador = vivo.animar(reproductor(args.archivo, args.velocidad))
+    plt.show()
+    temporizador.stop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+""" diseno.py
+
+Evaluación por lotes de puntos de diseño para el dimensionamiento de ventiladores, paneles
+evaporativos y calefactores de invernaderos contra una serie de clima completa (por ejemplo, un año
+de datos horarios de una EMA).
+
+Las propiedades del aire exterior (W, entalpía, bulbo húmedo y volumen específico) se calculan una
+sola vez con variables_psicrometricas_np y se comparten por todos los candidatos. Cada candidato es
+una combinación de caudal, eficiencia del panel y consignas; los candidatos forman la primera
+dimensión de los arreglos y las horas la segunda, de modo que un bloque de candidatos se evalúa con
+broadcasting en una sola pasada. Los bloques limitan la memoria y se pueden repartir en varios
+procesos.
+
+Modelo de cada hora (estado estable):
+    -El panel se enciende si la TBS exterior supera la consigna de enfriamiento y enfría el aire a
+     entalpía constante: T = TBS - eficiencia*(TBS - TBH).
+    -El aire del invernadero se calienta con la ganancia de calor (kW): T_int = T + Q/(m*cp).
+    -Si T_int queda debajo de la consigna de calefacción el calefactor aporta la diferencia.
+
+Example
+    >>> import diseno
+    >>> estados = diseno.clima(TBS, RH/100, P/10)
+    >>> candidatos = diseno.rejilla(caudal=np.linspace(5, 50, 10), eficiencia=[0, 0.7, 0.85],
+    ...                             consigna_enfriamiento=[22, 25, 28], consigna_calefaccion=[8, 12])
+    >>> metricas = diseno.evaluar(estados, candidatos, ganancia=120)
+    >>> mejores = diseno.mejores(metricas, 5)
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+
+import numpy as np
+
+import variables_psicrometricas_np as vpn
+
+#Parámetros de cada candidato y su valor por defecto
+PARAMETROS = {
+    'caudal': 10.0,                     #Caudal de aire exterior en m³/s
+    'eficiencia': 0.0,                  #Eficiencia de saturación del panel evaporativo (0 sin panel)
+    'consigna_enfriamiento': 25.0,      #TBS exterior a partir de la cual se enciende el panel, °C
+    'consigna_calefaccion': 10.0,       #Temperatura interior mínima, °C
+}
+
+#Límites de confort del invernadero
+T_MAX = 30.0            #Temperatura interior máxima en °C
+RH_MAX = 0.9            #Humedad relativa interior máxima (riesgo de condensación y hongos)
+
+#Ventilador: caída de presión (Pa) y eficiencia total
+PRESION_VENTILADOR = 60.0
+EFICIENCIA_VENTILADOR = 0.5
+
+#Pesos del puntaje (menor es mejor); cada uno convierte su métrica a un costo comparable
+PESOS = {
+    'grados_hora': 1.0,             #°C·h sobre T_MAX
+    'calefaccion_kWh': 0.05,
+    'ventilador_kWh': 0.05,
+    'agua_m3': 0.5,
+    'horas_humedad': 0.2,
+}
+
+#Número máximo de elementos (candidatos × horas) por bloque
+BLOQUE = 2**21
+
+#Estados del clima y opciones de cada proceso, se asignan con _inicializar()
+_ESTADOS = None
+_OPCIONES = None
+
+def clima(tbs, RH, P_atm, precision: str = 'estandar') -> dict:
+    """
+    Retorna los estados del aire exterior que usa evaluar(), calculados una sola vez.
+
+    Args:
+        tbs: Temperatura de bulbo seco en °C
+        RH: Humedad relativa en fracción
+        P_atm: Presión atmosférica en kPa
+        precision: Nivel de precisión de la TBH (llave de variables_psicrometricas_np.PRECISIONES)
+
+    Returns:
+        Diccionario con TBS, P_atm, W, H, TBH y VEH de cada hora
+    """
+    tbs, RH, P_atm = np.broadcast_arrays(np.asarray(tbs, dtype=float), np.asarray(RH, dtype=float),
+                                         np.asarray(P_atm, dtype=float))
+    estados = vpn.propiedades(tbs, RH, P_atm, ('W', 'H', 'TBH', 'VEH'), precision=precision)
+    estados['TBS'] = tbs
+    estados['P_atm'] = P_atm
+    return estados
+
+def _validar(nombres) -> None:
+    """
+    Lanza ValueError si algún nombre no es un parámetro de PARAMETROS (por ejemplo 'eficencia').
+    """
+    desconocidos = sorted(set(nombres) - set(PARAMETROS))
+    if desconocidos:
+        raise ValueError(f"Parámetros desconocidos: {', '.join(desconocidos)}; los válidos son: {', '.join(PARAMETROS)}")
+
+def rejilla(**valores) -> dict:
+    """
+    Retorna todas las combinaciones de los valores dados como candidatos (un arreglo por parámetro);
+    los parámetros que no se dan toman su valor de PARAMETROS. Los nombres que no son parámetros
+    lanzan ValueError.
+    """
+    _validar(valores)
+    nombres = list(valores)
+    combinaciones = np.array(list(itertools.product(*(np.atleast_1d(valores[n]) for n in nombres))), dtype=float).reshape(-1, len(nombres))
+    return {n: combinaciones[:, i] for i, n in enumerate(nombres)}
+
+def _evaluar(estados: dict, candidatos: dict, ganancia, intervalo: float, t_max: float, rh_max: float) -> dict:
+    """
+    Evalúa un bloque de candidatos: los candidatos son columnas (c, 1) y las horas filas (1, h).
+    """
+    n = max((len(x) for x in candidatos.values()), default=1)
+    p = {nombre: np.broadcast_to(np.asarray(candidatos.get(nombre, defecto), dtype=float), (n,))[:, None]
+         for nombre, defecto in PARAMETROS.items()}
+    tbs, W, H, TBH, VEH, P = (estados[c][None, :] for c in ('TBS', 'W', 'H', 'TBH', 'VEH', 'P_atm'))
+
+    #Panel evaporativo (enfriamiento a entalpía constante) y aire de suministro
+    panel = np.where(tbs > p['consigna_enfriamiento'], p['eficiencia'], 0.0)
+    T = tbs - panel*(tbs - TBH)
+    Ws = vpn.razon_hum_entalpia(T, H)
+    m = p['caudal']/VEH                     #kg de aire seco/s
+    mcp = m*(1.006 + 1.86*Ws)               #kW/°C
+
+    #Temperatura interior y calefacción
+    T_int = T + ganancia/mcp
+    calor = np.maximum(p['consigna_calefaccion'] - T_int, 0)*mcp
+    T_int = np.maximum(T_int, p['consigna_calefaccion'])
+
+    #Humedad relativa interior con la razón de humedad del suministro
+    pv = P*Ws/(0.62198 + Ws)
+    with np.errstate(invalid='ignore'):
+        humedo = pv/vpn.pres_vapor_sat(T_int) > rh_max
+
+    horas = np.sum(~np.isnan(tbs))*intervalo
+    metricas = {
+        'grados_hora': np.nansum(np.maximum(T_int - t_max, 0), axis=1)*intervalo,
+        'horas_calor': np.sum(T_int > t_max, axis=1)*intervalo,
+        'calefaccion_kWh': np.nansum(calor, axis=1)*intervalo,
+        'agua_m3': np.nansum(m*(Ws - W), axis=1)*3600*intervalo/1000,
+        'horas_humedad': np.sum(humedo, axis=1)*intervalo,
+        'ventilador_kWh': p['caudal'][:, 0]*PRESION_VENTILADOR/EFICIENCIA_VENTILADOR/1000*horas,
+    }
+    return metricas
+
+def _inicializar(estados: dict, opciones: dict) -> None:
+    global _ESTADOS, _OPCIONES
+    _ESTADOS = estados
+    _OPCIONES = opciones
+
+def _bloque(candidatos: dict) -> dict:
+    return _evaluar(_ESTADOS, candidatos, **_OPCIONES)
+
+def evaluar(estados: dict, candidatos: dict, ganancia=0.0, intervalo: float = 1.0, t_max: float = T_MAX,
+            rh_max: float = RH_MAX, pesos: dict = PESOS, bloque: int = BLOQUE, procesos: int = None) -> dict:
+    """
+    Evalúa los candidatos contra toda la serie de clima. Los nombres de candidatos que no son
+    parámetros de PARAMETROS lanzan ValueError, en lugar de evaluarse con el valor por defecto.
+
+    Args:
+        estados: Estados del aire exterior (ver clima())
+        candidatos: Diccionario {parámetro: arreglo} con un valor por candidato (ver PARAMETROS y rejilla())
+        ganancia: Ganancia de calor del invernadero en kW, constante o una por hora
+        intervalo: Horas que representa cada dato
+        t_max: Temperatura interior máxima en °C
+        rh_max: Humedad relativa interior máxima en fracción
+        pesos: Pesos del puntaje por métrica
+        bloque: Número máximo de elementos (candidatos × horas) por bloque
+        procesos: Número de procesos (None o 1 para calcular en el proceso actual)
+
+    Returns:
+        Diccionario {métrica: arreglo con un valor por candidato}, incluido 'puntaje' (arreglos
+        vacíos si no hay candidatos; sin parámetros se evalúa un candidato con los de PARAMETROS)
+    """
+    _validar(candidatos)
+    candidatos = {nombre: np.atleast_1d(np.asarray(x, dtype=float)) for nombre, x in candidatos.items()}
+    n = max((len(x) for x in candidatos.values()), default=1)
+    candidatos = {nombre: np.broadcast_to(x, (n,)) for nombre, x in candidatos.items()}
+    opciones = {'ganancia': np.asarray(ganancia, dtype=float), 'intervalo': intervalo, 't_max': t_max, 'rh_max': rh_max}
+
+    paso = max(bloque // max(len(estados['TBS']), 1), 1)
+    #Sin candidatos se evalúa un bloque vacío, que da las métricas sin valores
+    tareas = [{nombre: x[i:i + paso] for nombre, x in candidatos.items()} for i in range(0, max(n, 1), paso)]
+    if procesos is None or procesos == 1:
+        partes = [_evaluar(estados, tarea, **opciones) for tarea in tareas]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar, initargs=(estados, opciones)) as grupo:
+            partes = list(grupo.map(_bloque, tareas))
+
+    metricas = {nombre: np.concatenate([parte[nombre] for parte in partes]) for nombre in partes[0]}
+    metricas['puntaje'] = sum(peso*metricas[nombre] for nombre, peso in pesos.items())
+    return metricas
+
+def mejores(metricas: dict, n: int = 10, por: str = 'puntaje') -> np.ndarray:
+    """
+    Retorna los índices de los n candidatos con el menor valor de la métrica dada.
+    """
+    return np.argsort(metricas[por], kind='stable')[:n]
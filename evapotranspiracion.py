@@ -0,0 +1,196 @@
+""" evapotranspiracion.py
+
+Déficit de presión de vapor (VPD) y evapotranspiración de referencia (ET0) de Penman-Monteith
+FAO-56 a partir de los datos de 10 minutos de las EMA (temperatura, humedad relativa, presión,
+rapidez de viento y radiación solar), calculados en una sola pasada vectorizada con
+pres_vapor_sat y presion_vapor de variables_psicrometricas_np.
+
+Se usa la forma horaria de FAO-56 (ec. 53) escalada a la duración del intervalo de los datos, con
+la radiación neta estimada a partir de la radiación solar medida (ec. 28-40) y el flujo de calor
+del suelo como fracción de la radiación neta (ec. 45-46). La agregación diaria suma ET0 y promedia
+el VPD por día local. Los archivos de EMA calculan la hora solar con la fecha UTC porque la fecha
+local cambia de desfase con el horario de verano (UTC-5 en octubre de 2022 en Zacatecas).
+
+Example
+    >>> import evapotranspiracion as et
+    >>> dias = et.desde_archivo("Estacion_ZACATECAS_EMA.csv")
+    >>> dias['dia'][:3], dias['ET0'][:3]     #El primer día está incompleto
+    (array(['2022-10-12', '2022-10-13', '2022-10-14'], dtype='datetime64[D]'), array([ nan, 3.76, 3.61]))
+"""
+
+import numpy as np
+
+import variables_psicrometricas_np as vpn
+
+#Constantes de FAO-56
+GSC = 0.0820                #Constante solar, MJ/m²/min
+SIGMA = 4.903e-9 / 24       #Constante de Stefan-Boltzmann, MJ/K⁴/m²/h
+ALBEDO = 0.23               #Albedo del cultivo de referencia (pasto)
+RS_RSO_NOCHE = 0.8          #Rs/Rso que se usa de noche, cuando no se puede calcular
+MERIDIANO = 90              #Meridiano del horario local (°O), tiempo del centro de México (UTC-6)
+
+def deficit_presion_vapor(tbs, RH, out=None) -> np.ndarray:
+    """
+    Retorna el déficit de presión de vapor (presión de vapor a saturación menos presión de vapor).
+
+    Args:
+        tbs: Temperatura de bulbo seco en °C
+        RH: Humedad relativa en fracción
+        out: Arreglo preasignado donde se escribe el resultado (opcional)
+
+    Returns:
+        Déficit de presión de vapor en kPa
+    """
+    return vpn._salida(vpn.pres_vapor_sat(tbs) - vpn.presion_vapor(RH, tbs), out)
+
+def viento_2m(viento, altura: float = 10) -> np.ndarray:
+    """
+    Retorna la rapidez del viento a 2 m (FAO-56 ec. 47) a partir de la medida a la altura dada.
+    """
+    return np.asarray(viento, dtype=float) * 4.87 / np.log(67.8*altura - 5.42)
+
+def radiacion_extraterrestre(fecha, intervalo: float, latitud: float, longitud: float,
+                             meridiano: float = MERIDIANO) -> np.ndarray:
+    """
+    Retorna la radiación extraterrestre de cada intervalo (FAO-56 ec. 28-33); es 0 de noche.
+
+    Args:
+        fecha: Fechas (datetime64) en hora local estándar, al final de cada intervalo
+        intervalo: Duración de cada intervalo en horas
+        latitud: Latitud en grados (positiva al norte)
+        longitud: Longitud en grados al oeste de Greenwich
+        meridiano: Meridiano del horario local en grados al oeste de Greenwich
+
+    Returns:
+        Radiación extraterrestre en MJ/m² por intervalo
+    """
+    fecha = np.asarray(fecha, dtype='datetime64[s]')
+    dia = fecha.astype('datetime64[D]')
+    J = (dia - dia.astype('datetime64[Y]')).astype(float) + 1
+    hora = (fecha - dia).astype(float)/3600 - intervalo/2      #Punto medio del intervalo
+
+    dr = 1 + 0.033*np.cos(2*np.pi*J/365)
+    delta = 0.409*np.sin(2*np.pi*J/365 - 1.39)
+    b = 2*np.pi*(J - 81)/364
+    Sc = 0.1645*np.sin(2*b) - 0.1255*np.cos(b) - 0.025*np.sin(b)
+
+    omega = np.pi/12*((hora + 0.06667*(meridiano - longitud) + Sc) - 12)
+    omega1 = omega - np.pi*intervalo/24
+    omega2 = omega + np.pi*intervalo/24
+
+    phi = np.radians(latitud)
+    Ra = 12*60/np.pi*GSC*dr*((omega2 - omega1)*np.sin(phi)*np.sin(delta)
+                             + np.cos(phi)*np.cos(delta)*(np.sin(omega2) - np.sin(omega1)))
+    return np.maximum(Ra, 0)
+
+def et0(fecha, tbs, RH, P_atm, viento, radiacion, latitud: float, longitud: float, altitud: float,
+        intervalo: float = 1/6, meridiano: float = MERIDIANO, altura_viento: float = 10) -> np.ndarray:
+    """
+    Retorna la evapotranspiración de referencia de Penman-Monteith FAO-56 de cada intervalo.
+
+    Args:
+        fecha: Fechas (datetime64) en hora local estándar, al final de cada intervalo
+        tbs: Temperatura de bulbo seco en °C
+        RH: Humedad relativa en fracción
+        P_atm: Presión atmosférica en kPa
+        viento: Rapidez del viento en m/s a altura_viento
+        radiacion: Radiación solar en W/m²
+        latitud: Latitud en grados (positiva al norte)
+        longitud: Longitud en grados al oeste de Greenwich
+        altitud: Altitud en metros
+        intervalo: Duración de cada intervalo en horas
+        meridiano: Meridiano del horario local en grados al oeste de Greenwich
+        altura_viento: Altura del anemómetro en metros
+
+    Returns:
+        Evapotranspiración de referencia en mm por intervalo
+    """
+    tbs = np.asarray(tbs, dtype=float)
+    es = vpn.pres_vapor_sat(tbs)
+    ea = vpn.presion_vapor(RH, tbs)
+    Delta = es*vpn.dLnPws(tbs)
+    gamma = 0.665e-3*np.asarray(P_atm, dtype=float)
+    u2 = viento_2m(viento, altura_viento)
+
+    #Radiación neta (onda corta menos onda larga) y flujo de calor del suelo, MJ/m² por intervalo
+    Rs = np.asarray(radiacion, dtype=float)*0.0036*intervalo
+    Ra = radiacion_extraterrestre(fecha, intervalo, latitud, longitud, meridiano)
+    Rso = (0.75 + 2e-5*altitud)*Ra
+    dia = Rso > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        relativa = np.where(dia, np.clip(Rs/Rso, 0.25, 1.0), RS_RSO_NOCHE)
+        Rnl = SIGMA*intervalo*(tbs + 273.16)**4*(0.34 - 0.14*np.sqrt(ea))*(1.35*relativa - 0.35)
+    Rn = (1 - ALBEDO)*Rs - Rnl
+    G = np.where(dia, 0.1, 0.5)*Rn
+
+    return (0.408*Delta*(Rn - G) + gamma*37*intervalo/(tbs + 273)*u2*(es - ea)) / (Delta + gamma*(1 + 0.34*u2))
+
+def diario(fecha, valores, operacion: str = 'suma') -> tuple:
+    """
+    Agrega una serie por día local sin ciclos de Python. Los NaN no se toman en cuenta.
+
+    Args:
+        fecha: Fechas (datetime64) de cada dato, en cualquier orden
+        valores: Valores a agregar
+        operacion: 'suma' o 'media'
+
+    Returns:
+        Días (datetime64[D]) ordenados
+        Valor agregado de cada día
+        Número de datos válidos de cada día
+    """
+    dia = np.asarray(fecha).astype('datetime64[D]')
+    valores = np.asarray(valores, dtype=float)
+    dias, indice = np.unique(dia, return_inverse=True)
+
+    validos = ~np.isnan(valores)
+    suma = np.bincount(indice[validos], weights=valores[validos], minlength=len(dias))
+    conteo = np.bincount(indice[validos], minlength=len(dias))
+    if operacion == 'suma':
+        return dias, suma, conteo
+    if operacion == 'media':
+        with np.errstate(invalid='ignore'):
+            return dias, suma/conteo, conteo
+    raise ValueError(f"Operación no soportada: {operacion}")
+
+def desde_archivo(ruta: str, completos: float = 0.9, directorio: str = None) -> dict:
+    """
+    Retorna ET0 y VPD diarios de un archivo de EMA. La latitud, la longitud y la altitud se toman
+    de los metadatos del archivo y el intervalo de la separación más común entre datos. ET0 se
+    calcula con la fecha UTC (meridiano 0) y se agrega por la fecha local.
+
+    Args:
+        ruta: Archivo de la EMA
+        completos: Fracción mínima de datos válidos para reportar un día (los demás son NaN)
+        directorio: Directorio de la caché de conversión (por defecto carga_datos.DIRECTORIO_CACHE)
+
+    Returns:
+        Diccionario con las llaves 'dia', 'ET0' (mm/día), 'VPD' (kPa, media diaria) y 'datos'
+    """
+    import carga_datos
+
+    nombres = carga_datos.COLUMNAS_EMA
+    datos = carga_datos.cargar(ruta, directorio=directorio)
+    meta = carga_datos.metadatos(ruta)
+    fecha = np.asarray(datos[nombres['FECHA']])
+    utc = np.asarray(datos[nombres['FECHA_UTC']])
+
+    pasos, veces = np.unique(np.abs(np.diff(utc)), return_counts=True)
+    intervalo = pasos[np.argmax(veces)] / np.timedelta64(1, 'h')
+
+    TBS = datos[nombres['TBS']]
+    RH = datos[nombres['RH']]/100
+    ET0 = et0(utc, TBS, RH, datos[nombres['P']]/10, datos[nombres['VIENTO']]/3.6,
+              datos[nombres['RADIACION']], meta['Latitud (N)'], abs(meta['Longitud (O)']), meta['Altitud'],
+              intervalo, meridiano=0)
+    VPD = deficit_presion_vapor(TBS, RH)
+
+    dias, ET0_dia, n = diario(fecha, ET0, 'suma')
+    _, VPD_dia, _ = diario(fecha, VPD, 'media')
+    incompleto = n < completos*24/intervalo
+    return {
+        'dia': dias,
+        'ET0': np.where(incompleto, np.nan, ET0_dia),
+        'VPD': np.where(incompleto, np.nan, VPD_dia),
+        'datos': n,
+    }
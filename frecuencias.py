@@ -0,0 +1,216 @@
+""" frecuencias.py
+
+Tablas de frecuencia conjunta (horas por intervalo, "bin-hours") de temperatura de bulbo seco
+contra razón de humedad o entalpía, para el análisis de diseño de sistemas HVAC e invernaderos.
+
+La tabla se acumula por trozos con memoria fija: solo se guarda la matriz de conteos, sin importar
+cuántos datos se procesen. Las tablas parciales (de otros procesos, años o estaciones) con los
+mismos intervalos se pueden guardar, cargar y sumar. De la tabla se obtienen las condiciones de
+diseño por percentil de excedencia (0.4 %, 1 % y 2 %).
+
+Example
+    >>> import frecuencias
+    >>> tabla = frecuencias.desde_archivo("Estacion_ZACATECAS_EMA.csv", eje_y='W')
+    >>> tabla.tabla()                   #DataFrame de horas por intervalo
+    >>> tabla.percentiles_diseno()
+    {0.4: {'tbs': 26.0, 'y_coincidente': 0.0045, 'y': 0.0112, 'tbs_coincidente': 12.7}, ...}
+"""
+
+import numpy as np
+
+import variables_psicrometricas_np as vpn
+
+#Intervalos por defecto de cada eje
+BORDES_TBS = np.arange(-20, 52, 2.0)            #°C
+BORDES_W = np.arange(0, 0.0302, 0.001)          #kg_agua/kg_aire
+BORDES_H = np.arange(-20, 122, 4.0)             #kJ/kg
+
+#Percentiles de excedencia de diseño (%)
+NIVELES = (0.4, 1, 2)
+
+class TablaFrecuencias:
+    """
+    Tabla de conteos de dos dimensiones (tbs × y). Además de los intervalos dados, cada eje tiene
+    un intervalo inferior y uno superior para los datos fuera de los bordes, así que ningún dato
+    válido se pierde; los datos NaN se cuentan en descartados.
+
+    Args:
+        bordes_x: Bordes de los intervalos de temperatura de bulbo seco en °C
+        bordes_y: Bordes de los intervalos de la variable y
+        eje_y: Nombre de la variable y ('W' o 'H')
+        intervalo: Horas que representa cada dato (10/60 para datos cada 10 minutos)
+    """
+    def __init__(self, bordes_x=BORDES_TBS, bordes_y=BORDES_W, eje_y: str = 'W', intervalo: float = 1.0):
+        self.bordes_x = np.asarray(bordes_x, dtype=float)
+        self.bordes_y = np.asarray(bordes_y, dtype=float)
+        self.eje_y = eje_y
+        self.intervalo = intervalo
+        self.conteo = np.zeros((len(self.bordes_x) + 1, len(self.bordes_y) + 1), dtype=np.int64)
+        self.descartados = 0
+
+    def actualizar(self, tbs, y) -> None:
+        """
+        Agrega un trozo de datos a la tabla.
+        """
+        tbs = np.asarray(tbs, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        validos = ~(np.isnan(tbs) | np.isnan(y))
+        self.descartados += int(validos.size - validos.sum())
+
+        #searchsorted regresa 0 para el intervalo inferior y len(bordes) para el superior
+        ix = np.searchsorted(self.bordes_x, tbs[validos], side='right')
+        iy = np.searchsorted(self.bordes_y, y[validos], side='right')
+        n_y = self.conteo.shape[1]
+        self.conteo += np.bincount(ix*n_y + iy, minlength=self.conteo.size).reshape(self.conteo.shape)
+
+    def _compatible(self, otra) -> None:
+        if (self.eje_y != otra.eje_y or self.intervalo != otra.intervalo
+                or not np.array_equal(self.bordes_x, otra.bordes_x)
+                or not np.array_equal(self.bordes_y, otra.bordes_y)):
+            raise ValueError("Las tablas no tienen los mismos intervalos")
+
+    def __iadd__(self, otra):
+        self._compatible(otra)
+        self.conteo += otra.conteo
+        self.descartados += otra.descartados
+        return self
+
+    def __add__(self, otra):
+        suma = TablaFrecuencias(self.bordes_x, self.bordes_y, self.eje_y, self.intervalo)
+        suma += self
+        suma += otra
+        return suma
+
+    def guardar(self, ruta: str) -> None:
+        """
+        Guarda la tabla parcial en un archivo .npz para combinarla en otro proceso.
+        """
+        np.savez(ruta, bordes_x=self.bordes_x, bordes_y=self.bordes_y, conteo=self.conteo,
+                 descartados=self.descartados, eje_y=self.eje_y, intervalo=self.intervalo)
+
+    @classmethod
+    def cargar(cls, ruta: str):
+        """
+        Carga una tabla guardada con guardar().
+        """
+        with np.load(ruta) as archivo:
+            tabla = cls(archivo['bordes_x'], archivo['bordes_y'], str(archivo['eje_y']), float(archivo['intervalo']))
+            tabla.conteo = archivo['conteo'].copy()
+            tabla.descartados = int(archivo['descartados'])
+        return tabla
+
+    @staticmethod
+    def _etiquetas(bordes: np.ndarray) -> list:
+        return ([f"< {bordes[0]:g}"] + [f"{a:g} - {b:g}" for a, b in zip(bordes[:-1], bordes[1:])]
+                + [f">= {bordes[-1]:g}"])
+
+    def horas(self) -> np.ndarray:
+        """
+        Retorna la matriz de horas (conteo × intervalo), con los intervalos inferior y superior.
+        """
+        return self.conteo*self.intervalo
+
+    def tabla(self):
+        """
+        Retorna la tabla de horas como DataFrame (filas: tbs, columnas: y) sin las filas
+        y columnas vacías de los extremos.
+        """
+        import pandas as pd
+
+        df = pd.DataFrame(self.horas(), index=self._etiquetas(self.bordes_x), columns=self._etiquetas(self.bordes_y))
+        df.index.name = 'TBS'
+        df.columns.name = self.eje_y
+        filas = np.nonzero(self.conteo.sum(axis=1))[0]
+        columnas = np.nonzero(self.conteo.sum(axis=0))[0]
+        if filas.size == 0:
+            return df.iloc[0:0, 0:0]
+        return df.iloc[filas[0]:filas[-1] + 1, columnas[0]:columnas[-1] + 1]
+
+    @staticmethod
+    def _excedencia(marginal: np.ndarray, bordes: np.ndarray, nivel: float) -> tuple:
+        """
+        Retorna el valor excedido por el nivel (%) de los datos, interpolando dentro del intervalo,
+        y el índice del intervalo que lo contiene.
+        """
+        acumulado = np.cumsum(marginal[::-1])[::-1]    #Datos en el intervalo i o superiores
+        objetivo = nivel/100*acumulado[0]
+        i = int(np.nonzero(acumulado >= objetivo)[0][-1])
+        if i == 0:
+            return bordes[0], i
+        if i == len(marginal) - 1:
+            return bordes[-1], i
+
+        encima = acumulado[i + 1]
+        fraccion = (objetivo - encima)/marginal[i]
+        return bordes[i] - fraccion*(bordes[i] - bordes[i - 1]), i
+
+    @staticmethod
+    def _centros(bordes: np.ndarray) -> np.ndarray:
+        #Los intervalos de los extremos se representan con el borde
+        return np.concatenate(([bordes[0]], (bordes[:-1] + bordes[1:])/2, [bordes[-1]]))
+
+    def percentiles_diseno(self, niveles: tuple = NIVELES) -> dict:
+        """
+        Retorna las condiciones de diseño por percentil de excedencia: el valor de tbs excedido
+        por el nivel (%) de las horas con el valor medio coincidente de y, y el valor de y
+        excedido con la tbs media coincidente.
+
+        Returns:
+            Diccionario {nivel: {'tbs', 'y_coincidente', 'y', 'tbs_coincidente'}}
+        """
+        if self.conteo.sum() == 0:
+            raise ValueError("La tabla no tiene datos")
+
+        centros_x = self._centros(self.bordes_x)
+        centros_y = self._centros(self.bordes_y)
+        resultado = {}
+        for nivel in niveles:
+            tbs, i = self._excedencia(self.conteo.sum(axis=1), self.bordes_x, nivel)
+            y, j = self._excedencia(self.conteo.sum(axis=0), self.bordes_y, nivel)
+            resultado[nivel] = {
+                'tbs': float(tbs),
+                'y_coincidente': float(np.average(centros_y, weights=self.conteo[i, :])),
+                'y': float(y),
+                'tbs_coincidente': float(np.average(centros_x, weights=self.conteo[:, j])),
+            }
+        return resultado
+
+def desde_archivo(ruta: str, eje_y: str = 'W', bordes_x=BORDES_TBS, bordes_y=None,
+                  intervalo: float = 10/60, tamano: int = 50000) -> TablaFrecuencias:
+    """
+    Acumula la tabla de frecuencias de una exportación de EMA leyéndola por trozos: cada trozo se
+    valida (con el mismo resultado que validar el archivo completo, ver
+    validacion.validar_por_trozos), se calculan W o H y se agrega a la tabla, así que la memoria no
+    depende del tamaño del archivo.
+
+    Args:
+        ruta: Archivo CSV de la EMA (con las columnas de carga_datos.COLUMNAS_EMA)
+        eje_y: 'W' (razón de humedad) o 'H' (entalpía)
+        bordes_x: Bordes de los intervalos de tbs
+        bordes_y: Bordes de los intervalos de y (por defecto BORDES_W o BORDES_H)
+        intervalo: Horas que representa cada dato
+        tamano: Número de filas por trozo
+
+    Returns:
+        Tabla de frecuencias
+    """
+    import pandas as pd
+
+    import carga_datos
+    import validacion
+
+    if bordes_y is None:
+        bordes_y = BORDES_W if eje_y == 'W' else BORDES_H
+    tabla = TablaFrecuencias(bordes_x, bordes_y, eje_y, intervalo)
+    nombres = carga_datos.COLUMNAS_EMA
+
+    lector = pd.read_csv(ruta, encoding="latin-1", skiprows=carga_datos.fila_encabezado(ruta, "latin-1"),
+                         usecols=[nombres['TBS'], nombres['RH'], nombres['P']], chunksize=tamano)
+    trozos = ({c: pd.to_numeric(trozo[nombres[c]], errors="coerce").to_numpy() for c in ('TBS', 'RH', 'P')}
+              for trozo in lector)
+    #Cada trozo se valida con las filas vecinas del trozo anterior (picos y rachas en los bordes)
+    for limpios in validacion.validar_por_trozos(trozos):
+        propiedades = vpn.propiedades(limpios['TBS'], limpios['RH']/100, limpios['P']/10, columnas=(eje_y,))
+        tabla.actualizar(limpios['TBS'], propiedades[eje_y])
+
+    return tabla
@@ -0,0 +1,138 @@
+""" incertidumbre.py
+
+Propagación de la incertidumbre de los sensores (temperatura, humedad relativa y presión) a las
+variables psicrométricas por el método de Monte Carlo o, de forma linealizada, con las derivadas
+analíticas de jacobianos.py.
+
+Para cada observación se generan n muestras perturbadas de acuerdo con la exactitud de los
+sensores y todas se evalúan de una sola vez con las funciones de variables_psicrometricas_np. Las
+observaciones se procesan por bloques de a lo más BLOQUE muestras, de modo que la memoria no
+depende del número de observaciones.
+
+Example
+    >>> import incertidumbre
+    >>> r = incertidumbre.monte_carlo([19.7, 25.0], [15, 60], [779.5, 779.5], n=10000, semilla=1)
+    >>> r['TBH']['media'], r['TBH']['desviacion']
+    (array([ 6.81, 19.01]), array([0.50, 0.46]))
+"""
+
+import warnings
+
+import numpy as np
+
+import jacobianos
+import variables_psicrometricas_np as vpn
+
+#Exactitud de los sensores (desviación estándar con distribución normal o semiancho con uniforme)
+EXACTITUD = {
+    'TBS': 0.2,     #°C
+    'RH': 2.5,      #%
+    'P': 0.5,       #hPa
+}
+
+#Número máximo de muestras por bloque
+BLOQUE = 2**20
+
+def muestras(TBS, RH, P, n: int, exactitud: dict = EXACTITUD, distribucion: str = 'normal', rng=None) -> tuple:
+    """
+    Retorna las muestras perturbadas (observación × muestra) de las tres entradas.
+
+    Args:
+        TBS: Temperatura de bulbo seco en °C
+        RH: Humedad relativa en porcentaje
+        P: Presión atmosférica en hPa
+        n: Número de muestras por observación
+        exactitud: Exactitud de cada sensor (llaves 'TBS', 'RH' y 'P')
+        distribucion: 'normal' o 'uniforme'
+        rng: Generador de números aleatorios de NumPy
+
+    Returns:
+        Arreglos TBS, RH (recortada a [0, 100]) y P de forma (observaciones, n)
+    """
+    rng = rng or np.random.default_rng()
+    resultado = []
+    for nombre, x in (('TBS', TBS), ('RH', RH), ('P', P)):
+        x = np.asarray(x, dtype=float)[:, np.newaxis]
+        if distribucion == 'normal':
+            ruido = rng.normal(0, exactitud[nombre], (x.shape[0], n))
+        elif distribucion == 'uniforme':
+            ruido = rng.uniform(-exactitud[nombre], exactitud[nombre], (x.shape[0], n))
+        else:
+            raise ValueError(f"Distribución no soportada: {distribucion}")
+        resultado.append(x + ruido)
+
+    resultado[1] = np.clip(resultado[1], 0, 100)
+    return tuple(resultado)
+
+def monte_carlo(TBS, RH, P, n: int = 1000, columnas: tuple = ('W', 'H', 'TPR', 'TBH'),
+                exactitud: dict = EXACTITUD, distribucion: str = 'normal',
+                percentiles: tuple = (2.5, 50, 97.5), semilla: int = None, bloque: int = BLOQUE) -> dict:
+    """
+    Retorna la media, la desviación estándar y los percentiles de cada variable psicrométrica
+    por observación.
+
+    Args:
+        TBS: Temperatura de bulbo seco en °C
+        RH: Humedad relativa en porcentaje
+        P: Presión atmosférica en hPa
+        n: Número de muestras por observación
+        columnas: Variables a evaluar (subconjunto de variables_psicrometricas_np.COLUMNAS)
+        exactitud: Exactitud de cada sensor (llaves 'TBS', 'RH' y 'P')
+        distribucion: 'normal' o 'uniforme'
+        percentiles: Percentiles a calcular (%)
+        semilla: Semilla del generador de números aleatorios
+        bloque: Número máximo de muestras evaluadas a la vez
+
+    Returns:
+        Diccionario {columna: {'media', 'desviacion', 'percentiles'}}; 'percentiles' tiene
+        forma (observaciones, len(percentiles))
+    """
+    TBS, RH, P = np.broadcast_arrays(np.atleast_1d(np.asarray(TBS, dtype=float)),
+                                     np.atleast_1d(np.asarray(RH, dtype=float)),
+                                     np.atleast_1d(np.asarray(P, dtype=float)))
+    m = TBS.shape[0]
+    rng = np.random.default_rng(semilla)
+
+    resultado = {columna: {'media': np.empty(m), 'desviacion': np.empty(m),
+                           'percentiles': np.empty((m, len(percentiles)))} for columna in columnas}
+
+    paso = max(1, bloque // n)
+    for i in range(0, m, paso):
+        j = min(i + paso, m)
+        tbs_s, rh_s, p_s = muestras(TBS[i:j], RH[i:j], P[i:j], n, exactitud, distribucion, rng)
+        valores = vpn.propiedades(tbs_s, rh_s/100, p_s/10, columnas)
+
+        #Las observaciones inválidas (todas sus muestras NaN) dan NaN sin advertencias
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            for columna, v in valores.items():
+                resultado[columna]['media'][i:j] = np.nanmean(v, axis=1)
+                resultado[columna]['desviacion'][i:j] = np.nanstd(v, axis=1)
+                resultado[columna]['percentiles'][i:j] = np.nanpercentile(v, percentiles, axis=1).T
+
+    return resultado
+
+def lineal(TBS, RH, P, columnas: tuple = ('W', 'H', 'TPR', 'TBH'), exactitud: dict = EXACTITUD) -> dict:
+    """
+    Retorna el valor y la desviación estándar de cada variable psicrométrica por observación con
+    la propagación lineal de incertidumbre (entradas independientes, exactitud como desviación
+    estándar). Es mucho más rápida que monte_carlo() pero no considera la no linealidad.
+
+    Args:
+        TBS: Temperatura de bulbo seco en °C
+        RH: Humedad relativa en porcentaje
+        P: Presión atmosférica en hPa
+        columnas: Variables a evaluar (subconjunto de variables_psicrometricas_np.COLUMNAS)
+        exactitud: Exactitud de cada sensor (llaves 'TBS', 'RH' y 'P')
+
+    Returns:
+        Diccionario {columna: {'media', 'desviacion'}}
+    """
+    r = jacobianos.propiedades_derivadas(np.asarray(TBS, dtype=float), np.asarray(RH, dtype=float)/100,
+                                         np.asarray(P, dtype=float)/10, columnas)
+
+    #Desviaciones de las entradas en las unidades de las derivadas (°C, fracción, kPa)
+    sigma = {'tbs': exactitud['TBS'], 'RH': exactitud['RH']/100, 'P_atm': exactitud['P']/10}
+    return {columna: {'media': r[columna]['valor'],
+                      'desviacion': np.sqrt(sum((r[columna][x]*sigma[x])**2 for x in jacobianos.ENTRADAS))}
+            for columna in columnas}
@@ -0,0 +1,149 @@
+""" intercambio.py
+
+Entrada y salida sin copias para usar la librería dentro de otros procesos de datos. Las columnas de
+entrada pueden ser cualquier objeto con el protocolo de buffer (memoryview, array.array, memoria
+compartida, buffers de bytes), con __array__ (NumPy, pandas) o con la interfaz C de datos de Arrow
+(__arrow_c_array__ o __arrow_c_stream__: pyarrow, polars, nanoarrow, ...); se convierten a arreglos
+de NumPy que comparten la memoria del objeto original siempre que sea posible.
+
+Solo se copia cuando no hay otra opción: datos que no son float64, columnas de Arrow con nulos (los
+nulos se convierten en NaN) o de varios bloques (chunks). Los resultados se regresan como arreglos
+de NumPy (que a su vez exponen el protocolo de buffer y __array__), como una tabla de Arrow que usa
+la misma memoria, o se escriben directamente en buffers preasignados por quien llama (out).
+
+Example
+    >>> import pyarrow as pa
+    >>> import intercambio
+    >>> tabla = pa.table({'TBS': [20.0, 25.0], 'RH': [0.5, 0.6], 'P_atm': [101.325, 101.325]})
+    >>> intercambio.tabla(tabla, columnas=('W', 'H')).to_pydict()
+    {'W': [0.007262145862250797, 0.011895717929149832], 'H': [38.544790267..., 55.437984812...]}
+"""
+
+import mmap
+
+import numpy as np
+
+import variables_psicrometricas_np as vpn
+
+#Memoria sin tipo (bytes, bytearray, mmap y la memoria compartida, que es un mmap) y formato de
+#caracteres del protocolo de buffer; su contenido se interpreta como float64. Los buffers con tipo
+#entero de un byte ('B', 'b' de array.array, por ejemplo) se convierten por valor
+CRUDOS = (bytes, bytearray, mmap.mmap)
+FORMATO_CRUDO = 'c'
+
+def _crudo(vista: memoryview) -> bool:
+    return vista.format == FORMATO_CRUDO or isinstance(vista.obj, CRUDOS)
+
+def _arrow(x):
+    """
+    Convierte un objeto con la interfaz C de datos de Arrow a un arreglo de pyarrow de un solo
+    bloque, sin copiar si ya tiene un solo bloque.
+    """
+    import pyarrow as pa
+
+    if not isinstance(x, (pa.Array, pa.ChunkedArray)):
+        x = pa.array(x) if hasattr(x, "__arrow_c_array__") else pa.chunked_array(x)
+    if isinstance(x, pa.ChunkedArray):
+        x = x.chunk(0) if x.num_chunks == 1 else x.combine_chunks()
+    if x.null_count:
+        x = x.cast(pa.float64()).fill_null(np.nan)
+    return x
+
+def columna(x) -> np.ndarray:
+    """
+    Retorna una columna de entrada como arreglo de NumPy float64, compartiendo la memoria del
+    objeto original cuando es posible.
+
+    Args:
+        x: Escalar, secuencia, objeto con protocolo de buffer, __array__ o interfaz C de Arrow
+
+    Returns:
+        Arreglo de NumPy (de solo lectura si el objeto original lo es)
+    """
+    if isinstance(x, np.ndarray):
+        return x if x.dtype == np.float64 else x.astype(float)
+    if not hasattr(x, "__array__") and (hasattr(x, "__arrow_c_array__") or hasattr(x, "__arrow_c_stream__")):
+        x = _arrow(x)
+    elif type(x).__module__.startswith("pyarrow") and getattr(x, "null_count", 0):
+        x = _arrow(x)
+
+    try:
+        vista = memoryview(x)
+    except TypeError:
+        return np.asarray(x, dtype=float)
+    if _crudo(vista):
+        return np.frombuffer(vista, dtype=float)
+    return np.asarray(vista, dtype=float)
+
+def buffer_salida(x) -> np.ndarray:
+    """
+    Retorna un buffer preasignado (memoryview, memoria compartida, arreglo de NumPy, ...) como
+    arreglo float64 escribible que comparte su memoria. Los buffers de solo lectura, con otro tipo
+    o no contiguos lanzan ValueError, porque no se pueden escribir sin copiar.
+    """
+    if not isinstance(x, np.ndarray):
+        vista = memoryview(x)
+        if vista.readonly:
+            raise ValueError("El buffer de salida es de solo lectura")
+        x = np.frombuffer(vista, dtype=float) if _crudo(vista) else np.asarray(vista)
+    if x.dtype != np.float64 or not x.flags.c_contiguous:
+        raise ValueError(f"El buffer de salida debe ser float64 contiguo, no {x.dtype}"
+                         + ("" if x.flags.c_contiguous else " no contiguo"))
+    return x
+
+def a_arrow(resultados: dict):
+    """
+    Retorna un diccionario de arreglos float64 como tabla de pyarrow que usa la misma memoria. Los
+    NaN se conservan como NaN (no como nulos) para no copiar.
+    """
+    import pyarrow as pa
+
+    columnas = {}
+    for nombre, x in resultados.items():
+        x = np.ascontiguousarray(x, dtype=float).reshape(-1)
+        columnas[nombre] = pa.Array.from_buffers(pa.float64(), len(x), [None, pa.py_buffer(x)])
+    return pa.table(columnas)
+
+def propiedades(tbs, RH, P_atm, columnas: tuple = vpn.COLUMNAS, out: dict = None, salida: str = 'numpy',
+                precision: str = 'estandar'):
+    """
+    Versión de variables_psicrometricas_np.propiedades() que acepta y regresa columnas sin copias.
+
+    Args:
+        tbs: Temperatura de bulbo seco en °C
+        RH: Humedad relativa en fracción
+        P_atm: Presión atmosférica en kPa
+        columnas: Variables a calcular (subconjunto de variables_psicrometricas_np.COLUMNAS)
+        out: Diccionario {columna: buffer escribible} donde se escriben los resultados (opcional)
+        salida: 'numpy' (diccionario de arreglos) o 'arrow' (tabla de pyarrow)
+        precision: Nivel de precisión (llave de variables_psicrometricas_np.PRECISIONES)
+
+    Returns:
+        Diccionario de arreglos o tabla de pyarrow con las llaves de columnas
+    """
+    if salida not in ('numpy', 'arrow'):
+        raise ValueError(f"Salida no soportada: {salida}")
+    out = {nombre: buffer_salida(x) for nombre, x in (out or {}).items()}
+    resultados = vpn.propiedades(columna(tbs), columna(RH), columna(P_atm), columnas, out, precision)
+    return a_arrow(resultados) if salida == 'arrow' else resultados
+
+def tabla(datos, tbs: str = 'TBS', RH: str = 'RH', P_atm='P_atm', columnas: tuple = vpn.COLUMNAS,
+          salida: str = 'arrow', precision: str = 'estandar'):
+    """
+    Calcula las variables psicrométricas de una tabla (tabla o lote de pyarrow, DataFrame de
+    pandas, diccionario de columnas, arreglo estructurado, ...) sin copiar sus columnas.
+
+    Args:
+        datos: Objeto indexable por nombre de columna
+        tbs: Columna de temperatura de bulbo seco en °C
+        RH: Columna de humedad relativa en fracción
+        P_atm: Columna de presión atmosférica en kPa, o la presión como número
+        columnas: Variables a calcular
+        salida: 'numpy' o 'arrow'
+        precision: Nivel de precisión
+
+    Returns:
+        Diccionario de arreglos o tabla de pyarrow
+    """
+    P = datos[P_atm] if isinstance(P_atm, str) else P_atm
+    return propiedades(datos[tbs], datos[RH], P, columnas, salida=salida, precision=precision)
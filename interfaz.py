@@ -0,0 +1,246 @@
+""" interfaz.py
+
+Interfaz gráfica (PyQt5) para calcular las variables psicrométricas de un estado a partir de la
+temperatura de bulbo seco y la humedad relativa. El formulario se toma de gui.py (generado con
+pyuic5 a partir de gui.ui), por lo que este archivo no modifica el código generado.
+
+Los cálculos, incluida la temperatura de bulbo humedo (proceso iterativo) y las líneas de la carta
+psicrométrica, se realizan en un hilo de trabajo. Las entradas se procesan con un retardo
+(debounce) para que escribir en los campos nunca bloquee el ciclo de eventos; el punto de la carta
+se actualiza en cuanto llega el resultado.
+
+Example
+    $ python interfaz.py
+"""
+
+import sys
+
+from PyQt5 import QtCore, QtWidgets
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+
+import variables_psicrometricas as vp
+from gui import Ui_Form
+
+#Variables Globales
+Z = 2250                #Altitud en metros
+RETARDO_MS = 300        #Tiempo de espera despues de la ultima tecla antes de calcular
+
+#Etiqueta y llave de cada resultado mostrado en la ventana
+RESULTADOS = [
+    ("Presión atmosférica (kPa)", "P_atm"),
+    ("Presión de vapor a saturación (kPa)", "Pvs"),
+    ("Presión de vapor (kPa)", "Pv"),
+    ("Razón de humedad a saturación (kg_agua/kg_aire)", "Ws"),
+    ("Razón de humedad (kg_agua/kg_aire)", "W"),
+    ("Grado de saturación", "Mu"),
+    ("Volumen especifico del aire humedo (m³/kg_aire)", "Veh"),
+    ("Temperatura de punto de rocio (°C)", "tpr"),
+    ("Entalpía (kJ/kg)", "h"),
+    ("Temperatura de bulbo humedo (°C)", "tbh"),
+]
+
+def calcular_estado(tbs: float, RH: float, P_atm: float) -> dict:
+    """
+    Retorna un diccionario con las variables psicrométricas de un estado.
+
+    Args:
+        tbs: Temperatura de bulbo seco en °C
+        RH: Humedad relativa en fracción [0, 1]
+        P_atm: Presión atmosférica en kPa
+
+    Returns:
+        Diccionario con las llaves de RESULTADOS
+    """
+    Pv = vp.presion_vapor(RH, tbs)
+    Ws = vp.razon_hum_saturacion(P_atm, tbs)
+    W = vp.razon_humedad(tbs, RH, P_atm)
+
+    return {
+        "P_atm": P_atm,
+        "Pvs": vp.pres_vapor_sat(tbs),
+        "Pv": Pv,
+        "Ws": Ws,
+        "W": W,
+        "Mu": vp.grado_saturacion(W, Ws),
+        "Veh": vp.vol_esp_aire_humedo(tbs, W, P_atm),
+        "tpr": vp.temp_punto_rocio(tbs, Pv),
+        "h": vp.entalpia(tbs, RH, P_atm),
+        "tbh": vp.temp_bulbo_humedo(tbs, RH, P_atm),
+    }
+
+def lineas_carta(P_atm: float) -> list:
+    """
+    Retorna las líneas de la carta psicrométrica (humedad relativa y bulbo humedo) como una lista
+    de tuplas (tbs, W, color) para dibujarlas una sola vez.
+
+    Args:
+        P_atm: Presión atmosférica en kPa
+
+    Returns:
+        Lista de tuplas (lista de tbs, lista de W, color)
+    """
+    tbs_lista = [i/2 for i in range(0, 81)]     #0 a 40 °C
+    lineas = []
+
+    #Se generan las lineas de humedad relativa
+    for i in range(1, 11):
+        rh = i/10
+        W_lista = [vp.razon_humedad(tbs, rh, P_atm) for tbs in tbs_lista]
+        lineas.append((tbs_lista, W_lista, 'k'))
+
+    #Se generan las lineas de bulbo humedo
+    for tbh in range(0, 32, 2):
+        tbs_plot = [tbs for tbs in tbs_lista if tbh <= tbs]
+        W_lista = [vp.razon_humedad_TBH(tbs, tbh, P_atm) for tbs in tbs_plot]
+        lineas.append((tbs_plot, W_lista, 'b'))
+
+    return lineas
+
+
+class Trabajador(QtCore.QObject):
+    """
+    Objeto que vive en el hilo de trabajo y realiza los cálculos. Cada solicitud lleva un folio;
+    si al momento de atenderla ya existe una solicitud más reciente, se descarta sin calcular.
+    """
+    resultado = QtCore.pyqtSignal(int, float, dict)
+    error = QtCore.pyqtSignal(int, str)
+    carta = QtCore.pyqtSignal(list)
+
+    def __init__(self):
+        super().__init__()
+        self.ultimo_folio = 0
+
+    @QtCore.pyqtSlot(int, float, float, float)
+    def calcular(self, folio: int, tbs: float, RH: float, P_atm: float):
+        if folio < self.ultimo_folio:
+            return
+        try:
+            estado = calcular_estado(tbs, RH, P_atm)
+        except (ValueError, TypeError) as e:
+            self.error.emit(folio, str(e) or "Estado fuera del rango de las correlaciones")
+            return
+        self.resultado.emit(folio, tbs, estado)
+
+    @QtCore.pyqtSlot(float)
+    def calcular_carta(self, P_atm: float):
+        self.carta.emit(lineas_carta(P_atm))
+
+
+class Ventana(QtWidgets.QWidget):
+    """
+    Ventana principal: formulario de gui.py, resultados y carta psicrométrica con el estado actual.
+    """
+    solicitar = QtCore.pyqtSignal(int, float, float, float)
+    solicitar_carta = QtCore.pyqtSignal(float)
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Variables psicrométricas")
+        self.P_atm, _ = vp.pres_atm_temp(Z)
+        self.folio = 0
+
+        #Formulario generado con pyuic5
+        self.form = QtWidgets.QWidget()
+        self.ui = Ui_Form()
+        self.ui.setupUi(self.form)
+        self.form.setMinimumSize(160, 180)
+
+        self.etiquetas = {}
+        resultados = QtWidgets.QFormLayout()
+        for texto, llave in RESULTADOS:
+            self.etiquetas[llave] = QtWidgets.QLabel("-")
+            resultados.addRow(texto, self.etiquetas[llave])
+        self.estado = QtWidgets.QLabel("")
+
+        #Carta psicrométrica, el punto del estado actual se actualiza sin redibujar las lineas
+        figura = Figure(figsize=(5, 3.5))
+        self.canvas = FigureCanvasQTAgg(figura)
+        self.ax = figura.add_subplot()
+        self.ax.set(ylim=(0, 0.03), xlim=(0, 40), ylabel="Razón de humedad", xlabel="Temperatura de bulbo seco [°C]")
+        self.ax.yaxis.tick_right()
+        self.ax.yaxis.set_label_position('right')
+        self.punto, = self.ax.plot([], [], 'x', color="r")
+
+        izquierda = QtWidgets.QVBoxLayout()
+        izquierda.addWidget(self.form)
+        izquierda.addLayout(resultados)
+        izquierda.addWidget(self.estado)
+        layout = QtWidgets.QHBoxLayout(self)
+        layout.addLayout(izquierda)
+        layout.addWidget(self.canvas)
+
+        #Debounce de las entradas
+        self.temporizador = QtCore.QTimer(self)
+        self.temporizador.setSingleShot(True)
+        self.temporizador.setInterval(RETARDO_MS)
+        self.temporizador.timeout.connect(self.enviar)
+        self.ui.lineEdit.textChanged.connect(self.temporizador.start)
+        self.ui.lineEdit_2.textChanged.connect(self.temporizador.start)
+        self.ui.pushButton.clicked.connect(self.enviar)
+
+        #Hilo de trabajo
+        self.hilo = QtCore.QThread(self)
+        self.trabajador = Trabajador()
+        self.trabajador.moveToThread(self.hilo)
+        self.solicitar.connect(self.trabajador.calcular)
+        self.solicitar_carta.connect(self.trabajador.calcular_carta)
+        self.trabajador.resultado.connect(self.mostrar_resultado)
+        self.trabajador.error.connect(self.mostrar_error)
+        self.trabajador.carta.connect(self.dibujar_carta)
+        self.hilo.start()
+
+        self.solicitar_carta.emit(self.P_atm)
+
+    def enviar(self):
+        """Lee las entradas y envía una nueva solicitud al hilo de trabajo."""
+        self.temporizador.stop()
+        try:
+            tbs = float(self.ui.lineEdit_2.text().replace(",", "."))
+            RH = float(self.ui.lineEdit.text().replace(",", "."))/100
+        except ValueError:
+            self.estado.setText("Escriba la temperatura (°C) y la humedad relativa (%)")
+            return
+
+        self.folio += 1
+        self.trabajador.ultimo_folio = self.folio
+        self.estado.setText("Calculando...")
+        self.solicitar.emit(self.folio, tbs, RH, self.P_atm)
+
+    @QtCore.pyqtSlot(int, float, dict)
+    def mostrar_resultado(self, folio: int, tbs: float, estado: dict):
+        if folio != self.folio:
+            return
+        for llave, etiqueta in self.etiquetas.items():
+            etiqueta.setText(f"{estado[llave]:.6g}")
+        self.estado.setText("")
+        self.punto.set_data([tbs], [estado["W"]])
+        self.canvas.draw_idle()
+
+    @QtCore.pyqtSlot(int, str)
+    def mostrar_error(self, folio: int, mensaje: str):
+        if folio != self.folio:
+            return
+        for etiqueta in self.etiquetas.values():
+            etiqueta.setText("-")
+        self.estado.setText(mensaje)
+        self.punto.set_data([], [])
+        self.canvas.draw_idle()
+
+    @QtCore.pyqtSlot(list)
+    def dibujar_carta(self, lineas: list):
+        for x, y, color in lineas:
+            self.ax.plot(x, y, color, linewidth=0.8)
+        self.canvas.draw_idle()
+
+    def closeEvent(self, event):
+        self.hilo.quit()
+        self.hilo.wait()
+        super().closeEvent(event)
+
+
+if __name__ == "__main__":
+    app = QtWidgets.QApplication(sys.argv)
+    ventana = Ventana()
+    ventana.show()
+    sys.exit(app.exec_())
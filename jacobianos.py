@@ -0,0 +1,93 @@
+""" jacobianos.py
+
+Variables psicrométricas junto con sus derivadas parciales analíticas respecto a la temperatura de
+bulbo seco, la humedad relativa y la presión atmosférica, calculadas en la misma pasada
+vectorizada que los valores.
+
+Las derivadas se obtienen con la regla de la cadena a partir de dLnPws; la de la temperatura de
+bulbo humedo se obtiene con el teorema de la función implícita sobre la ecuación que resuelve la
+bisección, W(tbs, tbh, P) = W(tbs, RH, P), por lo que no hacen falta diferencias finitas.
+
+Example
+    >>> import jacobianos
+    >>> r = jacobianos.propiedades_derivadas(20, 0.5, 101.325)
+    >>> r['TBH']['valor'], r['TBH']['tbs'], r['TBH']['RH']
+    (array(13.78345724), np.float64(0.82112514), np.float64(13.93070876))
+"""
+
+import numpy as np
+
+import variables_psicrometricas_np as vpn
+from variables_psicrometricas import Ra
+
+#Entradas respecto a las que se deriva
+ENTRADAS = ('tbs', 'RH', 'P_atm')
+
+def propiedades_derivadas(tbs, RH, P_atm, columnas: tuple = vpn.COLUMNAS, precision: str = 'estandar') -> dict:
+    """
+    Retorna las variables psicrométricas y sus derivadas parciales.
+
+    Args:
+        tbs: Temperatura de bulbo seco en °C
+        RH: Humedad relativa en fracción
+        P_atm: Presión atmosférica en kPa
+        columnas: Variables a calcular (subconjunto de variables_psicrometricas_np.COLUMNAS)
+        precision: Nivel de precisión de TPR y TBH (llave de variables_psicrometricas_np.PRECISIONES);
+            las derivadas son las de la TPR de ese nivel y las de la TBH exacta
+
+    Returns:
+        Diccionario {columna: {'valor', 'tbs', 'RH', 'P_atm'}} con el valor y las derivadas
+        respecto a tbs (por °C), RH (por unidad de fracción) y P_atm (por kPa)
+    """
+    tbs, RH, P_atm = np.broadcast_arrays(np.asarray(tbs, dtype=float), np.asarray(RH, dtype=float),
+                                         np.asarray(P_atm, dtype=float))
+    cero = np.zeros(tbs.shape)
+    valores = vpn.propiedades(tbs, RH, P_atm, columnas=tuple(set(columnas) | {'PVS', 'PV', 'WS', 'W'}),
+                              precision=precision)
+    pvs, pv, ws, w = valores['PVS'], valores['PV'], valores['WS'], valores['W']
+
+    #Presiones de vapor
+    dpvs = pvs * vpn.dLnPws(tbs)
+    d = {
+        'PVS': (dpvs, cero, cero),
+        'PV': (RH*dpvs, pvs, cero),
+    }
+
+    #Razones de humedad
+    dws_dpvs = 0.62198 * P_atm / (P_atm - pvs)**2
+    d['WS'] = (dws_dpvs*dpvs, cero, -0.62198 * pvs / (P_atm - pvs)**2)
+    dw_dpv = 0.62198 * P_atm / (P_atm - pv)**2
+    d['W'] = (dw_dpv*d['PV'][0], dw_dpv*pvs, -0.62198 * pv / (P_atm - pv)**2)
+
+    #Grado de saturación
+    d['MU'] = tuple((dw*ws - w*dws)/ws**2 for dw, dws in zip(d['W'], d['WS']))
+
+    #Volumen específico: A(tbs, P)*B(W)
+    A = Ra * (tbs + 273.15) / (P_atm*1000)
+    B = (1 + 1.6078*w)/(1 + w)
+    dB_dW = 0.6078/(1 + w)**2
+    d['VEH'] = (Ra/(P_atm*1000)*B + A*dB_dW*d['W'][0], A*dB_dW*d['W'][1], -A/P_atm*B + A*dB_dW*d['W'][2])
+
+    #Punto de rocío: tpr = a + b*ln(Pv) + c*ln(Pv)², con Pv en Pa; la exacta cumple Pvs(tpr) = Pv
+    if 'TPR' in columnas:
+        if vpn._precision(precision)['TPR'] == 'exacta':
+            dtpr_dpv = 1/(pv*vpn.dLnPws(valores['TPR']))
+        else:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                lnPv = np.log(pv*1000)
+            hielo = tbs <= 0
+            b = np.where(hielo, 7.0322, -1.8726)
+            c = np.where(hielo, 0.3700, 1.1689)
+            dtpr_dpv = (b + 2*c*lnPv)/pv
+        d['TPR'] = tuple(dtpr_dpv*dpv for dpv in d['PV'])
+
+    #Entalpía
+    d['H'] = (1.006 + 1.805*w + (2501 + 1.805*tbs)*d['W'][0], (2501 + 1.805*tbs)*d['W'][1],
+              (2501 + 1.805*tbs)*d['W'][2])
+
+    #Bulbo humedo: F(tbh) = W_tbh(tbs, tbh, P) - W(tbs, RH, P) = 0
+    if 'TBH' in columnas:
+        dF_dtbh, dWtbh_dtbs, dWtbh_dP = vpn._razon_humedad_TBH_derivadas(tbs, valores['TBH'], P_atm)
+        d['TBH'] = (-(dWtbh_dtbs - d['W'][0])/dF_dtbh, d['W'][1]/dF_dtbh, -(dWtbh_dP - d['W'][2])/dF_dtbh)
+
+    return {columna: {'valor': valores[columna], **dict(zip(ENTRADAS, d[columna]))} for columna in columnas}
@@ -0,0 +1,272 @@
+""" linea_comandos.py
+
+Punto de entrada de línea de comandos para la librería variables_psicrometricas. Se ejecuta con
+`python -m variables_psicrometricas` y tiene los subcomandos:
+
+    estado  Calcula las variables psicrométricas de un solo estado
+    lote    Calcula las variables psicrométricas de un archivo CSV (TBS, RH [, P en hPa])
+    carta   Grafica los datos de un archivo de resultados en la carta psicrométrica
+    bench   Mide el costo de arranque (importaciones) de cada subcomando
+
+Las dependencias pesadas (pandas, matplotlib) solo se importan dentro del subcomando que las
+necesita, de modo que una consulta de un solo estado arranca en decenas de milisegundos.
+
+Example
+    $ python -m variables_psicrometricas estado --tbs 20 --rh 50 --altitud 2250
+    $ python -m variables_psicrometricas lote zacatecas.csv -o zacatecas_VP.csv
+    $ python -m variables_psicrometricas bench
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+#Módulos que importa cada subcomando, bench los usa para medir el costo de arranque
+IMPORTACIONES = {
+    "estado": ("variables_psicrometricas",),
+    "lote": ("variables_psicrometricas", "numpy", "pandas", "carga_datos", "validacion"),
+    "carta": ("variables_psicrometricas", "numpy", "matplotlib.pyplot", "carta", "zonas"),
+}
+
+#Columnas del archivo de resultados
+COLUMNAS = ['TBS', 'HR', 'PVS', 'PV', 'WS', 'W', 'MU', 'VEH', 'TPR', 'H', 'TBH']
+
+#Otros nombres aceptados (sin distinguir mayúsculas) para las columnas de entrada de lote, además de
+#los de las exportaciones de las EMA (carga_datos.COLUMNAS_EMA); 'temperarura' es el encabezado de abril.csv
+NOMBRES_ENTRADA = {
+    'TBS': ('TBS', 'temperatura', 'temperarura'),
+    'RH': ('RH', 'HR', 'humedad'),
+    'P': ('P', 'presion', 'presión'),
+}
+
+#Intervalos abiertos de TBS (°C) y RH (%) de un solo estado: los de la correlación de TPR de ASHRAE;
+#RH = 0 no tiene presión de vapor ni punto de rocío
+RANGO_TBS = (-60, 70)
+RANGO_RH = (0, 100)
+
+#Filas de los huecos de presión que se interpolan con --rellenar en archivos sin columna de fechas
+HUECO_FILAS = 3
+
+def _importar(subcomando: str) -> list:
+    """
+    Importa y retorna los módulos que necesita un subcomando, en el orden de IMPORTACIONES.
+    """
+    return [importlib.import_module(nombre) for nombre in IMPORTACIONES[subcomando]]
+
+def _buscar(datos: dict, variable: str, carga_datos):
+    """
+    Retorna la columna de una variable de entrada ('TBS', 'RH' o 'P') por su nombre, o None.
+    """
+    nombres = {n.lower() for n in (carga_datos.COLUMNAS_EMA[variable],) + NOMBRES_ENTRADA[variable]}
+    for columna, valores in datos.items():
+        if columna.strip().lower() in nombres:
+            return valores
+    return None
+
+def _presion(args, vp) -> float:
+    """
+    Retorna la presión atmosférica en kPa a partir de --patm o de --altitud.
+    """
+    if args.patm is not None:
+        return args.patm
+    P_atm, _ = vp.pres_atm_temp(args.altitud)
+    return P_atm
+
+def estado(args) -> int:
+    vp, = _importar("estado")
+    P_atm = _presion(args, vp)
+    tbs = args.tbs
+    RH = args.rh/100
+    if not RANGO_TBS[0] < tbs < RANGO_TBS[1]:
+        print(f"Error: la TBS debe estar entre {RANGO_TBS[0]} y {RANGO_TBS[1]} °C (sin incluirlos)", file=sys.stderr)
+        return 1
+    if not RANGO_RH[0] < args.rh <= RANGO_RH[1]:
+        print(f"Error: la RH debe ser mayor que {RANGO_RH[0]} y a lo más {RANGO_RH[1]} %", file=sys.stderr)
+        return 1
+
+    try:
+        Pv = vp.presion_vapor(RH, tbs)
+        Ws = vp.razon_hum_saturacion(P_atm, tbs)
+        W = vp.razon_humedad(tbs, RH, P_atm)
+        resultados = [
+            ("Presión atmosférica (kPa)", P_atm),
+            ("Presión de vapor a saturación (kPa)", vp.pres_vapor_sat(tbs)),
+            ("Presión de vapor (kPa)", Pv),
+            ("Razón de humedad a saturación (kg_agua/kg_aire)", Ws),
+            ("Razón de humedad (kg_agua/kg_aire)", W),
+            ("Grado de saturación", vp.grado_saturacion(W, Ws)),
+            ("Volumen especifico del aire humedo (m³/kg_aire)", vp.vol_esp_aire_humedo(tbs, W, P_atm)),
+            ("Temperatura de punto de rocio (°C)", vp.temp_punto_rocio(tbs, Pv)),
+            ("Entalpía (kJ/kg)", vp.entalpia(tbs, RH, P_atm)),
+            ("Temperatura de bulbo humedo (°C)", vp.temp_bulbo_humedo(tbs, RH, P_atm)),
+        ]
+    except (ValueError, TypeError) as e:
+        print(f"Error: {e or 'estado fuera del rango de las correlaciones'}", file=sys.stderr)
+        return 1
+
+    for texto, valor in resultados:
+        print(f"{texto}: {valor}")
+    return 0
+
+def lote(args) -> int:
+    #La conversión del archivo va a un directorio temporal, no a la caché del directorio de trabajo;
+    #las columnas son memmaps de ese directorio, así que vive hasta terminar de escribir la salida
+    import tempfile
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as cache:
+        return _lote(args, cache)
+
+def _lote(args, cache: str) -> int:
+    vp, np, pd, carga_datos, validacion = _importar("lote")
+    datos = carga_datos.cargar(args.archivo, directorio=cache)
+
+    TBS = _buscar(datos, 'TBS', carga_datos)
+    RH = _buscar(datos, 'RH', carga_datos)
+    if TBS is None or RH is None:
+        print(f"Error: el archivo no tiene columnas de TBS y RH; columnas: {', '.join(datos)}", file=sys.stderr)
+        return 1
+    #Si el archivo tiene la columna de presión (hPa) se usa, si no se usa la altitud
+    P = _buscar(datos, 'P', carga_datos)
+    medida = P is not None and args.patm is None
+    if not medida:
+        P = np.full_like(TBS, _presion(args, vp)*10, dtype=float)
+    #Se valida antes de llenar para que la presión fuera de rango no entre en la interpolación
+    limpios, mascaras = validacion.validar({'TBS': TBS, 'RH': RH, 'P': P})
+    if args.rellenar and medida:
+        #Huecos de la presión: interpolación entre lecturas y, en los largos o al inicio o final, el
+        #modelo a la altitud del encabezado de la EMA (o --altitud)
+        import atmosfera
+        Z = atmosfera.altitud(args.archivo, defecto=args.altitud)
+        fecha = datos.get(carga_datos.COLUMNAS_EMA['FECHA'])
+        if fecha is None:
+            limpios['P'] = atmosfera.rellenar_presion(limpios['P']/10, Z, hueco_max=HUECO_FILAS)[0]*10
+        else:
+            #Las exportaciones de las EMA van de la lectura más reciente a la más antigua
+            orden = np.argsort(fecha, kind='stable')
+            limpios['P'][orden] = atmosfera.rellenar_presion(limpios['P'][orden]/10, Z, fecha[orden])[0]*10
+    TBS_v, RH_v, P_v = limpios['TBS'], limpios['RH']/100, limpios['P']/10
+
+    if args.unicos or args.resolucion:
+        #Solo se calculan los estados únicos (TBS °C, RH %, P hPa), opcionalmente redondeados
+        import unicos
+        r = args.resolucion
+        resultados, razon = unicos.propiedades(TBS_v, RH_v, P_v, resolucion=r and (r[0], r[1]/100, r[2]/10),
+                                               precision=args.precision)
+        print(f"Estados únicos: {razon:.1f} filas por estado", file=sys.stderr)
+    elif args.procesos:
+        #Cálculo en varios procesos con memoria compartida
+        import paralelo
+        resultados = paralelo.propiedades(TBS_v, RH_v, P_v, procesos=args.procesos, precision=args.precision)
+    elif args.cache:
+        #Resultados guardados en disco por contenido de las entradas
+        import cache_resultados
+        resultados = cache_resultados.propiedades(TBS_v, RH_v, P_v, precision=args.precision)
+    else:
+        import variables_psicrometricas_np as vpn
+        resultados = vpn.propiedades(TBS_v, RH_v, P_v, precision=args.precision)
+    for nombre, conteo in validacion.resumen(mascaras).items():
+        print(f"{nombre}: " + ", ".join(f"{tipo}={n}" for tipo, n in conteo.items()), file=sys.stderr)
+
+    salida = pd.DataFrame({'TBS': TBS, 'HR': RH, **resultados}, columns=COLUMNAS)
+    if args.salida:
+        salida.to_csv(args.salida, index=False)
+    else:
+        salida.to_csv(sys.stdout, index=False)
+    return 0
+
+def carta(args) -> int:
+    vp, np, plt, carta, zonas = _importar("carta")
+    P_atm = _presion(args, vp)
+    datos = np.genfromtxt(args.archivo, delimiter=",", names=True)
+
+    _, ax = plt.subplots()
+    ax.set(ylim=(0, 0.025), xlim=(0, 40))
+    extras = []
+    if args.zonas:
+        extras = zonas.dibujar(ax, P_atm)
+        for nombre, horas in zonas.horas_por_zona(datos["TBS"], datos["W"], P_atm, intervalo=args.intervalo).items():
+            print(f"{nombre}: {horas:.1f} h")
+    carta.dibujar(ax, carta.geometria(P_atm), datos["TBS"], datos["W"], extras=extras)
+    plt.tight_layout()
+
+    if args.salida:
+        plt.savefig(args.salida)
+    else:
+        plt.show()
+    return 0
+
+def bench(args) -> int:
+    """
+    Mide en un interprete nuevo el tiempo de importar lo que necesita cada subcomando.
+    """
+    import subprocess
+
+    directorio = os.path.dirname(os.path.abspath(__file__))
+    print(f"{'subcomando':<12}{'mínimo (ms)':>14}{'mediana (ms)':>14}")
+
+    for subcomando in IMPORTACIONES:
+        codigo = ("import time; t = time.perf_counter(); import linea_comandos; "
+                  f"linea_comandos._importar({subcomando!r}); print(time.perf_counter() - t)")
+        tiempos = []
+        for _ in range(args.repeticiones):
+            salida = subprocess.run([sys.executable, "-c", codigo], cwd=directorio,
+                                    capture_output=True, text=True, check=True)
+            tiempos.append(float(salida.stdout)*1000)
+        tiempos.sort()
+        print(f"{subcomando:<12}{tiempos[0]:>14.1f}{tiempos[len(tiempos)//2]:>14.1f}")
+    return 0
+
+def crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m variables_psicrometricas",
+                                     description="Variables psicrométricas (ASHRAE Fundamentals 2001)")
+    subparsers = parser.add_subparsers(dest="subcomando", required=True)
+
+    presion = argparse.ArgumentParser(add_help=False)
+    grupo = presion.add_mutually_exclusive_group()
+    grupo.add_argument("--patm", type=float, help="Presión atmosférica en kPa")
+    grupo.add_argument("--altitud", type=float, default=0, help="Altitud en metros (default: 0)")
+
+    p = subparsers.add_parser("estado", parents=[presion], help="Calcula un solo estado")
+    p.add_argument("--tbs", type=float, required=True, help="Temperatura de bulbo seco en °C")
+    p.add_argument("--rh", type=float, required=True, help="Humedad relativa en porcentaje")
+    p.set_defaults(funcion=estado)
+
+    p = subparsers.add_parser("lote", parents=[presion], help="Calcula un archivo CSV")
+    p.add_argument("archivo", help="CSV o Excel con columnas TBS (°C), RH (%%) y opcionalmente P (hPa), "
+                                   "por nombre (ver NOMBRES_ENTRADA) o con los nombres de las EMA")
+    p.add_argument("-o", "--salida", help="Archivo CSV de salida (default: stdout)")
+    #Formas de calcular el lote, solo se puede elegir una (--resolucion implica --unicos)
+    metodo = p.add_mutually_exclusive_group()
+    metodo.add_argument("--unicos", action="store_true", help="Calcula solo una vez cada estado (TBS, RH, P) distinto")
+    metodo.add_argument("--procesos", type=int, help="Calcula en este número de procesos con memoria compartida")
+    metodo.add_argument("--cache", action="store_true", help="Reutiliza los resultados si las entradas no cambiaron")
+    p.add_argument("--resolucion", type=float, nargs=3, metavar=("TBS", "RH", "P"),
+                   help="Redondea los estados a esta resolución (°C, %%, hPa) antes de buscar los únicos")
+    p.add_argument("--rellenar", action="store_true",
+                   help="Llena los huecos de la presión (altitud del encabezado de la EMA o --altitud)")
+    p.add_argument("--precision", choices=("rapida", "estandar", "referencia"), default="estandar",
+                   help="Nivel de precisión de TPR y TBH (default: estandar)")
+    p.set_defaults(funcion=lote)
+
+    p = subparsers.add_parser("carta", parents=[presion], help="Grafica un archivo de resultados")
+    p.add_argument("archivo", help="CSV de resultados con columnas TBS y W")
+    p.add_argument("-o", "--salida", help="Imagen de salida (default: mostrar en pantalla)")
+    p.add_argument("--zonas", action="store_true", help="Dibuja las zonas y muestra las horas en cada una")
+    p.add_argument("--intervalo", type=float, default=1.0, help="Horas que representa cada dato (default: 1)")
+    p.set_defaults(funcion=carta)
+
+    p = subparsers.add_parser("bench", help="Mide el costo de arranque de cada subcomando")
+    p.add_argument("-n", "--repeticiones", type=int, default=5)
+    p.set_defaults(funcion=bench)
+
+    return parser
+
+def main(argv=None) -> int:
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+    if args.subcomando == "lote" and args.resolucion and (args.procesos or args.cache):
+        parser.error("--resolucion solo se puede usar con --unicos, no con --procesos ni --cache")
+    return args.funcion(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+""" paralelo.py
+
+Cálculo por lotes en varios procesos con memoria compartida. Las columnas de entrada (tbs, RH,
+P_atm) y de salida se colocan en bloques de multiprocessing.shared_memory; cada proceso los abre
+una sola vez al iniciar como arreglos de NumPy y escribe sus resultados directamente en la salida
+(parámetro out de variables_psicrometricas_np.propiedades). Entre procesos solo viajan los índices
+(inicio, fin) de cada tarea, nunca los datos.
+
+Example
+    >>> import paralelo
+    >>> resultados = paralelo.propiedades(TBS, RH/100, P/10, procesos=4)
+    >>> resultados['TBH']
+    array([ 6.82194072,  6.74629129, ...])
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import variables_psicrometricas_np as vpn
+
+#Número de filas por tarea
+BLOQUE = 2**16
+
+#Arreglos compartidos de cada proceso, se asignan con _inicializar()
+_ENTRADAS = None
+_SALIDAS = None
+_PRECISION = 'estandar'
+_MEMORIA = []
+
+def _abrir(nombre: str, forma: tuple) -> np.ndarray:
+    memoria = shared_memory.SharedMemory(name=nombre)
+    _MEMORIA.append(memoria)    #Se conserva la referencia mientras viva el proceso
+    return np.ndarray(forma, dtype=float, buffer=memoria.buf)
+
+def _inicializar(entradas: tuple, salidas: tuple, columnas: tuple, precision: str) -> None:
+    global _ENTRADAS, _SALIDAS, _PRECISION
+    _PRECISION = precision
+    _ENTRADAS = _abrir(*entradas)
+    _SALIDAS = dict(zip(columnas, _abrir(*salidas)))
+
+def _calcular(inicio: int, fin: int) -> int:
+    tbs, RH, P_atm = _ENTRADAS[:, inicio:fin]
+    vpn.propiedades(tbs, RH, P_atm, columnas=tuple(_SALIDAS), precision=_PRECISION,
+                    out={columna: salida[inicio:fin] for columna, salida in _SALIDAS.items()})
+    return fin - inicio
+
+def _compartido(forma: tuple) -> tuple:
+    memoria = shared_memory.SharedMemory(create=True, size=max(int(np.prod(forma))*8, 1))
+    return memoria, np.ndarray(forma, dtype=float, buffer=memoria.buf)
+
+def propiedades(tbs, RH, P_atm, columnas: tuple = vpn.COLUMNAS, procesos: int = None, bloque: int = BLOQUE,
+                precision: str = 'estandar') -> dict:
+    """
+    Retorna las variables psicrométricas calculadas en varios procesos.
+
+    Args:
+        tbs: Temperatura de bulbo seco en °C
+        RH: Humedad relativa en fracción
+        P_atm: Presión atmosférica en kPa
+        columnas: Variables a calcular (subconjunto de variables_psicrometricas_np.COLUMNAS)
+        procesos: Número de procesos (por defecto, el número de núcleos)
+        bloque: Número de filas por tarea
+        precision: Nivel de precisión (llave de variables_psicrometricas_np.PRECISIONES)
+
+    Returns:
+        Diccionario de arreglos con la forma de las entradas
+    """
+    tbs, RH, P_atm = np.broadcast_arrays(np.asarray(tbs, dtype=float), np.asarray(RH, dtype=float),
+                                         np.asarray(P_atm, dtype=float))
+    forma = tbs.shape
+    n = tbs.size
+
+    memoria_entradas, entradas = _compartido((3, n))
+    memoria_salidas, salidas = _compartido((len(columnas), n))
+    try:
+        for i, x in enumerate((tbs, RH, P_atm)):
+            entradas[i] = x.ravel()
+
+        tareas = [(i, min(i + bloque, n)) for i in range(0, n, bloque)]
+        iniciales = ((memoria_entradas.name, entradas.shape), (memoria_salidas.name, salidas.shape), tuple(columnas), precision)
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar, initargs=iniciales) as grupo:
+            for _ in grupo.map(_calcular, *zip(*tareas)):
+                pass
+
+        #Se copia la salida antes de liberar la memoria compartida
+        return {columna: salidas[i].reshape(forma).copy() for i, columna in enumerate(columnas)}
+    finally:
+        del entradas, salidas
+        for memoria in (memoria_entradas, memoria_salidas):
+            memoria.close()
+            memoria.unlink()
@@ -0,0 +1,188 @@
+""" regresion.py
+
+Prueba de regresión de exactitud y rendimiento contra los resultados de referencia del
+repositorio. Se vuelven a calcular zacatecas.csv y abril.csv con variables_psicrometricas_np y
+cada columna se compara con zacatecas_VP.csv y VP.csv; después se mide el número de estados por
+segundo de propiedades() y se falla si es menor que el mínimo configurado. Con --precisiones se
+mide además el error y el rendimiento de cada nivel de variables_psicrometricas_np.PRECISIONES.
+
+Los archivos de referencia se generaron con los scripts zacatecas_vp.py y vp.py, que tienen
+particularidades que se reproducen aquí en lugar de corregir los archivos:
+    -VEH y TPR se calcularon con la temperatura (y presión) de la última fila, porque el ciclo
+     interno de los scripts usa la variable t del ciclo externo.
+    -En zacatecas_VP.csv la TBH es la fórmula empírica (temp_bulbo_humedo1) y HR está en fracción.
+    -En zacatecas_VP.csv las filas con TBS <= 0 °C tienen la presión de vapor a saturación en Pa
+     (error de unidades de la versión escalar, ya corregido); esas filas no se comparan.
+    -En VP.csv la TPR es la solución exacta (iterativa) de pres_vapor_sat(tpr) = pv, mientras que
+     la librería usa la correlación de ASHRAE, que difiere hasta 0.17 °C en ese rango.
+
+Example
+    $ python regresion.py
+    $ python regresion.py --minimo 500000 --registro rendimiento.csv
+    $ python regresion.py --precisiones
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import time
+
+import numpy as np
+
+import variables_psicrometricas as vp
+import variables_psicrometricas_np as vpn
+
+#Tolerancia (relativa, absoluta) por columna; las columnas de fórmula cerrada solo difieren por redondeo
+TOLERANCIA_FORMULA = (1e-9, 1e-12)
+TOLERANCIAS = {
+    'zacatecas': {},
+    'abril': {
+        'TBH': (0, vp.TOLERANCIA),      #Bisección: ambos resultados están dentro del intervalo final
+        'TPR': (0, 0.2),                #Correlación de ASHRAE contra la solución exacta
+    },
+}
+
+#Mínimo de estados por segundo de propiedades() con todas las columnas (incluye TBH)
+MINIMO = 200_000
+
+#Casos de prueba: entrada, referencia y cómo se obtuvo la presión y la TBH
+CASOS = {
+    'zacatecas': {'entrada': "zacatecas.csv", 'referencia': "zacatecas_VP.csv", 'Z': None, 'TBH': 'empirica'},
+    'abril': {'entrada': "abril.csv", 'referencia': "VP.csv", 'Z': 2250, 'TBH': 'biseccion'},
+}
+
+def _ruta(archivo: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), archivo)
+
+def entradas(caso: dict) -> tuple:
+    """
+    Retorna TBS (°C), RH (fracción) y P_atm (kPa) del archivo de entrada de un caso.
+    """
+    datos = np.genfromtxt(_ruta(caso['entrada']), delimiter=",", skip_header=1, encoding="latin-1")
+    TBS, RH = datos[:, 0], datos[:, 1]/100
+    if caso['Z'] is None:
+        P_atm = datos[:, 2]/10
+    else:
+        P_atm = np.full_like(TBS, vp.pres_atm_temp(caso['Z'])[0])
+    return TBS, RH, P_atm
+
+def replicar(caso: dict) -> dict:
+    """
+    Retorna las columnas del archivo de referencia calculadas con la librería, reproduciendo las
+    particularidades de los scripts que lo generaron.
+    """
+    TBS, RH, P_atm = entradas(caso)
+    columnas = tuple(c for c in vpn.COLUMNAS if c != 'TBH' or caso['TBH'] == 'biseccion')
+    r = vpn.propiedades(TBS, RH, P_atm, columnas)
+
+    r['VEH'] = vpn.vol_esp_aire_humedo(TBS[-1], r['W'], P_atm[-1])
+    r['TPR'] = vpn.temp_punto_rocio(TBS[-1], r['PV'])
+    if caso['TBH'] == 'empirica':
+        r['TBH'] = vpn.temp_bulbo_humedo1(TBS, RH)
+    r['TBS'] = TBS
+    r['HR'] = RH if caso['TBH'] == 'empirica' else RH*100
+    return r
+
+def comparar(nombre: str) -> list:
+    """
+    Compara un caso con su archivo de referencia.
+
+    Returns:
+        Lista de tuplas (columna, error absoluto máximo, filas fuera de tolerancia, filas comparadas)
+    """
+    caso = CASOS[nombre]
+    referencia = np.genfromtxt(_ruta(caso['referencia']), delimiter=",", names=True)
+    r = replicar(caso)
+
+    #Filas afectadas por el error de unidades de la versión escalar (ver la descripción del módulo)
+    filas = np.ones(len(r['TBS']), dtype=bool) if caso['Z'] is not None else r['TBS'] > 0
+
+    resultado = []
+    for columna in referencia.dtype.names:
+        rtol, atol = TOLERANCIAS[nombre].get(columna, TOLERANCIA_FORMULA)
+        esperado = referencia[columna][filas]
+        obtenido = r[columna][filas]
+        error = np.abs(obtenido - esperado)
+        fuera = ~(np.isclose(obtenido, esperado, rtol=rtol, atol=atol, equal_nan=True))
+        resultado.append((columna, float(np.nanmax(error, initial=0)), int(fuera.sum()), int(filas.sum())))
+    return resultado
+
+def rendimiento(repeticiones: int = 5, copias: int = 10) -> float:
+    """
+    Retorna el mejor número de estados por segundo de propiedades() (todas las columnas) sobre
+    zacatecas.csv repetido el número de copias dado.
+    """
+    TBS, RH, P_atm = (np.tile(x, copias) for x in entradas(CASOS['zacatecas']))
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        vpn.propiedades(TBS, RH, P_atm)
+        tiempos.append(time.perf_counter() - inicio)
+    return len(TBS) / min(tiempos)
+
+def precisiones(n: int = 200_000, repeticiones: int = 3, semilla: int = 0) -> dict:
+    """
+    Retorna el error contra el nivel 'referencia' y el rendimiento de cada nivel de precisión,
+    con estados aleatorios de -10 a 45 °C, 2 a 100 % y 70 a 101.325 kPa.
+
+    Returns:
+        Diccionario {nivel: {'TBH': (máximo, percentil 99), 'TPR': (máximo, percentil 99), 'estados_s'}}
+    """
+    rng = np.random.default_rng(semilla)
+    TBS = rng.uniform(-10, 45, n)
+    RH = rng.uniform(0.02, 1, n)
+    P_atm = rng.uniform(70, 101.325, n)
+    referencia = vpn.propiedades(TBS, RH, P_atm, precision='referencia')
+
+    resultado = {}
+    for nivel in vpn.PRECISIONES:
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            r = vpn.propiedades(TBS, RH, P_atm, precision=nivel)
+            tiempos.append(time.perf_counter() - inicio)
+        resultado[nivel] = {columna: (float(np.nanmax(np.abs(r[columna] - referencia[columna]))),
+                                      float(np.nanpercentile(np.abs(r[columna] - referencia[columna]), 99)))
+                            for columna in ('TBH', 'TPR')}
+        resultado[nivel]['estados_s'] = n / min(tiempos)
+    return resultado
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Regresión de exactitud y rendimiento contra los archivos de referencia")
+    parser.add_argument("--minimo", type=float, default=MINIMO, help=f"Mínimo de estados por segundo (default: {MINIMO})")
+    parser.add_argument("--registro", help="Archivo CSV donde se agrega el rendimiento medido")
+    parser.add_argument("--precisiones", action="store_true", help="Mide el error y el rendimiento de cada nivel de precisión")
+    args = parser.parse_args(argv)
+
+    if args.precisiones:
+        print(f"{'nivel':<12}{'TBH máx':>10}{'TBH p99':>10}{'TPR máx':>10}{'TPR p99':>10}{'estados/s':>14}")
+        for nivel, r in precisiones().items():
+            print(f"{nivel:<12}{r['TBH'][0]:>10.2g}{r['TBH'][1]:>10.2g}{r['TPR'][0]:>10.2g}{r['TPR'][1]:>10.2g}"
+                  f"{r['estados_s']:>14,.0f}")
+        return 0
+
+    fallas = 0
+    for nombre in CASOS:
+        print(f"{nombre} ({CASOS[nombre]['referencia']})")
+        for columna, error, fuera, filas in comparar(nombre):
+            estado = "ok" if fuera == 0 else "FALLA"
+            fallas += fuera > 0
+            print(f"    {columna:<5}{error:>14.3e}{fuera:>8}/{filas:<8}{estado}")
+
+    estados = rendimiento()
+    estado = "ok" if estados >= args.minimo else "FALLA"
+    fallas += estados < args.minimo
+    print(f"rendimiento: {estados:,.0f} estados/s (mínimo {args.minimo:,.0f}) {estado}")
+
+    if args.registro:
+        nuevo = not os.path.exists(args.registro)
+        with open(args.registro, "a", encoding="utf-8") as file:
+            if nuevo:
+                file.write("fecha,estados_s,fallas\n")
+            file.write(f"{datetime.datetime.now().isoformat(timespec='seconds')},{estados:.0f},{fallas}\n")
+
+    return 1 if fallas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
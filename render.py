@@ -0,0 +1,95 @@
+""" render.py
+
+Renderizado sin pantalla (backend Agg) de cartas psicrométricas para muchas estaciones y periodos
+en un grupo de procesos.
+
+Cada trabajo es una tupla (ruta del archivo de la EMA, periodo, altitud en metros); el periodo es
+un año ('2023'), un mes ('2023-01') o None para todo el archivo. La geometría de la carta se
+calcula una vez por altitud en el proceso principal y se envía a cada proceso al iniciarlo, y los
+archivos se convierten a la caché de carga_datos antes de repartir los trabajos, así que cada
+trabajo solo lee sus columnas, calcula W y dibuja.
+
+Example
+    >>> import render
+    >>> trabajos = [("Estacion_ZACATECAS_EMA.csv", f"2022-{m:02d}", 2270) for m in range(1, 13)]
+    >>> render.renderizar(trabajos, directorio="cartas", formato="png")
+    ['cartas/Estacion_ZACATECAS_EMA_2022-01.png', ...]
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import carga_datos
+import carta
+import variables_psicrometricas as vp
+import variables_psicrometricas_np as vpn
+
+#Geometrías por altitud, se asignan en cada proceso con _inicializar()
+_GEOMETRIAS = {}
+
+def _inicializar(geometrias: dict) -> None:
+    global _GEOMETRIAS
+    _GEOMETRIAS = geometrias
+
+def datos_periodo(ruta: str, periodo: str = None) -> tuple:
+    """
+    Retorna TBS y W de los datos de una EMA dentro del periodo dado.
+
+    Args:
+        ruta: Archivo de la EMA
+        periodo: Año ('2023'), mes ('2023-01') o None para todo el archivo
+
+    Returns:
+        Arreglos TBS (°C) y W (kg_agua/kg_aire)
+    """
+    nombres = carga_datos.COLUMNAS_EMA
+    datos = carga_datos.cargar(ruta)
+    TBS = datos[nombres['TBS']]
+    RH = datos[nombres['RH']]
+    P = datos[nombres['P']]
+
+    if periodo is not None:
+        inicio = np.datetime64(periodo)
+        fecha = datos[nombres['FECHA']]
+        seleccion = (fecha >= inicio) & (fecha < inicio + 1)
+        TBS, RH, P = TBS[seleccion], RH[seleccion], P[seleccion]
+
+    W = vpn.razon_humedad(TBS, RH/100, P/10)
+    return np.asarray(TBS), W
+
+def _renderizar(trabajo: tuple, directorio: str, formato: str) -> str:
+    ruta, periodo, Z = trabajo
+    TBS, W = datos_periodo(ruta, periodo)
+
+    estacion = os.path.splitext(os.path.basename(ruta))[0]
+    titulo = f"Carta Psicrométrica - {estacion}" + (f" ({periodo})" if periodo else "")
+    fig = carta.figura(_GEOMETRIAS[Z], TBS, W, titulo=titulo)
+
+    salida = os.path.join(directorio, f"{estacion}_{periodo or 'completo'}.{formato}")
+    fig.savefig(salida, format=formato)
+    return salida
+
+def renderizar(trabajos: list, directorio: str = "cartas", formato: str = "png", procesos: int = None) -> list:
+    """
+    Renderiza una carta por trabajo en un grupo de procesos.
+
+    Args:
+        trabajos: Lista de tuplas (ruta, periodo, altitud)
+        directorio: Directorio de salida
+        formato: 'png' o 'svg'
+        procesos: Número de procesos (por defecto, el número de núcleos)
+
+    Returns:
+        Lista de archivos generados, en el orden de los trabajos
+    """
+    os.makedirs(directorio, exist_ok=True)
+
+    #Geometría una vez por altitud y conversión de cada archivo a la caché
+    geometrias = {Z: carta.geometria(vp.pres_atm_temp(Z)[0]) for _, _, Z in trabajos}
+    for ruta in {ruta for ruta, _, _ in trabajos}:
+        carga_datos.cargar(ruta)
+
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar, initargs=(geometrias,)) as grupo:
+        return list(grupo.map(_renderizar, trabajos, [directorio]*len(trabajos), [formato]*len(trabajos)))
@@ -0,0 +1,57 @@
+""" test_accesor.py
+
+Pruebas del accesor df.psicro de accesor.py: columnas de las EMA, unidades, presión constante,
+nivel de precisión y lectura por trozos.
+
+Example
+    $ python -m pytest test_accesor.py
+"""
+
+import numpy as np
+import pandas as pd
+
+import accesor
+import carga_datos
+import variables_psicrometricas_np as vpn
+
+def _zacatecas(**kwargs) -> pd.DataFrame:
+    return pd.read_csv("zacatecas.csv", encoding="latin-1", names=["TBS", "RH", "P"], header=0, **kwargs)
+
+def test_calcular_igual_al_nucleo():
+    df = _zacatecas()
+    original = df.copy()
+    r = df.psicro.propiedades(tbs="TBS", RH="RH", P="P")
+    pd.testing.assert_frame_equal(df, original)
+    esperado = vpn.propiedades(df["TBS"].to_numpy(), df["RH"].to_numpy()/100, df["P"].to_numpy()/10)
+    for columna in vpn.COLUMNAS:
+        np.testing.assert_allclose(r[columna], esperado[columna], rtol=1e-13, atol=1e-12, err_msg=columna)
+
+    salida = df.psicro.calcular(prefijo="vp_", tbs="TBS", RH="RH", P="P", columnas=('W', 'TBH'))
+    assert salida is df and list(df.columns) == ["TBS", "RH", "P", "vp_W", "vp_TBH"]
+    np.testing.assert_array_equal(df["vp_TBH"], r['TBH'])
+
+def test_nombres_de_la_ema_y_unidades():
+    nombres = carga_datos.COLUMNAS_EMA
+    df = pd.DataFrame({nombres['TBS']: [20.0, 25.0], nombres['RH']: [50.0, 60.0], nombres['P']: [779.5, 780.0]})
+    r = df.psicro.propiedades(columnas=('W',))
+    fraccion = pd.DataFrame({'t': [20.0, 25.0], 'h': [0.5, 0.6], 'p': [77950.0, 78000.0]})
+    np.testing.assert_allclose(fraccion.psicro.propiedades(tbs='t', RH='h', P='p', unidades_RH='fraccion',
+                                                           unidades_P='Pa', columnas=('W',))['W'], r['W'], rtol=1e-14)
+    constante = fraccion.psicro.propiedades(tbs='t', RH='h', unidades_RH='fraccion', P_atm=77.95, columnas=('W',))
+    assert constante['W'][0] == r['W'][0]
+
+def test_por_trozos_igual_a_completo():
+    completo = _zacatecas().psicro.calcular(tbs="TBS", RH="RH", P="P")
+    trozos = pd.concat(accesor.por_trozos(_zacatecas(chunksize=1000), tbs="TBS", RH="RH", P="P"))
+    pd.testing.assert_frame_equal(trozos, completo)
+
+def test_precision():
+    df = _zacatecas(nrows=200)
+    r = df.psicro.propiedades(tbs="TBS", RH="RH", P="P", columnas=('TPR', 'TBH'), precision='referencia')
+    esperado = vpn.propiedades(df["TBS"].to_numpy(), df["RH"].to_numpy()/100, df["P"].to_numpy()/10,
+                               ('TPR', 'TBH'), precision='referencia')
+    for columna in ('TPR', 'TBH'):
+        np.testing.assert_allclose(r[columna], esperado[columna], rtol=1e-13, atol=1e-12, err_msg=columna)
+    salida = df.psicro.calcular(tbs="TBS", RH="RH", P="P", columnas=('TPR',), precision='referencia')
+    np.testing.assert_array_equal(salida['TPR'], r['TPR'])
+    assert not np.allclose(df.psicro.propiedades(tbs="TBS", RH="RH", P="P", columnas=('TPR',))['TPR'], r['TPR'])
@@ -0,0 +1,47 @@
+""" test_alertas.py
+
+Pruebas del motor de alertas incremental de alertas.py: duración mínima, histéresis, lecturas
+fuera de orden y estaciones repetidas en una lectura.
+
+Example
+    $ python -m pytest test_alertas.py
+"""
+
+import numpy as np
+import pytest
+
+import alertas
+
+INICIO = np.datetime64("2023-01-10T05:00")
+MINUTO = np.timedelta64(1, 'm')
+
+def _lectura(motor, estaciones, minuto, TBS, T_superficie):
+    n = len(estaciones)
+    return motor.actualizar(estaciones, INICIO + minuto*MINUTO, TBS=[TBS]*n, RH=[90]*n, P=[779.5]*n,
+                            T_superficie=[T_superficie]*n)
+
+def test_estacion_repetida_en_una_lectura():
+    motor = alertas.Alertas(["ZACATECAS", "FRESNILLO"])
+    with pytest.raises(ValueError, match="ZACATECAS"):
+        _lectura(motor, ["ZACATECAS", "FRESNILLO", "ZACATECAS"], 0, 5.0, 3.0)
+    #El estado no cambia si se rechaza la lectura
+    assert np.isnat(motor.ultima).all() and np.isnat(motor.inicio).all()
+
+def test_condensacion_con_duracion_e_histeresis():
+    motor = alertas.Alertas(["ZACATECAS"], reglas=alertas.REGLAS[:1])
+    #TPR de 5 °C y 90 % es ~3.4 °C; la superficie a 3.5 °C tiene margen < 1 °C
+    eventos = []
+    for minuto in range(0, 50, 10):
+        eventos += _lectura(motor, ["ZACATECAS"], minuto, 5.0, 3.5)
+    assert [(e['tipo'], e['fecha']) for e in eventos] == [('inicio', INICIO + 30*MINUTO)]
+    #Dentro de la histéresis la alerta sigue activa; fuera de ella termina
+    assert _lectura(motor, ["ZACATECAS"], 50, 5.0, 4.7) == []
+    eventos = _lectura(motor, ["ZACATECAS"], 60, 5.0, 5.5)
+    assert [e['tipo'] for e in eventos] == ['fin'] and motor.activas() == {'Condensación': []}
+
+def test_lecturas_repetidas_o_fuera_de_orden_se_ignoran():
+    motor = alertas.Alertas(["ZACATECAS"], reglas=alertas.REGLAS[1:])
+    assert [e['tipo'] for e in _lectura(motor, ["ZACATECAS"], 10, -1.0, -1.0)] == ['inicio']
+    assert _lectura(motor, ["ZACATECAS"], 0, 10.0, 10.0) == []
+    assert _lectura(motor, ["ZACATECAS"], 10, 10.0, 10.0) == []
+    assert motor.activas() == {'Helada': ['ZACATECAS']}
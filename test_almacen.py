@@ -0,0 +1,73 @@
+""" test_almacen.py
+
+Pruebas del almacén de datos de estación de almacen.py: importación de exportaciones que se
+traslapan, consultas por rango y por meses, y compactación.
+
+Example
+    $ python -m pytest test_almacen.py
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+import almacen
+import carga_datos
+
+FECHA = almacen.FECHA
+EMA = "Estacion_ZACATECAS_EMA.csv"
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    #La caché por defecto de carga_datos no debe quedar en el directorio de trabajo
+    monkeypatch.setattr(carga_datos, "DIRECTORIO_CACHE", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+@pytest.fixture
+def estacion(tmp_path):
+    #Dos exportaciones que se traslapan 2000 lecturas, como las descargas sucesivas de una EMA
+    with open(EMA, encoding="latin-1") as f:
+        lineas = f.read().splitlines()
+    encabezado, filas = lineas[:10], lineas[10:]
+    for nombre, parte in (("reciente.csv", filas[:8000]), ("anterior.csv", filas[6000:])):
+        (tmp_path / nombre).write_text("\n".join(encabezado + parte) + "\n", encoding="latin-1")
+
+    estacion = almacen.Almacen(str(tmp_path / "ZACATECAS_EMA"))
+    assert estacion.importar(str(tmp_path / "reciente.csv")) == 8000
+    assert estacion.importar(str(tmp_path / "anterior.csv")) == len(filas) - 8000
+    assert estacion.importar(str(tmp_path / "reciente.csv")) == 0
+    return estacion
+
+def test_importar_sin_repetidos_y_ordenado(estacion, cache):
+    assert not cache.exists()
+    assert os.path.isdir(os.path.join(estacion.directorio, almacen.CACHE))
+    completo = carga_datos.cargar(EMA)
+    datos = estacion.rango(columnas=['TBS', 'RH'])
+    assert len(estacion) == len(completo[FECHA]) == len(datos[FECHA])
+    assert (np.diff(datos[FECHA]) > np.timedelta64(0, 's')).all()
+    orden = np.argsort(np.asarray(completo[FECHA], dtype=almacen.UNIDAD))
+    np.testing.assert_array_equal(datos['TBS'], np.asarray(completo[carga_datos.COLUMNAS_EMA['TBS']])[orden])
+    assert estacion.metadatos['Altitud'] == 2270
+
+def test_mes_y_meses(estacion):
+    enero = estacion.mes(2023, 1, ['TBS'])
+    assert str(enero[FECHA][0]) == "2023-01-01T00:00:00" and str(enero[FECHA][-1]) == "2023-01-10T16:30:00"
+    invierno = estacion.meses((12, 1, 2), ['TBS'])
+    diciembre = estacion.mes(2022, 12, ['TBS'])
+    np.testing.assert_array_equal(invierno['TBS'], np.concatenate([diciembre['TBS'], enero['TBS']]))
+
+def test_meses_sin_datos_retorna_columnas_vacias(estacion):
+    verano = estacion.meses((6, 7, 8), ['TBS', 'RH'])
+    assert set(verano) == {FECHA, 'TBS', 'RH'}
+    assert all(len(x) == 0 for x in verano.values()) and verano[FECHA].dtype == np.dtype(almacen.UNIDAD)
+    vacio = almacen.Almacen("no_existe").meses((1,), ['TBS'])
+    assert set(vacio) == {FECHA, 'TBS'} and len(vacio['TBS']) == 0
+
+def test_compactar_conserva_datos(estacion):
+    antes = estacion.rango(columnas=['TBS', 'RH', 'P'])
+    estacion.compactar()
+    assert len(estacion.indice["segmentos"]) == 1
+    despues = almacen.Almacen(estacion.directorio).rango(columnas=['TBS', 'RH', 'P'])
+    for columna, x in antes.items():
+        np.testing.assert_array_equal(despues[columna], x)
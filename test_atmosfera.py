@@ -0,0 +1,41 @@
+""" test_atmosfera.py
+
+Pruebas del modelo de atmósfera estándar y del llenado de huecos de presión de atmosfera.py.
+
+Example
+    $ python -m pytest test_atmosfera.py
+"""
+
+import numpy as np
+
+import atmosfera
+import variables_psicrometricas as vp
+
+def test_igual_a_escalar_y_fuera_de_rango():
+    Z = np.array([-1000, 0, 2270, 8000])
+    P, T = atmosfera.pres_atm_temp(Z)
+    np.testing.assert_allclose(P, [vp.pres_atm_temp(z)[0] for z in Z], rtol=1e-14)
+    np.testing.assert_allclose(T, [vp.pres_atm_temp(z)[1] for z in Z], rtol=1e-14)
+    assert np.isnan(atmosfera.pres_atm_temp([-6000, 12000])).all()
+    assert atmosfera.altitud("Estacion_ZACATECAS_EMA.csv") == 2270
+    assert atmosfera.altitud("zacatecas.csv", defecto=0) == 0
+
+def test_rellenar_por_estacion():
+    fecha = np.datetime64("2023-01-01T00:00") + np.arange(40)*np.timedelta64(10, 'm')
+    Z = np.array([2270, 0])
+    P = np.column_stack([np.linspace(77.0, 78.0, 40), np.full(40, 101.0)])
+    P[5:8, 0] = np.nan                  #Hueco de 40 minutos: se interpola
+    P[10:35, 1] = np.nan                #Hueco de 4 h 20 min: se llena con el modelo
+    P[:2, 0] = np.nan                   #Inicio de la serie: modelo
+    llenada, llenado = atmosfera.rellenar_presion(P, Z, fecha)
+
+    np.testing.assert_array_equal(llenado, np.isnan(P))
+    np.testing.assert_allclose(llenada[5:8, 0], np.linspace(77.0, 78.0, 40)[5:8])
+    modelo = atmosfera.presion_altitud(Z)
+    diferencia = np.nanmedian(P - modelo, axis=0)
+    np.testing.assert_allclose(llenada[10:35, 1], modelo[1] + diferencia[1])
+    np.testing.assert_allclose(llenada[:2, 0], modelo[0] + diferencia[0])
+
+    #Sin fechas el límite es un número de filas
+    por_filas, _ = atmosfera.rellenar_presion(P[:, 0], 2270, hueco_max=2)
+    np.testing.assert_allclose(por_filas[5:8], modelo[0] + diferencia[0])
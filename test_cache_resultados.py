@@ -0,0 +1,97 @@
+""" test_cache_resultados.py
+
+Pruebas de la caché de resultados direccionada por contenido de cache_resultados.py: aciertos,
+invalidación por entradas, parámetros y código de la función, archivos dañados y recorte por tamaño.
+
+Example
+    $ python -m pytest test_cache_resultados.py
+"""
+
+import importlib
+import os
+import sys
+
+import numpy as np
+
+import cache_resultados
+import variables_psicrometricas_np as vpn
+
+TBS = np.array([5.0, 20.0, 35.0])
+RH = np.array([0.3, 0.5, 0.9])
+
+def _contador():
+    llamadas = []
+    def funcion(tbs, RH, escala=1):
+        llamadas.append(escala)
+        return {'W': vpn.razon_humedad(tbs, RH, 77.0)*escala}
+    return funcion, llamadas
+
+def test_acierto_e_invalidacion(tmp_path):
+    funcion, llamadas = _contador()
+    primera = cache_resultados.calcular(funcion, (TBS, RH), directorio=str(tmp_path))
+    segunda = cache_resultados.calcular(funcion, (TBS, RH), directorio=str(tmp_path))
+    np.testing.assert_array_equal(primera['W'], segunda['W'])
+    assert llamadas == [1]
+
+    cache_resultados.calcular(funcion, (TBS + 0.1, RH), directorio=str(tmp_path))
+    cache_resultados.calcular(funcion, (TBS, RH), {'escala': 2}, directorio=str(tmp_path))
+    cache_resultados.calcular(funcion, (TBS.reshape(3, 1), RH.reshape(3, 1)), directorio=str(tmp_path))
+    assert llamadas == [1, 1, 2, 1]
+    assert len(os.listdir(tmp_path)) == 4
+
+def test_llave_depende_de_la_precision(tmp_path):
+    a = cache_resultados.propiedades(TBS, RH, 77.0, ('TBH',), directorio=str(tmp_path), precision='rapida')
+    b = cache_resultados.propiedades(TBS, RH, 77.0, ('TBH',), directorio=str(tmp_path), precision='referencia')
+    np.testing.assert_array_equal(b['TBH'], vpn.temp_bulbo_humedo(TBS, RH, 77.0, precision='referencia'))
+    assert not np.array_equal(a['TBH'], b['TBH'])
+
+def test_archivo_danado_se_recalcula(tmp_path):
+    funcion, llamadas = _contador()
+    cache_resultados.calcular(funcion, (TBS, RH), directorio=str(tmp_path))
+    archivo, = tmp_path.iterdir()
+    archivo.write_bytes(b"incompleto")
+    r = cache_resultados.calcular(funcion, (TBS, RH), directorio=str(tmp_path))
+    np.testing.assert_array_equal(r['W'], vpn.razon_humedad(TBS, RH, 77.0))
+    assert llamadas == [1, 1]
+
+def test_recorte_elimina_los_menos_usados(tmp_path):
+    funcion, _ = _contador()
+    cache_resultados.calcular(funcion, (TBS, RH), directorio=str(tmp_path))
+    tamano = next(tmp_path.iterdir()).stat().st_size
+    primero = {p.name for p in tmp_path.iterdir()}
+    for i in range(1, 4):
+        #mtime explícito para que el orden no dependa de la resolución del reloj del sistema de archivos
+        for p in tmp_path.iterdir():
+            os.utime(p, (p.stat().st_atime, p.stat().st_mtime - 10))
+        cache_resultados.calcular(funcion, (TBS + i, RH), directorio=str(tmp_path), limite=2*tamano)
+    restantes = {p.name for p in tmp_path.iterdir()}
+    assert len(restantes) == 2 and not restantes & primero
+
+def test_npz_truncado_se_recalcula(tmp_path):
+    #Un .npz cortado a la mitad lanza zipfile.BadZipFile, que no es OSError ni ValueError
+    funcion, llamadas = _contador()
+    cache_resultados.calcular(funcion, (TBS, RH), directorio=str(tmp_path))
+    archivo, = tmp_path.iterdir()
+    contenido = archivo.read_bytes()
+    archivo.write_bytes(contenido[:len(contenido)//2])
+    r = cache_resultados.calcular(funcion, (TBS, RH), directorio=str(tmp_path))
+    np.testing.assert_array_equal(r['W'], vpn.razon_humedad(TBS, RH, 77.0))
+    assert llamadas == [1, 1]
+    assert archivo.read_bytes() == contenido
+
+def test_llave_depende_del_codigo_de_la_funcion(tmp_path, monkeypatch):
+    modulo = tmp_path / "calculo_cache_prueba.py"
+    monkeypatch.syspath_prepend(str(tmp_path))
+    cache = str(tmp_path / "cache")
+    resultados = []
+    for escala, mtime in ((1, 1_000_000_000), (2, 1_000_000_100)):
+        modulo.write_text(f"def funcion(tbs):\n    return {{'x': tbs*{escala}}}\n")
+        os.utime(modulo, (mtime, mtime))
+        sys.modules.pop("calculo_cache_prueba", None)
+        importlib.invalidate_caches()
+        calculo = importlib.import_module("calculo_cache_prueba")
+        resultados.append(cache_resultados.calcular(calculo.funcion, (TBS,), directorio=cache)['x'])
+    sys.modules.pop("calculo_cache_prueba", None)
+    np.testing.assert_array_equal(resultados[1], 2*TBS)
+    assert len(os.listdir(cache)) == 2
+
@@ -0,0 +1,41 @@
+""" test_campos.py
+
+Pruebas del cálculo por bloques de campos N-dimensionales de campos.py: el resultado no depende
+del tamaño del bloque y los bloques cubren el campo sin traslaparse.
+
+Example
+    $ python -m pytest test_campos.py
+"""
+
+import numpy as np
+import pytest
+
+import campos
+import variables_psicrometricas_np as vpn
+
+@pytest.mark.parametrize("forma, bloque", [((7,), 3), ((5, 6, 7), 10), ((5, 6, 7), 42), ((4, 3, 2, 5), 1), ((), 4)])
+def test_bloques_cubren_el_campo_una_vez(forma, bloque):
+    cuenta = np.zeros(forma, dtype=int)
+    for indice in campos.bloques(forma, bloque):
+        assert cuenta[indice].size <= bloque
+        cuenta[indice] += 1
+    assert (cuenta == 1).all()
+
+def test_igual_a_un_solo_bloque():
+    rng = np.random.default_rng(0)
+    tbs = rng.uniform(-10, 40, (6, 9, 11))
+    RH = rng.uniform(0.05, 1, (6, 9, 11))
+    P = np.linspace(70, 101.325, 11)                     #Una presión por longitud (broadcasting)
+    esperado = vpn.propiedades(tbs, RH, np.broadcast_to(P, tbs.shape))
+    for bloque in (1, 50, 99, 10**6):
+        r = campos.evaluar(tbs, RH, P, bloque=bloque)
+        for columna in vpn.COLUMNAS:
+            np.testing.assert_array_equal(r[columna], esperado[columna], err_msg=f"{columna} {bloque}")
+
+def test_salida_preasignada():
+    tbs = np.full((3, 4), 20.0)
+    out = {'W': np.empty((3, 4))}
+    r = campos.evaluar(tbs, 0.5, 80.0, columnas=('W', 'H'), out=out, bloque=5)
+    assert r['W'] is out['W'] and r['H'].shape == (3, 4)
+    with pytest.raises(ValueError):
+        campos.evaluar(tbs, 0.5, 80.0, columnas=('W',), out={'W': np.empty(4)})
@@ -0,0 +1,69 @@
+""" test_carga_datos.py
+
+Pruebas de carga_datos.py: lectura de los libros de Excel del repositorio (incluido abril.xlsx, que
+está en formato Strict Open XML) y de la caché columnar, incluido su recorte.
+
+Example
+    $ python -m pytest test_carga_datos.py
+"""
+
+import os
+import shutil
+
+import numpy as np
+
+import carga_datos
+
+def test_abril_xlsx_estricto_igual_al_csv(tmp_path):
+    assert carga_datos.es_ooxml_estricto("abril.xlsx")
+    excel = carga_datos.cargar("abril.xlsx", directorio=str(tmp_path))
+    csv = carga_datos.cargar("abril.csv", directorio=str(tmp_path))
+    assert list(excel) == list(csv) == ['temperarura', 'RH']
+    for columna in csv:
+        np.testing.assert_array_equal(excel[columna], csv[columna])
+
+def test_zacatecas_xlsx_transicional(tmp_path):
+    assert not carga_datos.es_ooxml_estricto("zacatecas.xlsx")
+    excel = carga_datos.cargar("zacatecas.xlsx", directorio=str(tmp_path))
+    csv = carga_datos.cargar("zacatecas.csv", directorio=str(tmp_path))
+    assert len(excel) == len(csv)
+    for a, b in zip(excel.values(), csv.values()):
+        np.testing.assert_allclose(a, b, equal_nan=True)
+
+def test_cache_segunda_lectura_con_memory_mapping(tmp_path):
+    primera = carga_datos.cargar("zacatecas.csv", directorio=str(tmp_path))
+    segunda = carga_datos.cargar("zacatecas.csv", directorio=str(tmp_path))
+    assert all(isinstance(x, np.memmap) for x in segunda.values())
+    for a, b in zip(primera.values(), segunda.values()):
+        np.testing.assert_array_equal(a, b)
+
+def _entradas(directorio) -> set:
+    return {p.name for p in directorio.iterdir()}
+
+def test_recorte_de_origenes_borrados_y_menos_usados(tmp_path):
+    cache = tmp_path / "cache"
+    fuentes = []
+    for i in range(3):
+        fuentes.append(tmp_path / f"zacatecas{i}.csv")
+        shutil.copy("zacatecas.csv", fuentes[-1])
+
+    carga_datos.cargar(str(fuentes[0]), directorio=str(cache))
+    primera = _entradas(cache)
+    os.remove(fuentes[0])
+    carga_datos.cargar(str(fuentes[1]), directorio=str(cache))
+    assert len(_entradas(cache)) == 1 and not _entradas(cache) & primera
+
+    #Con espacio para una sola entrada se elimina la anterior y se conserva la que se acaba de leer
+    segunda = _entradas(cache)
+    limite = carga_datos._tamano(str(cache / next(iter(segunda))))
+    datos = carga_datos.cargar(str(fuentes[2]), directorio=str(cache), limite=limite)
+    assert len(_entradas(cache)) == 1 and not _entradas(cache) & segunda
+    columna = carga_datos.COLUMNAS_EMA['RH']
+    np.testing.assert_array_equal(datos[columna], carga_datos.cargar(str(fuentes[2]), directorio=str(cache))[columna])
+
+def test_directorio_por_defecto_al_llamar(tmp_path, monkeypatch):
+    monkeypatch.setattr(carga_datos, "DIRECTORIO_CACHE", str(tmp_path))
+    carga_datos.cargar("abril.csv")
+    assert len(_entradas(tmp_path)) == 1
+    carga_datos.limpiar()
+    assert not tmp_path.exists()
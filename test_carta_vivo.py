@@ -0,0 +1,66 @@
+""" test_carta_vivo.py
+
+Pruebas de la carta psicrométrica en vivo de carta_vivo.py: buffer circular de puntos, área que
+se copia en cada cuadro y reproducción de un archivo de EMA.
+
+Example
+    $ python -m pytest test_carta_vivo.py
+"""
+
+import matplotlib
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+import carga_datos
+import carta_vivo
+
+EMA = "Estacion_ZACATECAS_EMA.csv"
+INICIO = np.datetime64("2023-01-10T00:00", 's')
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    #Las conversiones van a tmp_path, no a la caché del directorio de trabajo
+    monkeypatch.setattr(carga_datos, "DIRECTORIO_CACHE", str(tmp_path / "cache"))
+
+def test_buffer_conserva_las_ultimas_lecturas():
+    fig, ax = plt.subplots()
+    vivo = carta_vivo.CartaEnVivo(ax, P_atm=77.9, maximo=5)
+    fecha = INICIO + np.arange(8)*np.timedelta64(10, 'm')
+    vivo.agregar(fecha[:3], [10, 11, 12], 50, 779)
+    vivo.agregar(fecha[3:], [13, 14, 15, 16, 17], 50, [779, np.nan, 779, 779, 779])
+    orden = np.roll(np.arange(5), -vivo.siguiente)
+    np.testing.assert_array_equal(vivo.fecha[orden], fecha[3:])
+    np.testing.assert_array_equal(vivo.tbs[orden], [13, 14, 15, 16, 17])
+    assert np.isfinite(vivo.W).all()
+    vivo.actualizar()
+    vivo.actualizar()
+    np.testing.assert_array_equal(vivo.actual.get_xdata(), [17])
+    plt.close(fig)
+
+def test_copia_solo_el_area_de_los_ejes(monkeypatch):
+    fig, ax = plt.subplots()
+    vivo = carta_vivo.CartaEnVivo(ax, P_atm=77.9)
+    copias = []
+    monkeypatch.setattr(vivo.canvas, "blit", lambda bbox=None: copias.append(bbox.bounds))
+    vivo.agregar(INICIO, 20, 50, 779)
+    vivo.actualizar()
+    vivo.actualizar()
+    assert copias == [ax.bbox.bounds]*2 and ax.bbox.bounds != fig.bbox.bounds
+    plt.close(fig)
+
+def test_reproductor_lento_avanza():
+    #600 ms de datos por cuadro: el primer cuadro trae la primera lectura y la segunda (10 minutos
+    #después) llega en el cuadro 1000
+    fuente = carta_vivo.reproductor(EMA, velocidad=6, intervalo=100)
+    lecturas = [fuente() for _ in range(1000)]
+    assert [i for i, l in enumerate(lecturas) if l is not None] == [0, 999]
+    fecha, TBS, RH, P = lecturas[-1]
+    assert len(fecha) == 1 and str(fecha[0]) == "2022-10-12T17:50:00"
+
+@pytest.mark.parametrize("velocidad", [0, -1, 0.001])
+def test_reproductor_rechaza_velocidad_sin_avance(velocidad):
+    with pytest.raises(ValueError):
+        carta_vivo.reproductor(EMA, velocidad=velocidad, intervalo=100)
@@ -0,0 +1,53 @@
+""" test_diseno.py
+
+Pruebas de la evaluación por lotes de puntos de diseño de diseno.py: bloques, procesos, candidatos
+vacíos, parámetros desconocidos y consistencia del modelo.
+
+Example
+    $ python -m pytest test_diseno.py
+"""
+
+import numpy as np
+import pytest
+
+import diseno
+
+@pytest.fixture(scope="module")
+def estados():
+    datos = np.genfromtxt("zacatecas.csv", delimiter=",", skip_header=1, encoding="latin-1")
+    return diseno.clima(datos[:, 0], datos[:, 1]/100, datos[:, 2]/10)
+
+CANDIDATOS = diseno.rejilla(caudal=[5, 20, 50], eficiencia=[0, 0.8], consigna_enfriamiento=[22, 28])
+
+def test_bloques_y_procesos_iguales_a_un_bloque(estados):
+    base = diseno.evaluar(estados, CANDIDATOS, ganancia=50, intervalo=1/6)
+    for opciones in ({'bloque': 1}, {'bloque': 30000, 'procesos': 2}):
+        r = diseno.evaluar(estados, CANDIDATOS, ganancia=50, intervalo=1/6, **opciones)
+        for nombre, x in base.items():
+            np.testing.assert_allclose(r[nombre], x, rtol=1e-12)
+
+def test_candidatos_vacios(estados):
+    base = diseno.evaluar(estados, CANDIDATOS)
+    for candidatos in ({'caudal': []}, diseno.rejilla(caudal=[], eficiencia=[0, 0.8])):
+        r = diseno.evaluar(estados, candidatos)
+        assert set(r) == set(base) and all(len(x) == 0 for x in r.values())
+        assert len(diseno.mejores(r)) == 0
+
+def test_parametros_desconocidos(estados):
+    with pytest.raises(ValueError, match="eficencia"):
+        diseno.rejilla(caudal=[5, 20], eficencia=[0, 0.8])
+    with pytest.raises(ValueError, match="eficencia"):
+        diseno.evaluar(estados, {'caudal': [5, 20], 'eficencia': [0, 0.8]})
+
+def test_panel_y_caudal(estados):
+    r = diseno.evaluar(estados, CANDIDATOS, ganancia=50, intervalo=1/6)
+    #Con el mismo caudal y consigna, el panel baja los grados-hora y consume agua
+    sin_panel = r['grados_hora'][CANDIDATOS['eficiencia'] == 0]
+    con_panel = r['grados_hora'][CANDIDATOS['eficiencia'] == 0.8]
+    assert (con_panel <= sin_panel).all() and (sin_panel > con_panel).any()
+    np.testing.assert_allclose(r['agua_m3'][CANDIDATOS['eficiencia'] == 0], 0, atol=1e-9)
+    assert (r['agua_m3'][CANDIDATOS['eficiencia'] == 0.8] > 0).any()
+    #Más caudal, más consumo del ventilador
+    orden = np.argsort(CANDIDATOS['caudal'], kind='stable')
+    assert (np.diff(r['ventilador_kWh'][orden]) >= 0).all()
+    np.testing.assert_array_equal(diseno.mejores(r, 3), np.argsort(r['puntaje'], kind='stable')[:3])
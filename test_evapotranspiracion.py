@@ -0,0 +1,89 @@
+""" test_evapotranspiracion.py
+
+Pruebas de evapotranspiracion.py con el ejemplo 19 de FAO-56 (ET0 horaria en N'Diaye, Senegal) y
+con el archivo de la EMA de Zacatecas.
+
+Example
+    $ python -m pytest test_evapotranspiracion.py
+"""
+
+import numpy as np
+import pytest
+
+import atmosfera
+import carga_datos
+import evapotranspiracion as et
+import variables_psicrometricas_np as vpn
+
+#Ejemplo 19 de FAO-56: 16°13' N, 16°15' O, 8 m, 1 de octubre, de 14 a 15 h y de 2 a 3 h
+LATITUD = 16 + 13/60
+LONGITUD = 16 + 15/60
+FECHA = np.array(["2002-10-01T15:00", "2002-10-01T03:00"], dtype='datetime64[s]')
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(carga_datos, "DIRECTORIO_CACHE", str(tmp_path / "cache"))
+
+def test_ejemplo_19_fao56():
+    Ra = et.radiacion_extraterrestre(FECHA, 1, LATITUD, LONGITUD, meridiano=15)
+    np.testing.assert_allclose(Ra, [3.543, 0], atol=1e-3)
+    ET0 = et.et0(FECHA, [38.0, 28.0], [0.52, 0.90], atmosfera.presion_altitud(8), [3.3, 1.9],
+                 [2.450/0.0036, 0], LATITUD, LONGITUD, 8, intervalo=1, meridiano=15, altura_viento=2)
+    np.testing.assert_allclose(ET0, [0.63, 0.0], atol=0.005)
+
+def test_deficit_y_viento():
+    tbs = np.array([10.0, 25.0])
+    np.testing.assert_allclose(et.deficit_presion_vapor(tbs, [0.4, 1.0]), [0.6*vpn.pres_vapor_sat(10.0), 0])
+    np.testing.assert_allclose(et.viento_2m(1.0, 2), 1.0, rtol=1e-3)
+    assert et.viento_2m(1.0, 10) == pytest.approx(0.748, abs=1e-3)
+
+def test_diario():
+    fecha = np.array(["2023-01-02T01:00", "2023-01-01T12:00", "2023-01-02T02:00", "2023-01-01T13:00"],
+                     dtype='datetime64[s]')
+    dias, suma, n = et.diario(fecha, [1.0, 2.0, np.nan, 4.0])
+    assert dias.astype(str).tolist() == ["2023-01-01", "2023-01-02"]
+    assert suma.tolist() == [6.0, 1.0] and n.tolist() == [2, 1]
+    assert et.diario(fecha, [1.0, 2.0, np.nan, 4.0], 'media')[1].tolist() == [3.0, 1.0]
+    with pytest.raises(ValueError):
+        et.diario(fecha, [1.0, 2.0, 3.0, 4.0], 'maximo')
+
+def test_desde_archivo(tmp_path):
+    dias = et.desde_archivo("Estacion_ZACATECAS_EMA.csv", directorio=str(tmp_path / "otra"))
+    assert not (tmp_path / "cache").exists() and (tmp_path / "otra").exists()
+    assert str(dias['dia'][0]) == "2022-10-12" and str(dias['dia'][-1]) == "2023-01-10"
+    #El primer y el último día están incompletos
+    assert np.isnan(dias['ET0'][[0, -1]]).all() and np.isnan(dias['VPD'][[0, -1]]).all()
+    completos = dias['ET0'][1:-1]
+    assert np.nanmin(completos) > 0.5 and np.nanmax(completos) < 8
+    assert (dias['datos'] <= 144).all()
+
+def test_horario_de_verano():
+    #En octubre de 2022 la fecha local de la EMA es UTC-5 y después UTC-6: con la fecha UTC y el
+    #meridiano 0 se obtiene lo mismo que con la fecha local y el meridiano de su desfase en cada fila
+    #(en las filas de la misma fecha en ambos horarios, en las demás cambia el día del año; la
+    #diferencia que queda es por el 0.06667 h/° de FAO-56 en lugar de 1/15, un segundo por hora)
+    datos = carga_datos.cargar("Estacion_ZACATECAS_EMA.csv")
+    meta = carga_datos.metadatos("Estacion_ZACATECAS_EMA.csv")
+    nombres = carga_datos.COLUMNAS_EMA
+    local, utc = np.asarray(datos[nombres['FECHA']]), np.asarray(datos[nombres['FECHA_UTC']])
+    desfase = (utc - local)/np.timedelta64(1, 'h')
+    assert set(np.unique(desfase)) == {5, 6}
+    verano = (desfase == 5) & (utc.astype('datetime64[D]') == local.astype('datetime64[D]'))
+
+    sitio = (meta['Latitud (N)'], abs(meta['Longitud (O)']), meta['Altitud'])
+    entradas = (datos[nombres['TBS']][verano], datos[nombres['RH']][verano]/100, datos[nombres['P']][verano]/10,
+                datos[nombres['VIENTO']][verano]/3.6, datos[nombres['RADIACION']][verano])
+    con_utc = et.et0(utc[verano], *entradas, *sitio, meridiano=0)
+    con_local = et.et0(local[verano], *entradas, *sitio, meridiano=75)
+    np.testing.assert_allclose(con_utc, con_local, atol=1e-3)
+    #Con el meridiano fijo del horario estándar el mediodía solar se corre una hora
+    fijo = et.et0(local[verano], *entradas, *sitio, meridiano=et.MERIDIANO)
+    assert np.nanmax(np.abs(fijo - con_utc)) > 0.01
+
+    #desde_archivo suma ET0 calculada con la fecha UTC por día local
+    dias = et.desde_archivo("Estacion_ZACATECAS_EMA.csv")
+    todos = et.et0(utc, *(datos[nombres[c]]/f for c, f in (('TBS', 1), ('RH', 100), ('P', 10), ('VIENTO', 3.6),
+                                                          ('RADIACION', 1))), *sitio, meridiano=0)
+    _, suma, _ = et.diario(local, todos)
+    completos = ~np.isnan(dias['ET0'])
+    np.testing.assert_allclose(dias['ET0'][completos], suma[completos])
@@ -0,0 +1,107 @@
+""" test_frecuencias.py
+
+Pruebas de TablaFrecuencias de frecuencias.py: intervalos inferior y superior contra np.histogram,
+percentiles de diseño contra np.percentile, suma de tablas parciales y guardado en .npz.
+
+Example
+    $ python -m pytest test_frecuencias.py
+"""
+
+import numpy as np
+import pytest
+
+import frecuencias
+
+BORDES_X = np.arange(0, 30.1, 0.1)
+BORDES_Y = np.arange(0, 0.0201, 0.0001)
+
+def _datos(n: int = 200000, semilla: int = 5) -> tuple:
+    rng = np.random.default_rng(semilla)
+    tbs = rng.normal(15, 6, n)
+    W = np.clip(0.008 + 0.0002*(tbs - 15) + rng.normal(0, 0.002, n), 1e-4, None)
+    return tbs, W
+
+def _tabla(tbs, W, bordes_x=BORDES_X, **kwargs) -> frecuencias.TablaFrecuencias:
+    tabla = frecuencias.TablaFrecuencias(bordes_x, BORDES_Y, **kwargs)
+    tabla.actualizar(tbs, W)
+    return tabla
+
+def test_intervalos_fuera_de_los_bordes():
+    tbs, W = _datos()
+    tbs[:3] = np.nan
+    tabla = _tabla(tbs, W)
+    assert tabla.descartados == 3 and tabla.conteo.sum() == len(tbs) - 3
+    tbs, W = tbs[3:], W[3:]
+
+    #Inferior: menor al primer borde; superior: mayor o igual al último (searchsorted, side='right')
+    por_tbs = tabla.conteo.sum(axis=1)
+    assert por_tbs[0] == np.sum(tbs < BORDES_X[0]) > 0
+    assert por_tbs[-1] == np.sum(tbs >= BORDES_X[-1]) > 0
+    assert tabla.conteo.sum(axis=0)[-1] == np.sum(W >= BORDES_Y[-1])
+    dentro = (tbs >= BORDES_X[0]) & (tbs < BORDES_X[-1])
+    np.testing.assert_array_equal(por_tbs[1:-1], np.histogram(tbs[dentro], BORDES_X)[0])
+    dentro &= (W >= BORDES_Y[0]) & (W < BORDES_Y[-1])
+    np.testing.assert_array_equal(tabla.conteo[1:-1, 1:-1], np.histogram2d(tbs[dentro], W[dentro], (BORDES_X, BORDES_Y))[0])
+
+def test_percentiles_de_diseno_contra_np_percentile():
+    tbs, W = _datos()
+    bordes = np.arange(-20, 50.05, 0.1)
+    diseno = _tabla(tbs, W, bordes).percentiles_diseno()
+    assert set(diseno) == set(frecuencias.NIVELES)
+    for nivel, r in diseno.items():
+        #El valor se interpola dentro de un intervalo; el error es de una fracción del ancho
+        assert r['tbs'] == pytest.approx(np.percentile(tbs, 100 - nivel), abs=0.05)
+        assert r['y'] == pytest.approx(np.percentile(W, 100 - nivel), abs=0.00005)
+        #Coincidentes: media del otro eje en el intervalo del valor de diseño
+        i = np.searchsorted(bordes, r['tbs'], side='right')
+        en_intervalo = (tbs >= bordes[i - 1]) & (tbs < bordes[i])
+        assert r['y_coincidente'] == pytest.approx(W[en_intervalo].mean(), abs=0.0001)
+    assert diseno[0.4]['tbs'] > diseno[1]['tbs'] > diseno[2]['tbs']
+    #Si el percentil cae en el intervalo superior se reporta el último borde
+    assert _tabla(tbs, W).percentiles_diseno((0.4,))[0.4]['tbs'] == BORDES_X[-1]
+
+    with pytest.raises(ValueError):
+        frecuencias.TablaFrecuencias(BORDES_X, BORDES_Y).percentiles_diseno()
+
+def test_suma_de_tablas_parciales():
+    tbs, W = _datos(50000)
+    completa = _tabla(tbs, W, intervalo=1/6)
+    a = _tabla(tbs[:20000], W[:20000], intervalo=1/6)
+    b = _tabla(tbs[20000:], W[20000:], intervalo=1/6)
+
+    suma = a + b
+    np.testing.assert_array_equal(suma.conteo, completa.conteo)
+    assert a.conteo.sum() == 20000 and b.conteo.sum() == 30000
+    np.testing.assert_allclose(suma.horas(), completa.horas())
+
+    conteo_a = a.conteo
+    resultado = a
+    resultado += b
+    assert resultado is a and a.conteo is conteo_a
+    np.testing.assert_array_equal(a.conteo, completa.conteo)
+
+    otros_bordes = frecuencias.TablaFrecuencias(BORDES_X[:-1], BORDES_Y, intervalo=1/6)
+    otro_intervalo = frecuencias.TablaFrecuencias(BORDES_X, BORDES_Y, intervalo=1.0)
+    otro_eje = frecuencias.TablaFrecuencias(BORDES_X, BORDES_Y, eje_y='H', intervalo=1/6)
+    for otra in (otros_bordes, otro_intervalo, otro_eje):
+        with pytest.raises(ValueError):
+            b + otra
+        with pytest.raises(ValueError):
+            b += otra
+    assert b.conteo.sum() == 30000
+
+def test_guardar_y_cargar(tmp_path):
+    tbs, W = _datos(10000)
+    tbs[0] = np.nan
+    tabla = _tabla(tbs, W, eje_y='W', intervalo=1/6)
+    ruta = tmp_path / "parcial.npz"
+    tabla.guardar(str(ruta))
+    cargada = frecuencias.TablaFrecuencias.cargar(str(ruta))
+
+    np.testing.assert_array_equal(cargada.conteo, tabla.conteo)
+    np.testing.assert_array_equal(cargada.bordes_x, tabla.bordes_x)
+    np.testing.assert_array_equal(cargada.bordes_y, tabla.bordes_y)
+    assert (cargada.eje_y, cargada.intervalo, cargada.descartados) == ('W', 1/6, 1)
+    assert cargada.percentiles_diseno() == tabla.percentiles_diseno()
+    #La tabla cargada se puede seguir sumando
+    np.testing.assert_array_equal((cargada + tabla).conteo, 2*tabla.conteo)
@@ -0,0 +1,45 @@
+""" test_incertidumbre.py
+
+Pruebas de la propagación de incertidumbre de incertidumbre.py: Monte Carlo contra la propagación
+lineal, reproducibilidad con semilla y observaciones inválidas.
+
+Example
+    $ python -m pytest test_incertidumbre.py
+"""
+
+import numpy as np
+import pytest
+
+import incertidumbre
+
+TBS = [5.0, 19.7, 30.0]
+RH = [80, 15, 50]
+P = [779.5, 779.5, 1013.25]
+
+def test_monte_carlo_cerca_de_lineal():
+    mc = incertidumbre.monte_carlo(TBS, RH, P, n=40000, semilla=1)
+    lin = incertidumbre.lineal(TBS, RH, P)
+    for columna in ('W', 'H', 'TPR', 'TBH'):
+        #La no linealidad (por ejemplo, la TPR con humedad baja) desplaza la media menos que la desviación
+        assert (np.abs(mc[columna]['media'] - lin[columna]['media']) < 0.2*lin[columna]['desviacion']).all(), columna
+        np.testing.assert_allclose(mc[columna]['desviacion'], lin[columna]['desviacion'], rtol=0.05, err_msg=columna)
+        assert (mc[columna]['percentiles'][:, 0] < mc[columna]['media']).all()
+        assert (mc[columna]['media'] < mc[columna]['percentiles'][:, 2]).all()
+
+def test_semilla_y_bloques():
+    a = incertidumbre.monte_carlo(TBS, RH, P, n=500, semilla=7)
+    b = incertidumbre.monte_carlo(TBS, RH, P, n=500, semilla=7)
+    np.testing.assert_array_equal(a['TBH']['percentiles'], b['TBH']['percentiles'])
+    #Con bloques de una observación cambia el orden de las muestras, no la estadística
+    c = incertidumbre.monte_carlo(TBS, RH, P, n=20000, semilla=7, bloque=20000, columnas=('W',))
+    d = incertidumbre.monte_carlo(TBS, RH, P, n=20000, semilla=8, columnas=('W',))
+    np.testing.assert_allclose(c['W']['desviacion'], d['W']['desviacion'], rtol=0.05)
+
+def test_muestras_y_observaciones_invalidas():
+    tbs, rh, p = incertidumbre.muestras([20.0], [99.0], [780.0], 1000, distribucion='uniforme',
+                                        rng=np.random.default_rng(0))
+    assert tbs.shape == (1, 1000) and rh.max() <= 100 and np.abs(tbs - 20).max() <= 0.2
+    with pytest.raises(ValueError):
+        incertidumbre.muestras([20.0], [50.0], [780.0], 10, distribucion='triangular')
+    r = incertidumbre.monte_carlo([np.nan, 20.0], [50, 50], [780, 780], n=200, semilla=0)
+    assert np.isnan(r['TBH']['media'][0]) and np.isfinite(r['TBH']['media'][1])
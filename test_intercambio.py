@@ -0,0 +1,74 @@
+""" test_intercambio.py
+
+Pruebas de la entrada y salida sin copias de intercambio.py con el protocolo de buffer, pandas y
+Arrow.
+
+Example
+    $ python -m pytest test_intercambio.py
+"""
+
+import array
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import intercambio
+import variables_psicrometricas_np as vpn
+
+pa = pytest.importorskip("pyarrow")
+
+def test_columnas_sin_copia():
+    x = np.array([20.0, 25.0])
+    assert intercambio.columna(x) is x
+    buffer = array.array('d', [20.0, 25.0])
+    assert np.shares_memory(intercambio.columna(buffer), np.frombuffer(buffer))
+    crudo = bytearray(x.tobytes())
+    assert np.shares_memory(intercambio.columna(crudo), np.frombuffer(crudo))
+    arrow = pa.array([20.0, 25.0])
+    assert np.shares_memory(intercambio.columna(arrow), arrow.to_numpy(zero_copy_only=True))
+    serie = pd.Series([20.0, 25.0])
+    assert np.shares_memory(intercambio.columna(serie), serie.to_numpy())
+
+def test_nulos_bloques_y_enteros():
+    np.testing.assert_array_equal(intercambio.columna(pa.array([20.0, None])), [20.0, np.nan])
+    bloques = pa.chunked_array([[20.0], [25.0, 30.0]])
+    np.testing.assert_array_equal(intercambio.columna(bloques), [20.0, 25.0, 30.0])
+    np.testing.assert_array_equal(intercambio.columna(array.array('i', [1, 2])), [1.0, 2.0])
+
+def test_buffers_de_un_byte():
+    #Los enteros de un byte con tipo se convierten por valor; los bytes sin tipo se interpretan
+    np.testing.assert_array_equal(intercambio.columna(array.array('B', [20, 25])), [20.0, 25.0])
+    np.testing.assert_array_equal(intercambio.columna(array.array('b', [-5, 25])), [-5.0, 25.0])
+    crudo = np.array([20.0, 25.0]).tobytes()
+    np.testing.assert_array_equal(intercambio.columna(crudo), [20.0, 25.0])
+    np.testing.assert_array_equal(intercambio.columna(memoryview(crudo).cast('c')), [20.0, 25.0])
+
+def test_salida_rechaza_otro_tipo_o_no_contiguo():
+    tbs, RH, P = np.array([20.0, 25.0]), np.array([0.5, 0.6]), 101.325
+    #Un int32 se llenaría con los valores truncados a cero; uno no contiguo no se puede escribir
+    enteros = array.array('i', [0, 0])
+    for out in (memoryview(enteros), array.array('f', [0, 0]), np.zeros(2, dtype=np.float32),
+                np.zeros(4)[::2], memoryview(np.zeros(4))[::2]):
+        with pytest.raises(ValueError):
+            intercambio.propiedades(tbs, RH, P, ('W',), out={'W': out})
+
+def test_salida_en_buffers_y_arrow():
+    tbs, RH, P = np.array([20.0, 25.0]), np.array([0.5, 0.6]), np.array([101.325, 77.0])
+    esperado = vpn.propiedades(tbs, RH, P, ('W', 'H'))
+
+    memoria = bytearray(16)
+    r = intercambio.propiedades(array.array('d', tbs), RH, P, ('W',), out={'W': memoryview(memoria)})
+    assert np.shares_memory(r['W'], np.frombuffer(memoria))
+    np.testing.assert_array_equal(np.frombuffer(memoria), esperado['W'])
+    with pytest.raises(ValueError):
+        intercambio.propiedades(tbs, RH, P, ('W',), out={'W': bytes(16)})
+
+    tabla = intercambio.tabla(pa.table({'TBS': tbs, 'RH': RH, 'P_atm': P}), columnas=('W', 'H'))
+    assert tabla.column_names == ['W', 'H']
+    np.testing.assert_array_equal(tabla.column('H').to_numpy(), esperado['H'])
+    resultados = intercambio.propiedades(tbs, RH, P, ('W',))
+    assert np.shares_memory(intercambio.a_arrow(resultados).column('W').to_numpy(), resultados['W'])
+    df = pd.DataFrame({'t': tbs, 'h': RH})
+    np.testing.assert_array_equal(intercambio.tabla(df, 't', 'h', P_atm=77.0, columnas=('W',), salida='numpy')['W'],
+                                  vpn.razon_humedad(tbs, RH, 77.0))
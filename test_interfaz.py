@@ -0,0 +1,54 @@
+""" test_interfaz.py
+
+Pruebas de la interfaz gráfica de interfaz.py: cálculo del estado, solicitudes descartadas por folio
+y envío de entradas inválidas. Se ejecutan sin pantalla (QT_QPA_PLATFORM=offscreen).
+
+Example
+    $ python -m pytest test_interfaz.py
+"""
+
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+
+import interfaz
+import variables_psicrometricas as vp
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+def test_calcular_estado():
+    estado = interfaz.calcular_estado(20, 0.5, 101.325)
+    assert set(estado) == {llave for _, llave in interfaz.RESULTADOS}
+    assert estado["tbh"] == vp.temp_bulbo_humedo(20, 0.5, 101.325)
+    assert estado["W"] == vp.razon_humedad(20, 0.5, 101.325)
+
+def test_trabajador_descarta_solicitudes_anteriores(app):
+    trabajador = interfaz.Trabajador()
+    resultados, errores = [], []
+    trabajador.resultado.connect(lambda folio, tbs, estado: resultados.append(folio))
+    trabajador.error.connect(lambda folio, mensaje: errores.append(folio))
+
+    trabajador.ultimo_folio = 2
+    trabajador.calcular(1, 20, 0.5, 77.0)
+    trabajador.calcular(2, 20, 0.5, 77.0)
+    trabajador.ultimo_folio = 3
+    trabajador.calcular(3, 20, 1.5, 77.0)
+    assert resultados == [2] and errores == [3]
+
+def test_ventana_entrada_invalida_no_envia(app):
+    ventana = interfaz.Ventana()
+    try:
+        ventana.ui.lineEdit_2.setText("veinte")
+        ventana.ui.lineEdit.setText("50")
+        assert ventana.temporizador.isActive()
+        ventana.enviar()
+        assert ventana.folio == 0 and not ventana.temporizador.isActive()
+        assert ventana.estado.text().startswith("Escriba")
+    finally:
+        ventana.hilo.quit()
+        ventana.hilo.wait()
@@ -0,0 +1,64 @@
+""" test_jacobianos.py
+
+Pruebas de las derivadas analíticas de jacobianos.py contra diferencias finitas centrales.
+
+Example
+    $ python -m pytest test_jacobianos.py
+"""
+
+import numpy as np
+import pytest
+
+import jacobianos
+import variables_psicrometricas as vp
+import variables_psicrometricas_np as vpn
+
+#Estados con hielo y agua, a varias presiones
+TBS = np.array([-5.0, 5.0, 20.0, 35.0])
+RH = np.array([0.3, 0.6, 0.5, 0.8])
+P_ATM = np.array([77.0, 80.0, 101.325, 90.0])
+PASOS = {'tbs': 1e-5, 'RH': 1e-6, 'P_atm': 1e-4}
+
+@pytest.mark.parametrize("columna", vpn.COLUMNAS)
+def test_derivadas_igual_a_diferencias_finitas(columna):
+    r = jacobianos.propiedades_derivadas(TBS, RH, P_ATM)
+    np.testing.assert_array_equal(r[columna]['valor'], vpn.propiedades(TBS, RH, P_ATM)[columna])
+
+    #La TBH 'estandar' es una bisección con tolerancia de 0.001 °C; se deriva la de 'referencia'
+    precision, rtol = ('referencia', 1e-3) if columna == 'TBH' else ('estandar', 1e-6)
+    for k, entrada in enumerate(jacobianos.ENTRADAS):
+        arriba = [TBS, RH, P_ATM]
+        abajo = [TBS, RH, P_ATM]
+        arriba[k] = arriba[k] + PASOS[entrada]
+        abajo[k] = abajo[k] - PASOS[entrada]
+        diferencia = (vpn.propiedades(*arriba, columnas=(columna,), precision=precision)[columna]
+                      - vpn.propiedades(*abajo, columnas=(columna,), precision=precision)[columna])/(2*PASOS[entrada])
+        np.testing.assert_allclose(r[columna][entrada], diferencia, rtol=rtol, atol=1e-12, err_msg=entrada)
+
+@pytest.mark.parametrize("columna", ('TPR', 'TBH'))
+def test_derivadas_con_precision_referencia(columna):
+    #Con 'referencia' la TPR es la exacta, su derivada es la inversa de la de Pvs en el punto de rocío
+    r = jacobianos.propiedades_derivadas(TBS, RH, P_ATM, columnas=(columna,), precision='referencia')
+    base = vpn.propiedades(TBS, RH, P_ATM, columnas=(columna,), precision='referencia')[columna]
+    np.testing.assert_array_equal(r[columna]['valor'], base)
+    for k, entrada in enumerate(jacobianos.ENTRADAS):
+        arriba = [TBS, RH, P_ATM]
+        abajo = [TBS, RH, P_ATM]
+        arriba[k] = arriba[k] + PASOS[entrada]
+        abajo[k] = abajo[k] - PASOS[entrada]
+        diferencia = (vpn.propiedades(*arriba, columnas=(columna,), precision='referencia')[columna]
+                      - vpn.propiedades(*abajo, columnas=(columna,), precision='referencia')[columna])/(2*PASOS[entrada])
+        np.testing.assert_allclose(r[columna][entrada], diferencia, rtol=1e-3, atol=1e-12, err_msg=entrada)
+    #La derivada de la correlación 'estandar' es otra
+    estandar = jacobianos.propiedades_derivadas(TBS, RH, P_ATM, columnas=(columna,))
+    if columna == 'TPR':
+        assert not np.allclose(estandar['TPR']['tbs'], r['TPR']['tbs'], rtol=1e-6)
+
+def test_dlnpws_misma_rama_que_pres_vapor_sat():
+    #Entre 0 y 0.01 °C pres_vapor_sat usa la rama de agua; la derivada debe ser la de esa rama
+    tbs = np.array([-0.005, 0.005, 0.01])
+    paso = 1e-4
+    diferencia = (np.log(vpn.pres_vapor_sat(tbs + paso)) - np.log(vpn.pres_vapor_sat(tbs - paso)))/(2*paso)
+    np.testing.assert_allclose(vpn.dLnPws(tbs), diferencia, rtol=1e-6)
+    np.testing.assert_allclose([vp.dLnPws(t) for t in tbs], vpn.dLnPws(tbs), rtol=1e-12)
+
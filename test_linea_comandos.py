@@ -0,0 +1,118 @@
+""" test_linea_comandos.py
+
+Pruebas de linea_comandos.py: rangos de entrada de estado; columnas de entrada por nombre, archivos
+de EMA completos y llenado de la presión de lote; costo de importación del módulo.
+
+Example
+    $ python -m pytest test_linea_comandos.py
+"""
+
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import atmosfera
+import cache_resultados
+import carga_datos
+import linea_comandos
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    #Ninguna conversión debe ir a la caché del directorio de trabajo
+    directorio = tmp_path / "cache"
+    monkeypatch.setattr(carga_datos, "DIRECTORIO_CACHE", str(directorio))
+    monkeypatch.setattr(cache_resultados, "DIRECTORIO", str(tmp_path / "resultados"))
+    return directorio
+
+def _lote(tmp_path, *argumentos) -> np.ndarray:
+    salida = tmp_path / "salida.csv"
+    assert linea_comandos.main(["lote", *argumentos, "-o", str(salida)]) == 0
+    return np.genfromtxt(salida, delimiter=",", names=True)
+
+@pytest.mark.parametrize("argumentos, mensaje", [
+    (["--tbs", "80", "--rh", "50"], "TBS"),
+    (["--tbs", "-60", "--rh", "50"], "TBS"),
+    (["--tbs", "20", "--rh", "0"], "RH"),
+    (["--tbs", "20", "--rh", "120"], "RH"),
+])
+def test_estado_fuera_de_rango(capsys, argumentos, mensaje):
+    assert linea_comandos.main(["estado", *argumentos]) == 1
+    error = capsys.readouterr().err
+    assert error.startswith(f"Error: la {mensaje} debe")
+    assert "NoneType" not in error and "math" not in error
+
+def test_estado_en_los_limites(capsys):
+    assert linea_comandos.main(["estado", "--tbs", "69.9", "--rh", "100"]) == 0
+    assert "Temperatura de bulbo humedo" in capsys.readouterr().out
+
+def test_lote_no_escribe_cache_en_directorio_de_trabajo(tmp_path, cache):
+    _lote(tmp_path, "zacatecas.csv")
+    assert not cache.exists()
+
+def test_lote_columnas_por_nombre_en_exportacion_ema(tmp_path):
+    #La exportación tiene fecha, viento, ... antes de TBS, RH y P
+    r = _lote(tmp_path, "Estacion_ZACATECAS_EMA.csv")
+    assert r['TBS'][0] == 19.7 and r['HR'][0] == 15
+    zacatecas = _lote(tmp_path, "zacatecas.csv")
+    np.testing.assert_allclose(r['W'][0], zacatecas['W'][0])
+
+def test_lote_sin_presion_usa_altitud(tmp_path):
+    csv = _lote(tmp_path, "abril.csv", "--altitud", "2250")
+    excel = _lote(tmp_path, "abril.xlsx", "--altitud", "2250")
+    assert len(csv) == 29
+    for columna in csv.dtype.names:
+        np.testing.assert_array_equal(csv[columna], excel[columna])
+
+def test_lote_sin_columnas_reconocidas(tmp_path):
+    archivo = tmp_path / "otro.csv"
+    archivo.write_text("a,b\n1,2\n")
+    assert linea_comandos.main(["lote", str(archivo)]) == 1
+
+def test_importar_modulo_no_carga_dependencias():
+    codigo = "import sys, linea_comandos; print(sorted({'subprocess', 'numpy', 'pandas'} & set(sys.modules)))"
+    salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True)
+    assert salida.stdout.strip() == "[]"
+
+@pytest.mark.parametrize("opciones", [
+    ["--unicos", "--cache"],
+    ["--unicos", "--procesos", "2"],
+    ["--procesos", "2", "--cache"],
+    ["--resolucion", "0.1", "1", "0.1", "--cache"],
+    ["--resolucion", "0.1", "1", "0.1", "--procesos", "2"],
+])
+def test_lote_metodos_excluyentes(tmp_path, opciones):
+    with pytest.raises(SystemExit) as error:
+        linea_comandos.main(["lote", "zacatecas.csv", *opciones, "-o", str(tmp_path / "salida.csv")])
+    assert error.value.code == 2
+
+def test_lote_metodos_mismo_resultado(tmp_path):
+    base = _lote(tmp_path, "zacatecas.csv")
+    for opciones in (["--unicos"], ["--procesos", "2"], ["--cache"]):
+        r = _lote(tmp_path, "zacatecas.csv", *opciones)
+        for columna in base.dtype.names:
+            np.testing.assert_array_equal(r[columna], base[columna])
+
+def _presion(r) -> np.ndarray:
+    #Presión en hPa que se usó en cada fila, despejada de W y la presión de vapor (kPa)
+    return (r['PV'] + 0.62198*r['PV']/r['W'])*10
+
+def test_lote_rellenar_despues_de_validar_con_fechas(tmp_path):
+    with open("Estacion_ZACATECAS_EMA.csv", encoding="latin-1") as f:
+        lineas = f.read().splitlines()
+    encabezado, filas = lineas[:10], [l.split(",") for l in lineas[10:70]]
+    #Filas de 10 minutos de la más reciente a la más antigua: una presión fuera de rango y un hueco de 4 h
+    filas[5][8] = "50.0"
+    for fila in filas[20:45]:
+        fila[8] = ""
+    archivo = tmp_path / "Estacion_PRUEBA_EMA.csv"
+    archivo.write_text("\n".join(encabezado + [",".join(f) for f in filas]) + "\n", encoding="latin-1")
+
+    P = _presion(_lote(tmp_path, str(archivo), "--rellenar"))
+    medida = np.array([float(f[8]) for f in filas[:20] + filas[45:] if f is not filas[5]])
+    #La presión fuera de rango se interpola entre sus vecinas
+    assert min(medida[4], medida[5]) - 1e-6 <= P[5] <= max(medida[4], medida[5]) + 1e-6
+    #El hueco largo se llena con el modelo a la altitud del encabezado (2270 m) y no se interpola
+    modelo = atmosfera.presion_altitud(2270)*10
+    np.testing.assert_allclose(P[20:45], modelo + np.median(medida - modelo), rtol=1e-9)
@@ -0,0 +1,33 @@
+""" test_paralelo.py
+
+Pruebas del cálculo en varios procesos con memoria compartida de paralelo.py: el resultado es el
+mismo que en un solo proceso, con cualquier tamaño de tarea y forma de las entradas.
+
+Example
+    $ python -m pytest test_paralelo.py
+"""
+
+import numpy as np
+import pytest
+
+import paralelo
+import variables_psicrometricas_np as vpn
+
+@pytest.mark.parametrize("bloque", [1000, 4096, 10**6])
+def test_igual_a_un_proceso(bloque):
+    rng = np.random.default_rng(0)
+    tbs = rng.uniform(-10, 40, 10000)
+    RH = rng.uniform(0.05, 1, 10000)
+    tbs[::97] = np.nan
+    esperado = vpn.propiedades(tbs, RH, 77.9, precision='rapida')
+    r = paralelo.propiedades(tbs, RH, 77.9, procesos=2, bloque=bloque, precision='rapida')
+    for columna in vpn.COLUMNAS:
+        np.testing.assert_array_equal(r[columna], esperado[columna], err_msg=columna)
+
+def test_forma_y_columnas():
+    tbs = np.linspace(0, 35, 24).reshape(4, 6)
+    P = np.array([[77.0], [80.0], [90.0], [101.325]])
+    r = paralelo.propiedades(tbs, 0.5, P, columnas=('W', 'TBH'), procesos=2, bloque=5)
+    assert set(r) == {'W', 'TBH'} and r['W'].shape == (4, 6)
+    np.testing.assert_array_equal(r['TBH'], vpn.temp_bulbo_humedo(tbs, 0.5, P))
+    assert paralelo.propiedades(np.array([]), 0.5, 77.0, columnas=('W',), procesos=2)['W'].shape == (0,)
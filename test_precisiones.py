@@ -0,0 +1,42 @@
+""" test_precisiones.py
+
+Pruebas de los niveles de precisión de variables_psicrometricas_np.PRECISIONES: la 'referencia'
+resuelve las ecuaciones de TPR y TBH y los demás niveles quedan dentro del error documentado.
+
+Example
+    $ python -m pytest test_precisiones.py
+"""
+
+import numpy as np
+import pytest
+
+import regresion
+import variables_psicrometricas_np as vpn
+
+def _estados(n: int = 20000) -> tuple:
+    rng = np.random.default_rng(3)
+    return rng.uniform(-10, 45, n), rng.uniform(0.02, 1, n), rng.uniform(70, 101.325, n)
+
+def test_referencia_resuelve_las_ecuaciones():
+    tbs, RH, P = _estados()
+    r = vpn.propiedades(tbs, RH, P, precision='referencia')
+    np.testing.assert_allclose(vpn.pres_vapor_sat(r['TPR']), r['PV'], rtol=1e-8)
+    W = vpn.razon_humedad_TBH(tbs, r['TBH'], P)
+    np.testing.assert_allclose(W, np.maximum(r['W'], vpn.MIN_HUM_RATIO), rtol=1e-7, atol=1e-10)
+
+def test_error_de_cada_nivel():
+    resultado = regresion.precisiones(n=20000, repeticiones=1)
+    assert resultado['referencia']['TBH'] == (0, 0) and resultado['referencia']['TPR'] == (0, 0)
+    #Cotas de la tabla de PRECISIONES con un margen
+    assert resultado['rapida']['TBH'][0] < 1 and resultado['rapida']['TBH'][1] < 0.005
+    assert resultado['estandar']['TBH'][0] < 1 and resultado['estandar']['TBH'][1] < 0.02
+
+def test_columnas_de_formula_no_dependen_del_nivel():
+    tbs, RH, P = _estados(500)
+    base = vpn.propiedades(tbs, RH, P, precision='referencia')
+    for nivel in ('rapida', 'estandar'):
+        r = vpn.propiedades(tbs, RH, P, precision=nivel)
+        for columna in ('PVS', 'PV', 'WS', 'W', 'MU', 'VEH', 'H'):
+            np.testing.assert_array_equal(r[columna], base[columna])
+    with pytest.raises(ValueError):
+        vpn.propiedades(tbs, RH, P, precision='maxima')
@@ -0,0 +1,39 @@
+""" test_regresion.py
+
+Ejecuta la regresión de exactitud de regresion.py contra los archivos de referencia del
+repositorio y prueba la compuerta de rendimiento y el registro. La compuerta con el mínimo
+configurado (regresion.MINIMO) se omite con la variable de entorno VP_SIN_RENDIMIENTO=1, para
+máquinas lentas o compartidas donde el rendimiento no es representativo.
+
+Example
+    $ python -m pytest test_regresion.py
+"""
+
+import os
+
+import pytest
+
+import regresion
+
+@pytest.mark.parametrize("nombre", list(regresion.CASOS))
+def test_referencias_dentro_de_tolerancia(nombre):
+    resultado = regresion.comparar(nombre)
+    assert {columna for columna, *_ in resultado} >= {'W', 'H', 'TPR'}
+    assert [columna for columna, _, fuera, _ in resultado if fuera] == []
+
+def test_compuerta_y_registro(tmp_path, capsys):
+    registro = tmp_path / "rendimiento.csv"
+    assert regresion.main(["--minimo", "0", "--registro", str(registro)]) == 0
+    assert regresion.main(["--minimo", "1e12", "--registro", str(registro)]) == 1
+    lineas = registro.read_text(encoding="utf-8").splitlines()
+    assert lineas[0] == "fecha,estados_s,fallas" and len(lineas) == 3
+    assert lineas[1].endswith(",0") and lineas[2].endswith(",1")
+    assert "FALLA" in capsys.readouterr().out
+
+@pytest.mark.skipif(os.environ.get("VP_SIN_RENDIMIENTO") == "1", reason="VP_SIN_RENDIMIENTO=1")
+def test_minimo_configurado(capsys):
+    #Sin argumentos se usa regresion.MINIMO, la compuerta que se aplica en la práctica
+    assert regresion.main([]) == 0
+    salida = capsys.readouterr().out
+    assert f"(mínimo {regresion.MINIMO:,.0f}) ok" in salida and "FALLA" not in salida
+
@@ -0,0 +1,43 @@
+""" test_render.py
+
+Pruebas del renderizado sin pantalla de cartas por estación y periodo de render.py.
+
+Example
+    $ python -m pytest test_render.py
+"""
+
+import numpy as np
+import pytest
+
+import carga_datos
+import render
+import variables_psicrometricas_np as vpn
+
+EMA = "Estacion_ZACATECAS_EMA.csv"
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    #Las conversiones van a tmp_path, no a la caché del directorio de trabajo
+    monkeypatch.setattr(carga_datos, "DIRECTORIO_CACHE", str(tmp_path / "cache"))
+
+def test_datos_periodo():
+    nombres = carga_datos.COLUMNAS_EMA
+    datos = carga_datos.cargar(EMA)
+    fecha = datos[nombres['FECHA']]
+    diciembre = (fecha >= np.datetime64("2022-12")) & (fecha < np.datetime64("2023-01"))
+
+    TBS, W = render.datos_periodo(EMA, "2022-12")
+    assert len(TBS) == diciembre.sum() > 0
+    np.testing.assert_array_equal(TBS, datos[nombres['TBS']][diciembre])
+    np.testing.assert_array_equal(W, vpn.razon_humedad(TBS, datos[nombres['RH']][diciembre]/100,
+                                                       datos[nombres['P']][diciembre]/10))
+    assert len(render.datos_periodo(EMA)[0]) == len(fecha)
+    assert len(render.datos_periodo(EMA, "2021")[0]) == 0
+
+def test_renderizar_en_procesos(tmp_path):
+    trabajos = [(EMA, "2022-11", 2270), (EMA, "2023", 2270), (EMA, None, 0)]
+    archivos = render.renderizar(trabajos, directorio=str(tmp_path), formato="png", procesos=2)
+    assert archivos == [str(tmp_path / f"Estacion_ZACATECAS_EMA_{periodo}.png") for periodo in ("2022-11", "2023", "completo")]
+    for archivo in archivos:
+        with open(archivo, "rb") as f:
+            assert f.read(8) == b"\x89PNG\r\n\x1a\n"
@@ -0,0 +1,43 @@
+""" test_unicos.py
+
+Pruebas de la evaluación sobre estados únicos de unicos.py.
+
+Example
+    $ python -m pytest test_unicos.py
+"""
+
+import numpy as np
+
+import unicos
+import variables_psicrometricas_np as vpn
+
+def _zacatecas() -> tuple:
+    datos = np.genfromtxt("zacatecas.csv", delimiter=",", skip_header=1, encoding="latin-1")
+    return datos[:, 0], datos[:, 1]/100, datos[:, 2]/10
+
+def test_igual_a_evaluar_todas_las_filas():
+    tbs, RH, P = _zacatecas()
+    resultados, razon = unicos.propiedades(tbs, RH, P)
+    esperado = vpn.propiedades(tbs, RH, P)
+    for columna in vpn.COLUMNAS:
+        np.testing.assert_array_equal(resultados[columna], esperado[columna], err_msg=columna)
+    assert razon > 1
+
+def test_resolucion_igual_a_redondear_antes():
+    tbs, RH, P = _zacatecas()
+    resolucion = (0.5, 0.02, 0.1)
+    resultados, razon = unicos.propiedades(tbs, RH, P, columnas=('W', 'TBH'), resolucion=resolucion)
+    redondeados = [unicos.cuantizar(x, r) for x, r in zip((tbs, RH, P), resolucion)]
+    esperado = vpn.propiedades(*redondeados, columnas=('W', 'TBH'))
+    np.testing.assert_array_equal(resultados['TBH'], esperado['TBH'])
+    assert razon > unicos.propiedades(tbs, RH, P, columnas=('W',))[1]
+
+def test_nan_y_forma():
+    tbs = np.array([[20.0, np.nan, 20.0], [25.0, 20.0, 25.0]])
+    RH = np.array([[0.5, 0.5, 0.5], [0.4, np.nan, 0.4]])
+    estados, indice = unicos.estados_unicos(tbs, RH, 77.0*np.ones_like(tbs))
+    assert len(estados) == 2 and indice.tolist() == [0, -1, 0, 1, -1, 1]
+    resultados, razon = unicos.propiedades(tbs, RH, 77.0, columnas=('W',))
+    assert resultados['W'].shape == (2, 3) and razon == 2
+    assert np.isnan(resultados['W'][[0, 1], [1, 1]]).all()
+    np.testing.assert_array_equal(resultados['W'][:, 0], resultados['W'][:, 2])
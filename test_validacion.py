@@ -0,0 +1,73 @@
+""" test_validacion.py
+
+Pruebas de validacion.py y de la lectura por trozos de frecuencias.py: validar por trozos debe dar
+el mismo resultado que validar la serie completa, también con picos y rachas en los bordes.
+
+Example
+    $ python -m pytest test_validacion.py
+"""
+
+import numpy as np
+import pytest
+
+import frecuencias
+import validacion
+
+def _serie(n: int = 3000, semilla: int = 0) -> dict:
+    rng = np.random.default_rng(semilla)
+    TBS = np.round(15 + 8*np.sin(np.arange(n)/50) + rng.normal(0, 0.3, n), 1)
+    RH = np.round(np.clip(50 + rng.normal(0, 5, n), 0, 100))
+    P = np.round(780 + rng.normal(0, 0.5, n), 1)
+    TBS[rng.choice(n, 30, replace=False)] += 20             #Picos
+    TBS[rng.choice(n, 20, replace=False)] = np.nan
+    TBS[1000:1040] = 12.0                                   #Sensor pegado (> 36 lecturas)
+    TBS[2000:2030] = 12.0                                   #Racha permitida (< 36 lecturas)
+    RH[500:700] = 55                                        #RH pegada (> 144 lecturas)
+    return {'TBS': TBS, 'RH': RH, 'P': P}
+
+def _por_trozos(datos: dict, tamano: int) -> dict:
+    n = len(datos['TBS'])
+    trozos = ({c: x[i:i + tamano] for c, x in datos.items()} for i in range(0, n, tamano))
+    partes = list(validacion.validar_por_trozos(trozos))
+    return {c: np.concatenate([parte[c] for parte in partes]) for c in datos}
+
+def test_mascaras_por_tipo():
+    x = np.array([20, 20.5, np.nan, 21, 45, 21.5, 22, 22, 22, 22, 80])
+    m = validacion.mascaras(x, rango=(-60, 70), salto=8, repeticiones=3)
+    assert np.flatnonzero(m['faltante']).tolist() == [2]
+    assert np.flatnonzero(m['rango']).tolist() == [10]
+    assert np.flatnonzero(m['pico']).tolist() == [4]
+    assert np.flatnonzero(m['pegado']).tolist() == [6, 7, 8, 9]
+
+def test_procesar_propaga_nan_sin_detenerse():
+    TBS = np.array([20.0, 20.5, 21.0, np.nan, 21.5, 95.0])
+    RH = np.array([50.0, 51, 150, 53, 54, 55])
+    P = np.full(6, 780.0)
+    resultados, m = validacion.procesar(TBS, RH, P)
+    invalidas = [2, 3, 5]
+    assert np.isnan(resultados['TBH'][invalidas]).all()
+    assert np.isfinite(resultados['TBH'][[0, 1, 4]]).all()
+    assert validacion.resumen(m)['TBS'] == {'faltante': 1, 'rango': 1, 'pico': 0, 'pegado': 0, 'total': 2}
+    assert validacion.resumen(m)['RH']['rango'] == 1
+
+@pytest.mark.parametrize("tamano", [1, 7, 100, 999, 1001, 5000])
+def test_por_trozos_igual_a_serie_completa(tamano):
+    datos = _serie()
+    completo, _ = validacion.validar(datos)
+    trozos = _por_trozos(datos, tamano)
+    for c in datos:
+        np.testing.assert_array_equal(trozos[c], completo[c])
+
+def test_pico_y_racha_en_el_borde_de_un_trozo():
+    datos = _serie()
+    datos['TBS'][1500] += 25            #Pico en la primera fila de un trozo de 500
+    datos['TBS'][1480:1520] = 9.0       #Racha que cruza el borde
+    completo, _ = validacion.validar(datos)
+    assert np.isnan(completo['TBS'][1480:1520]).all()
+    np.testing.assert_array_equal(_por_trozos(datos, 500)['TBS'], completo['TBS'])
+
+def test_frecuencias_no_depende_del_tamano_del_trozo():
+    grande = frecuencias.desde_archivo("Estacion_ZACATECAS_EMA.csv", tamano=50000)
+    chico = frecuencias.desde_archivo("Estacion_ZACATECAS_EMA.csv", tamano=37)
+    np.testing.assert_array_equal(grande.conteo, chico.conteo)
+    assert grande.descartados == chico.descartados
@@ -0,0 +1,44 @@
+""" test_variables_psicrometricas_np.py
+
+Pruebas de los núcleos de arreglos de variables_psicrometricas_np.py: deben dar los mismos
+resultados que la versión escalar y regresar NaN, sin lanzar excepciones, fuera de rango.
+
+Example
+    $ python -m pytest test_variables_psicrometricas_np.py
+"""
+
+import numpy as np
+
+import variables_psicrometricas as vp
+import variables_psicrometricas_np as vpn
+
+TBS = np.array([-5.0, 0.5, 12.5, 20.0, 35.0])
+RH = np.array([0.3, 0.5, 0.7, 0.9, 1.0])
+P_ATM = 77.0
+
+def test_igual_a_escalar():
+    Pv = vpn.presion_vapor(RH, TBS)
+    escalar = {
+        'PV': [vp.presion_vapor(r, t) for t, r in zip(TBS, RH)],
+        'W': [vp.razon_humedad(t, r, P_ATM) for t, r in zip(TBS, RH)],
+        'H': [vp.entalpia(t, r, P_ATM) for t, r in zip(TBS, RH)],
+        'TPR': [vp.temp_punto_rocio(t, p) for t, p in zip(TBS, Pv)],
+        'TBH': [vp.temp_bulbo_humedo(t, r, P_ATM) for t, r in zip(TBS, RH)],
+    }
+    r = vpn.propiedades(TBS, RH, P_ATM)
+    for columna, esperado in escalar.items():
+        np.testing.assert_allclose(r[columna], esperado, rtol=1e-12, err_msg=columna)
+
+def test_fuera_de_rango_es_nan():
+    tbs = np.array([np.nan, 250.0, 20.0, 20.0, 20.0])
+    rh = np.array([0.5, 0.5, 1.5, -0.1, 0.5])
+    r = vpn.propiedades(tbs, rh, P_ATM)
+    for columna in ('PV', 'W', 'H', 'TPR', 'TBH'):
+        assert np.isnan(r[columna][:4]).all() and np.isfinite(r[columna][4]), columna
+    assert np.isnan(vpn.pres_vapor_sat([-150.0, 250.0])).all()
+
+def test_out_y_broadcasting():
+    out = {c: np.empty((2, 5)) for c in vpn.COLUMNAS}
+    r = vpn.propiedades(TBS, RH, np.array([[P_ATM], [101.325]]), out=out)
+    assert all(r[c] is out[c] for c in vpn.COLUMNAS)
+    np.testing.assert_array_equal(r['W'][0], vpn.razon_humedad(TBS, RH, P_ATM))
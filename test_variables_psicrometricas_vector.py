@@ -0,0 +1,49 @@
+""" test_variables_psicrometricas_vector.py
+
+Pruebas de las APIs de la versión 1.0 (variables_psicrometricas_vector.py y
+variables_psicrometricas2.py): deben dar los mismos resultados que la versión escalar y no
+modificar las listas del usuario.
+
+Example
+    $ python -m pytest test_variables_psicrometricas_vector.py
+"""
+
+import numpy as np
+
+import variables_psicrometricas as vp
+import variables_psicrometricas2 as vp2
+import variables_psicrometricas_np as vpn
+import variables_psicrometricas_vector as vpv
+
+TBS = [-5.0, 0.0, 12.5, 20.0, 35.0]
+RH = [30, 50, 70, 90, 100]      #Porcentaje
+P_ATM = 77.0
+
+def test_entalpia_usa_el_nucleo_compartido():
+    W = vpv.RazonHumedad(TBS, RH, P_ATM)
+    esperado = [vp.entalpia_W(t, w) for t, w in zip(TBS, W)]
+    np.testing.assert_allclose(vpv.Entalpia(TBS, W), esperado, rtol=1e-14)
+    np.testing.assert_allclose([vp2.Entalpia(t, w) for t, w in zip(TBS, W)], esperado, rtol=1e-14)
+    np.testing.assert_allclose(vpn.entalpia(TBS, np.array(RH)/100, P_ATM), esperado, rtol=1e-14)
+
+def test_lista_igual_a_escalar():
+    np.testing.assert_allclose(vpv.PresVaporSat(TBS), [vp.pres_vapor_sat(t) for t in TBS], rtol=1e-12)
+    np.testing.assert_allclose(vpv.PresionVapor(RH, TBS), [vp.presion_vapor(r/100, t) for r, t in zip(RH, TBS)],
+                               rtol=1e-12)
+    np.testing.assert_allclose(vpv.RazonHumedad(TBS, RH, P_ATM),
+                               [vp.razon_humedad(t, r/100, P_ATM) for t, r in zip(TBS, RH)], rtol=1e-12)
+    np.testing.assert_allclose(vpv.TempBulboHumedo(TBS, [r/100 for r in RH]),
+                               [vp.temp_bulbo_humedo1(t, r/100) for t, r in zip(TBS, RH)], rtol=1e-12)
+
+def test_no_modifica_las_listas():
+    tbs, rh = list(TBS), list(RH)
+    vpv.RazonHumedad(tbs, rh, P_ATM)
+    vpv.Entalpia(tbs, rh)
+    assert tbs == TBS and rh == RH
+
+def test_precision_del_punto_de_rocio():
+    T, Pv = [5.0, 20.0], [0.5, 1.2]
+    for nivel in vpn.PRECISIONES:
+        np.testing.assert_array_equal(vpv.TempPuntoRocio(T, Pv, precision=nivel),
+                                      vpn.temp_punto_rocio(np.array(T), np.array(Pv), precision=nivel))
+    assert vpv.TempPuntoRocio(T, Pv) == vpv.TempPuntoRocio(T, Pv, precision='estandar')
@@ -0,0 +1,41 @@
+""" test_zonas.py
+
+Pruebas de la clasificación vectorizada de puntos de la carta en zonas de zonas.py.
+
+Example
+    $ python -m pytest test_zonas.py
+"""
+
+import numpy as np
+from matplotlib.path import Path
+
+import variables_psicrometricas_np as vpn
+import zonas
+
+P_ATM = 77.9
+
+def test_variables_recupera_la_humedad_relativa():
+    tbs = np.array([5.0, 20.0, 33.0])
+    RH = np.array([0.2, 0.5, 0.95])
+    datos = zonas.variables(tbs, vpn.razon_humedad(tbs, RH, P_ATM), P_ATM)
+    np.testing.assert_allclose(datos['RH'], RH, rtol=1e-12)
+    np.testing.assert_allclose(datos['H'], vpn.entalpia(tbs, RH, P_ATM), rtol=1e-12)
+
+def test_dentro_poligono_igual_a_matplotlib():
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(15, 30, 5000), rng.uniform(-0.002, 0.015, 5000)
+    poligono = [(20.5, 0.0), (27.0, 0.0), (26.0, 0.012), (22.0, 0.014), (19.5, 0.012)]
+    esperado = Path(poligono).contains_points(np.column_stack([x, y]))
+    np.testing.assert_array_equal(zonas.dentro_poligono(x, y, poligono), esperado)
+
+def test_clasificar_por_prioridad_y_horas():
+    #Condensación, confort y evaporativo a la vez (gana la primera zona), invernadero, evaporativo, ninguna
+    tbs = np.array([21.0, 25.0, 28.0, 35.0, 5.0])
+    RH = np.array([0.95, 0.2, 0.7, 0.1, 0.5])
+    W = vpn.razon_humedad(tbs, RH, P_ATM)
+    np.testing.assert_array_equal(zonas.clasificar(tbs, W, P_ATM), [0, 1, 2, 3, -1])
+    matriz = zonas.matriz_pertenencia(tbs, W, P_ATM)
+    assert matriz[:, 1].tolist() == [False, True, False, True]
+    horas = zonas.horas_por_zona(tbs, W, P_ATM, intervalo=0.5)
+    assert horas == {'Riesgo de condensación': 0.5, 'Confort ASHRAE': 0.5, 'Invernadero': 0.5,
+                     'Enfriamiento evaporativo': 1.0}
@@ -0,0 +1,79 @@
+""" unicos.py
+
+Evaluación por lotes sobre los estados únicos. Los datos de las estaciones están cuantizados
+(TBS a 0.1 °C, RH a 1 %, P a 0.1 hPa), por lo que un archivo largo tiene muchos menos estados
+(tbs, RH, P_atm) distintos que filas. Se buscan los estados únicos (opcionalmente después de
+redondearlos a una resolución dada), se calculan solo esos con variables_psicrometricas_np y los
+resultados se reparten a todas las filas con el índice inverso.
+
+Example
+    >>> import unicos
+    >>> resultados, razon = unicos.propiedades(TBS, RH/100, P/10, resolucion=(0.5, 0.02, 0.1))
+    >>> razon   #filas por estado único en zacatecas.csv
+    2.7078063672045354
+"""
+
+import numpy as np
+
+import variables_psicrometricas_np as vpn
+
+def cuantizar(x, resolucion: float) -> np.ndarray:
+    """
+    Retorna x redondeado al múltiplo más cercano de la resolución.
+    """
+    x = np.asarray(x, dtype=float)
+    if not resolucion:
+        return x
+    return np.round(x/resolucion)*resolucion
+
+def estados_unicos(tbs, RH, P_atm, resolucion: tuple = None) -> tuple:
+    """
+    Retorna los estados únicos y el índice inverso de cada fila. Las filas con algún dato
+    faltante (NaN) no se incluyen; su índice inverso es -1.
+
+    Args:
+        tbs: Temperatura de bulbo seco en °C
+        RH: Humedad relativa en fracción
+        P_atm: Presión atmosférica en kPa
+        resolucion: Resolución (tbs, RH, P_atm) a la que se redondean los datos (opcional)
+
+    Returns:
+        Matriz (estados × 3) con los estados únicos
+        Índice inverso (una entrada por fila, -1 en las filas con NaN)
+    """
+    resolucion = resolucion or (None, None, None)
+    datos = np.column_stack([cuantizar(x, r).ravel() for x, r in zip((tbs, RH, P_atm), resolucion)])
+
+    validos = np.isfinite(datos).all(axis=1)
+    unicos, inverso = np.unique(datos[validos], axis=0, return_inverse=True)
+
+    indice = np.full(datos.shape[0], -1)
+    indice[validos] = inverso.ravel()
+    return unicos, indice
+
+def propiedades(tbs, RH, P_atm, columnas: tuple = vpn.COLUMNAS, resolucion: tuple = None,
+                precision: str = 'estandar') -> tuple:
+    """
+    Retorna las variables psicrométricas calculadas una sola vez por estado único.
+
+    Args:
+        tbs: Temperatura de bulbo seco en °C
+        RH: Humedad relativa en fracción
+        P_atm: Presión atmosférica en kPa
+        columnas: Variables a calcular (subconjunto de variables_psicrometricas_np.COLUMNAS)
+        resolucion: Resolución (tbs, RH, P_atm) a la que se redondean los datos (opcional)
+        precision: Nivel de precisión (llave de variables_psicrometricas_np.PRECISIONES)
+
+    Returns:
+        Diccionario de arreglos con la forma de las entradas (NaN en las filas con datos faltantes)
+        Razón de reducción (filas válidas por estado único)
+    """
+    tbs, RH, P_atm = np.broadcast_arrays(np.asarray(tbs, dtype=float), np.asarray(RH, dtype=float),
+                                         np.asarray(P_atm, dtype=float))
+    unicos, indice = estados_unicos(tbs, RH, P_atm, resolucion)
+    valores = vpn.propiedades(unicos[:, 0], unicos[:, 1], unicos[:, 2], columnas, precision=precision)
+
+    #Se agrega un NaN al final de cada columna para las filas con índice -1
+    resultados = {columna: np.append(v, np.nan)[indice].reshape(tbs.shape) for columna, v in valores.items()}
+    razon = np.count_nonzero(indice >= 0) / max(len(unicos), 1)
+    return resultados, razon
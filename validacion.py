@@ -0,0 +1,177 @@
+""" validacion.py
+
+Validación vectorizada de los datos de una estación meteorológica (EMA) antes de calcular las
+variables psicrométricas. Para cada columna se construyen máscaras de calidad:
+
+    -faltante: el dato no existe (NaN) o no es numérico
+    -rango: el dato está fuera del rango válido de la columna
+    -pico: el dato difiere de sus dos vecinos más que el salto permitido
+    -pegado: el sensor repite el mismo valor más lecturas seguidas de las permitidas
+
+Los datos marcados se sustituyen por NaN, que se propaga por las funciones de
+variables_psicrometricas_np, por lo que un archivo completo se procesa en una sola pasada sin
+detenerse en las filas inválidas.
+
+Example
+    >>> import validacion
+    >>> resultados, mascaras = validacion.procesar(TBS, RH, P)
+    >>> validacion.resumen(mascaras)
+    {'TBS': {'faltante': 0, 'rango': 2, 'pico': 1, 'pegado': 0, 'total': 3}, ...}
+"""
+
+import numpy as np
+
+import variables_psicrometricas_np as vpn
+
+#Reglas por columna: rango válido, salto máximo entre lecturas y número máximo de lecturas
+#iguales seguidas (144 lecturas = 24 h con datos cada 10 minutos)
+REGLAS = {
+    'TBS': {'rango': (-60, 70), 'salto': 8, 'repeticiones': 36},     #°C
+    'RH': {'rango': (0, 100), 'salto': 30, 'repeticiones': 144},     #%
+    'P': {'rango': (300, 1100), 'salto': 10, 'repeticiones': 144},   #hPa
+}
+
+TIPOS = ('faltante', 'rango', 'pico', 'pegado')
+
+def mascaras(x, rango: tuple, salto: float, repeticiones: int) -> dict:
+    """
+    Retorna las máscaras de calidad de una columna de datos.
+
+    Args:
+        x: Columna de datos
+        rango: Tupla (mínimo, máximo) de valores válidos
+        salto: Diferencia máxima permitida con las lecturas vecinas
+        repeticiones: Número máximo de lecturas iguales seguidas
+
+    Returns:
+        Diccionario de arreglos booleanos con las llaves de TIPOS
+    """
+    x = np.asarray(x, dtype=float)
+    faltante = np.isnan(x)
+    fuera = ~faltante & ((x < rango[0]) | (x > rango[1]))
+
+    #Pico: el dato se aleja de la lectura anterior y de la siguiente en sentidos opuestos
+    anterior = np.diff(x, prepend=np.nan)
+    siguiente = np.diff(x, append=np.nan)
+    pico = (np.abs(anterior) > salto) & (np.abs(siguiente) > salto) & (anterior*siguiente < 0)
+
+    #Pegado: longitud de cada racha de valores iguales
+    if x.size:
+        inicio = np.concatenate(([True], x[1:] != x[:-1]))
+        racha = np.cumsum(inicio) - 1
+        longitud = np.bincount(racha)[racha]
+        pegado = ~faltante & (longitud > repeticiones)
+    else:
+        pegado = np.zeros(0, dtype=bool)
+
+    return {'faltante': faltante, 'rango': fuera, 'pico': pico, 'pegado': pegado}
+
+def validar(datos: dict, reglas: dict = REGLAS) -> tuple:
+    """
+    Valida las columnas de un diccionario de datos y sustituye los datos inválidos por NaN.
+    Las columnas que no tienen reglas se copian sin cambios.
+
+    Args:
+        datos: Diccionario {nombre de columna: arreglo}
+        reglas: Diccionario {nombre de columna: {'rango', 'salto', 'repeticiones'}}
+
+    Returns:
+        Diccionario de columnas limpias
+        Diccionario {nombre de columna: máscaras} de las columnas validadas
+    """
+    limpios = {}
+    resultado = {}
+    for nombre, x in datos.items():
+        x = np.asarray(x, dtype=float)
+        if nombre not in reglas:
+            limpios[nombre] = x
+            continue
+        m = mascaras(x, **reglas[nombre])
+        m['total'] = m['faltante'] | m['rango'] | m['pico'] | m['pegado']
+        limpios[nombre] = np.where(m['total'], np.nan, x)
+        resultado[nombre] = m
+
+    return limpios, resultado
+
+def _pendientes(datos: dict, reglas: dict) -> int:
+    """
+    Retorna el índice desde el que las filas de una ventana todavía pueden cambiar de máscara con
+    las lecturas siguientes: la última fila (pico) y la racha final de valores iguales que aún no
+    supera las repeticiones permitidas (pegado).
+    """
+    n = len(next(iter(datos.values())))
+    inicio = max(n - 1, 0)
+    for nombre, x in datos.items():
+        if nombre not in reglas or n == 0:
+            continue
+        distintos = np.flatnonzero(x[1:] != x[:-1])
+        racha = distintos[-1] + 1 if distintos.size else 0
+        if n - racha <= reglas[nombre]['repeticiones']:
+            inicio = min(inicio, racha)
+    return inicio
+
+def validar_por_trozos(trozos, reglas: dict = REGLAS):
+    """
+    Generador que valida una serie leída por trozos con el mismo resultado que validar() sobre la
+    serie completa. Cada trozo se valida junto con las últimas filas ya validadas (contexto para
+    picos y rachas) y las filas cuyo resultado depende de las lecturas siguientes se retienen
+    hasta el siguiente trozo, de modo que la memoria no depende del tamaño de la serie.
+
+    Args:
+        trozos: Iterable de diccionarios {nombre de columna: arreglo}
+        reglas: Reglas de validación por columna
+
+    Returns:
+        Para cada trozo, diccionario de columnas limpias de las filas ya definitivas (puede estar vacío)
+    """
+    contexto = max(regla['repeticiones'] for regla in reglas.values()) + 1
+    anteriores = None       #Filas ya entregadas que sirven de contexto
+    pendientes = None       #Filas que todavía no se entregan
+
+    for trozo in trozos:
+        trozo = {nombre: np.asarray(x, dtype=float) for nombre, x in trozo.items()}
+        if anteriores is None:
+            anteriores = {nombre: x[:0] for nombre, x in trozo.items()}
+            pendientes = anteriores
+        ventana = {nombre: np.concatenate((anteriores[nombre], pendientes[nombre], x)) for nombre, x in trozo.items()}
+        limpios, _ = validar(ventana, reglas)
+
+        inicio = len(anteriores[next(iter(ventana))])
+        fin = max(_pendientes(ventana, reglas), inicio)
+        yield {nombre: x[inicio:fin] for nombre, x in limpios.items()}
+
+        anteriores = {nombre: x[max(fin - contexto, 0):fin] for nombre, x in ventana.items()}
+        pendientes = {nombre: x[fin:] for nombre, x in ventana.items()}
+
+    if pendientes is not None:
+        ventana = {nombre: np.concatenate((anteriores[nombre], pendientes[nombre])) for nombre in pendientes}
+        limpios, _ = validar(ventana, reglas)
+        inicio = len(anteriores[next(iter(ventana))])
+        yield {nombre: x[inicio:] for nombre, x in limpios.items()}
+
+def resumen(mascaras: dict) -> dict:
+    """
+    Retorna el número de datos marcados por columna y tipo de máscara.
+    """
+    return {nombre: {tipo: int(m.sum()) for tipo, m in columna.items()}
+            for nombre, columna in mascaras.items()}
+
+def procesar(TBS, RH, P, reglas: dict = REGLAS, precision: str = 'estandar') -> tuple:
+    """
+    Valida los datos de una estación y calcula las variables psicrométricas en una sola pasada.
+
+    Args:
+        TBS: Temperatura de bulbo seco en °C
+        RH: Humedad relativa en porcentaje
+        P: Presión atmosférica en hPa
+        reglas: Reglas de validación por columna
+        precision: Nivel de precisión (llave de variables_psicrometricas_np.PRECISIONES)
+
+    Returns:
+        Diccionario de arreglos con las variables psicrométricas (NaN en las filas inválidas)
+        Diccionario de máscaras por columna
+    """
+    limpios, m = validar({'TBS': TBS, 'RH': RH, 'P': P}, reglas)
+    resultados = vpn.propiedades(limpios['TBS'], limpios['RH']/100, limpios['P']/10, precision=precision)
+
+    return resultados, m
@@ -42,6 +42,11 @@ TOLERANCIA = 0.001      #Tolerancia para NR
 MIN_HUM_RATIO = 1E-7    #Valor mínimo que puede tener la razón de humedad
 MAX_ITER = 100          #Máximo numero de iteraciones para NR
 
+#Coeficientes de la presión de vapor a saturación sobre hielo (-100 a 0 °C) y sobre agua (0 a 200 °C),
+#compartidos con variables_psicrometricas_np.py
+A_HIELO = (-5.6745359e03, 6.3925247, -9.677843e-03, 6.2215701e-07, 2.0747825e-09, -9.484024e-13, 4.1635019)
+A_AGUA = (-5.8002206e03, 1.3914993, -4.8640239e-02, 4.1764768e-05, -1.4452093e-08, 0.0, 6.5459673)
+
 def pres_atm_temp(Z: float) -> float:
     """
     Retorna la presión atmosferica y la temperatura  teniendo como dato
@@ -54,10 +59,10 @@ def pres_atm_temp(Z: float) -> float:
         Presión atmosférica en kPa
         Temperatura en °C
     """
-    Z = 101.325 * (1 - 2.25577e-05 * Z)**(5.2559)
+    P_atm = 101.325 * (1 - 2.25577e-05 * Z)**(5.2559)
     temp = 15-0.0065*Z
-    
-    return Z, temp
+
+    return P_atm, temp
 
 def pres_vapor_sat(tbs: float) -> float:
     """
@@ -68,35 +73,19 @@ def pres_vapor_sat(tbs: float) -> float:
         tbs: temperatura de bulbo seco en °C
     
     Returns:
-        Presión de vapor a saturación en Pa
+        Presión de vapor a saturación en kPa
     """
     if tbs >= -100 and tbs <= 0:
-        A1 = -5.6745359e03 
-        A2 = 6.3925247
-        A3 = -9.677843e-03
-        A4 = 6.2215701e-07
-        A5 = 2.0747825e-09
-        A6 = -9.484024e-13
-        A7 = 4.1635019
-
-        tbs += 273.15
-
-        PresVapSat = math.exp((A1/tbs) + A2+ A3*tbs + A4*tbs**2 + A5*tbs**3 + A6*tbs**4 + A7*math.log(tbs))
-        return PresVapSat
-
+        A1, A2, A3, A4, A5, A6, A7 = A_HIELO
     elif tbs > 0 and tbs <= 200:
-        A1 = -5.8002206e03 
-        A2 = 1.3914993
-        A3 = -4.8640239e-02
-        A4 = 4.1764768e-05
-        A5 = -1.4452093e-08
-        A6 = 0.0
-        A7 = 6.5459673
+        A1, A2, A3, A4, A5, A6, A7 = A_AGUA
+    else:
+        return None
 
-        tbs += 273.15
+    tbs += 273.15
 
-        PresVapSat = (math.exp((A1/tbs) + A2 + A3*tbs + A4*tbs**2 + A5*tbs**3 + A6*tbs**4 + A7*math.log(tbs)))/1000
-        return PresVapSat
+    PresVapSat = (math.exp((A1/tbs) + A2 + A3*tbs + A4*tbs**2 + A5*tbs**3 + A6*tbs**4 + A7*math.log(tbs)))/1000
+    return PresVapSat
 
 def presion_vapor(RH: float, tbs: float) -> float:
     """
@@ -128,10 +117,7 @@ def razon_hum_saturacion(P_atm: float, tbs: float) -> float:
     Returns:
         Razón de humedad a saturación en kg_agua/kg_aire
     """
-    pvs = pres_vapor_sat(tbs)
-    Ws = 0.62198 * pvs / (P_atm - pvs)
-
-    return Ws
+    return razon_hum_presion(P_atm, pres_vapor_sat(tbs))
 
 def razon_humedad(tbs: float, RH: float, P_atm: float) -> float:
     """
@@ -146,10 +132,21 @@ def razon_humedad(tbs: float, RH: float, P_atm: float) -> float:
     Returns:
         Razón de humedad en kg_agua/kg_aire
     """
-    pv = presion_vapor(RH, tbs)
-    W = 0.62198 * pv / (P_atm-pv)
+    return razon_hum_presion(P_atm, presion_vapor(RH, tbs))
 
-    return W
+def razon_hum_presion(P_atm: float, pv: float) -> float:
+    """
+    Retorna la razón de humedad teniendo la presión atmosférica y la presión parcial de vapor
+    (la razón de humedad a saturación si se da la presión de vapor a saturación).
+
+    Args:
+        P_atm: Presión atmosférica en kPa
+        pv: Presión parcial de vapor de agua en kPa
+
+    Returns:
+        Razón de humedad en kg_agua/kg_aire
+    """
+    return 0.62198 * pv / (P_atm - pv)
 
 def grado_saturacion(W: float, Ws: float) -> float:
     """
@@ -195,19 +192,31 @@ def temp_punto_rocio(T: float, Pv: float) -> float:
 
 def entalpia(T: float, RH: float, P_atm: float) -> float:
     """
-    Retorna la entalpía teniendo la temperatura de bulbo seco
+    Retorna la entalpía teniendo la temperatura de bulbo seco, la humedad relativa
+    y la presión atmosférica.
 
     Args:
         T: Temperatura de bulbo seco en °C
-        W: Razón de humedad del aire
+        RH: Humedad relativa en fracción
+        P_atm: Presión atmosférica en kPa
     
     Returns:
         Entalpía kJ/kg
     """
-    W = razon_humedad(T,RH,P_atm)
-    h = 1.006*T + W*(2501+1.805*T)
+    return entalpia_W(T, razon_humedad(T, RH, P_atm))
 
-    return h
+def entalpia_W(T: float, W: float) -> float:
+    """
+    Retorna la entalpía teniendo la temperatura de bulbo seco y la razón de humedad.
+
+    Args:
+        T: Temperatura de bulbo seco en °C
+        W: Razón de humedad del aire
+
+    Returns:
+        Entalpía kJ/kg
+    """
+    return 1.006*T + W*(2501+1.805*T)
 
 def temp_bulbo_humedo1(t: float, RH: float) -> float:
     RH *= 100
@@ -316,9 +325,12 @@ def dLnPws(tbs: float) -> float:
         Derivada del logaritmo natural de la presión de vapor a saturación en Pa
     """
     T = tbs + 273.15
-    if tbs <= 0.01:
-        _dLnPws = 5.6745359E+03 / T**2 - 9.677843E-03 + 2 * 6.2215701E-07 * T + 3 * 2.0747825E-09 * T**2 - 4 * 9.484024E-13 * T**3 + 4.1635019 / T
-    else:
-        _dLnPws = 5.8002206E+03 / T**2 - 4.8640239E-02 + 2 * 4.1764768E-05 * T - 3 * 1.4452093E-08 * T**2 + 6.5459673 / T
+    A1, _, A3, A4, A5, A6, A7 = A_HIELO if tbs <= 0 else A_AGUA
+    _dLnPws = -A1 / T**2 + A3 + 2 * A4 * T + 3 * A5 * T**2 + 4 * A6 * T**3 + A7 / T
+
+    return _dLnPws
 
-    return _dLnPws
\ No newline at end of file
+if __name__ == "__main__":
+    import sys
+    from linea_comandos import main
+    sys.exit(main())
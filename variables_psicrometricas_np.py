@@ -0,0 +1,445 @@
+""" variables_psicrometricas_np.py
+
+Versión con arreglos de NumPy de las funciones de variables_psicrometricas.py. Cada función recibe
+escalares o arreglos de cualquier dimensión (se aplican las reglas de broadcasting de NumPy) y
+regresa arreglos. El parámetro opcional out permite escribir el resultado en un arreglo preasignado,
+por ejemplo una vista de un campo más grande (ver campos.py).
+
+A diferencia de la versión escalar, las funciones no lanzan excepciones ni regresan None cuando un
+dato está fuera del rango de las correlaciones: el resultado de ese elemento es NaN y el NaN se
+propaga por todas las funciones que dependen de él. De esta forma un archivo completo se procesa
+en una sola pasada aunque contenga datos inválidos.
+
+Example
+    >>> import numpy as np
+    >>> import variables_psicrometricas_np as vpn
+    >>> vpn.temp_bulbo_humedo(np.array([20, 25]), np.array([0.5, 1.5]), 101.325)
+    array([13.78345724,         nan])
+"""
+
+import numpy as np
+
+from variables_psicrometricas import Ra, TOLERANCIA, MIN_HUM_RATIO, MAX_ITER, A_HIELO, A_AGUA
+
+#Columnas que regresa propiedades()
+COLUMNAS = ('PVS', 'PV', 'WS', 'W', 'MU', 'VEH', 'TPR', 'H', 'TBH')
+
+#Niveles de precisión: método de TBH, tolerancia, máximo de iteraciones y método de TPR.
+#Error absoluto (°C) contra 'referencia' y rendimiento de propiedades() medidos con
+#`python regresion.py --precisiones` (-10 a 45 °C, 2 a 100 %, 70 a 101.325 kPa):
+#                 TBH máx   TBH p99   TPR máx   TPR p99   estados/s
+#    rapida         0.78    0.0009      6.9       1.8       1.5 M
+#    estandar       0.79    0.009       6.9       1.8       0.48 M
+#    referencia     0         0         0         0         0.14 M
+#El error máximo de TPR es de la correlación de ASHRAE, que elige la rama de hielo o agua con tbs
+#y no con el punto de rocío; como la TPR es el límite inferior de la bisección, también limita la
+#TBH 'estandar'. El máximo de 'rapida' ocurre con TBH cerca de 0 °C, donde razon_humedad_TBH cambia
+#de fórmula (agua/hielo).
+PRECISIONES = {
+    'rapida': {'TBH': 'empirica', 'tolerancia': None, 'max_iter': 2, 'TPR': 'correlacion'},
+    'estandar': {'TBH': 'biseccion', 'tolerancia': TOLERANCIA, 'max_iter': MAX_ITER, 'TPR': 'correlacion'},
+    'referencia': {'TBH': 'newton', 'tolerancia': 1e-9, 'max_iter': 20, 'TPR': 'exacta'},
+}
+
+def _arreglo(x) -> np.ndarray:
+    return np.asarray(x, dtype=float)
+
+def _salida(valor: np.ndarray, out) -> np.ndarray:
+    """
+    Escribe el resultado en el arreglo preasignado out (si se da) y lo retorna.
+    """
+    if out is None:
+        return valor
+    out[...] = valor
+    return out
+
+def pres_vapor_sat(tbs, out=None) -> np.ndarray:
+    """
+    Retorna la presión de vapor a saturacion teniendo como dato
+    la temperatura de bulbo seco. Fuera del rango [-100, 200] °C el resultado es NaN.
+
+    Args:
+        tbs: temperatura de bulbo seco en °C
+        out: Arreglo preasignado donde se escribe el resultado (opcional)
+
+    Returns:
+        Presión de vapor a saturación en kPa
+    """
+    tbs = _arreglo(tbs)
+    hielo = tbs <= 0
+    A1, A2, A3, A4, A5, A6, A7 = (np.where(hielo, a_h, a_a) for a_h, a_a in zip(A_HIELO, A_AGUA))
+    T = tbs + 273.15
+
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        PresVapSat = np.exp(A1/T + A2 + A3*T + A4*T**2 + A5*T**3 + A6*T**4 + A7*np.log(T))/1000
+
+    return _salida(np.where((tbs >= -100) & (tbs <= 200), PresVapSat, np.nan), out)
+
+def presion_vapor(RH, tbs, out=None) -> np.ndarray:
+    """
+    Retorna la presión parcial de vapor de agua en función de
+    temperatura de bulbo seco y la humedad relativa. Si RH está fuera de [0, 1] el resultado es NaN.
+
+    Args:
+        RH: Humedad relativa en fracción
+        tbs: temperatura de bulbo seco en °C
+        out: Arreglo preasignado donde se escribe el resultado (opcional)
+
+    Returns:
+        Presión parcial de vapor de agua en kPa
+    """
+    RH = _arreglo(RH)
+    RH = np.where((RH >= 0) & (RH <= 1), RH, np.nan)
+    return _salida(RH * pres_vapor_sat(tbs), out)
+
+def razon_hum_saturacion(P_atm, tbs, out=None) -> np.ndarray:
+    """
+    Retorna la razón de humedad del aire a saturacion teniendo la temperatura
+    de bulbo seco y la presión atmosférica.
+
+    Args:
+        P_atm: Presión atmosférica en kPa
+        tbs: temperatura de bulbo seco °C
+        out: Arreglo preasignado donde se escribe el resultado (opcional)
+
+    Returns:
+        Razón de humedad a saturación en kg_agua/kg_aire
+    """
+    pvs = pres_vapor_sat(tbs)
+    return _salida(0.62198 * pvs / (_arreglo(P_atm) - pvs), out)
+
+def razon_humedad(tbs, RH, P_atm, out=None) -> np.ndarray:
+    """
+    Retorna la razón de humedad del aire teniendo la temperatura de bulbo seco
+    la humedad relativa y la presión atmosférica.
+
+    Args:
+        tbs: temperatura de bulbo seco °C
+        RH: Humedad relativa en fracción
+        P_atm: Presión atmosférica en kPa
+        out: Arreglo preasignado donde se escribe el resultado (opcional)
+
+    Returns:
+        Razón de humedad en kg_agua/kg_aire
+    """
+    pv = presion_vapor(RH, tbs)
+    return _salida(0.62198 * pv / (_arreglo(P_atm) - pv), out)
+
+def grado_saturacion(W, Ws, out=None) -> np.ndarray:
+    """
+    Retorna el grado de saturación (W/Ws).
+
+    Args:
+        W: Razón de humedad del aire
+        Ws: Razón de humedad del aire a saturacion
+        out: Arreglo preasignado donde se escribe el resultado (opcional)
+
+    Returns:
+        Grado de saturación en unidades arbitrarias
+    """
+    return _salida(_arreglo(W)/_arreglo(Ws), out)
+
+def vol_esp_aire_humedo(T, W, P, out=None) -> np.ndarray:
+    """
+    Retorna el volumen específico de aire humedo teniendo la temperatura de bulbo seco,
+    la razón de humedad y la presión.
+
+    Args:
+        T: Temperatura de bulbo seco en °C
+        W: Razón de humedad del aire
+        P: Presión atmosférica en kPa
+        out: Arreglo preasignado donde se escribe el resultado (opcional)
+
+    Returns:
+        Volumen específico de aire humedo en m³/kg_aire humedo
+    """
+    W = _arreglo(W)
+    return _salida((Ra * (_arreglo(T) + 273.15) / (_arreglo(P)*1000)) * ((1 + 1.6078*W)/(1 + W)), out)
+
+def _precision(precision: str) -> dict:
+    try:
+        return PRECISIONES[precision]
+    except KeyError:
+        raise ValueError(f"Precisión no soportada: {precision}") from None
+
+def temp_punto_rocio(T, Pv, out=None, precision: str = 'estandar') -> np.ndarray:
+    """
+    Retorna la temperatura de punto de rocío a partir de la presión de vapor. Fuera del rango
+    (-60, 70) °C o con presión de vapor no positiva el resultado es NaN.
+
+    Args:
+        T: Temperatura de bulbo seco en °C
+        Pv: Presión de vapor en kPa
+        out: Arreglo preasignado donde se escribe el resultado (opcional)
+        precision: 'rapida' o 'estandar' (correlación de ASHRAE) o 'referencia' (se resuelve
+                   pres_vapor_sat(tpr) = Pv con Newton-Raphson a partir de la correlación)
+
+    Returns:
+        Temperatura de punto de rocío en °C
+    """
+    T = _arreglo(T)
+    Pv = _arreglo(Pv)
+    nivel = _precision(precision)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        lnPv = np.log(np.where(Pv > 0, Pv*1000, np.nan))
+    hielo = -60.450 + 7.0322*lnPv + 0.3700*lnPv**2
+    agua = -35.957 - 1.8726*lnPv + 1.1689*lnPv**2
+    tpr = np.where((T > -60) & (T <= 0), hielo, np.where((T > 0) & (T < 70), agua, np.nan))
+
+    if nivel['TPR'] == 'exacta':
+        lnPv -= np.log(1000)
+        for _ in range(nivel['max_iter']):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                paso = (np.log(pres_vapor_sat(tpr)) - lnPv) / dLnPws(tpr)
+            tpr = np.minimum(tpr - paso, T)
+            if not (np.abs(paso) > nivel['tolerancia']).any():
+                break
+
+    return _salida(tpr, out)
+
+def entalpia(T, RH, P_atm, out=None) -> np.ndarray:
+    """
+    Retorna la entalpía teniendo la temperatura de bulbo seco, la humedad relativa
+    y la presión atmosférica.
+
+    Args:
+        T: Temperatura de bulbo seco en °C
+        RH: Humedad relativa en fracción
+        P_atm: Presión atmosférica en kPa
+        out: Arreglo preasignado donde se escribe el resultado (opcional)
+
+    Returns:
+        Entalpía kJ/kg
+    """
+    return entalpia_W(T, razon_humedad(T, RH, P_atm), out)
+
+def entalpia_W(T, W, out=None) -> np.ndarray:
+    """
+    Retorna la entalpía teniendo la temperatura de bulbo seco y la razón de humedad.
+
+    Args:
+        T: Temperatura de bulbo seco en °C
+        W: Razón de humedad del aire
+        out: Arreglo preasignado donde se escribe el resultado (opcional)
+
+    Returns:
+        Entalpía kJ/kg
+    """
+    T = _arreglo(T)
+    return _salida(1.006*T + _arreglo(W)*(2501 + 1.805*T), out)
+
+def temp_bulbo_humedo1(t, RH, out=None) -> np.ndarray:
+    """
+    Retorna la temperatura de bulbo humedo aproximada con la fórmula empírica (sin iteraciones)
+    en función de la temperatura de bulbo seco y la humedad relativa.
+
+    Args:
+        t: Temperatura de bulbo seco en °C
+        RH: Humedad relativa en fracción
+        out: Arreglo preasignado donde se escribe el resultado (opcional)
+
+    Returns:
+        Temperatura de bulbo humedo en °C
+    """
+    t = _arreglo(t)
+    RH = _arreglo(RH)*100
+    with np.errstate(invalid='ignore'):
+        tbh = t*np.arctan(0.151977*(RH + 8.313659)**0.5) + np.arctan(t + RH) \
+              - np.arctan(RH - 1.676331) + 0.00391838*RH**1.5 * np.arctan(0.023101*RH) - 4.686035
+    return _salida(tbh, out)
+
+def razon_humedad_TBH(tbs, tbh, P_atm, out=None) -> np.ndarray:
+    """
+    Retorna la razón de humedad a la temperatura de bulbo humedo teniendo la temperatura de bulbo seco,
+    temperatura de bulbo humedo y la presión. Si tbh > tbs el resultado es NaN.
+
+    Args:
+        tbs: Temperatura de bulbo seco en °C
+        tbh: Temperatura de bulbo humedo en °C
+        P_atm: Presión atmosférica en kPa
+        out: Arreglo preasignado donde se escribe el resultado (opcional)
+
+    Returns:
+        Razón de humedad en kg_agua/kg_aire
+    """
+    tbs = _arreglo(tbs)
+    tbh = _arreglo(tbh)
+    Ws = razon_hum_saturacion(P_atm, tbh)
+
+    agua = ((2501. - 2.326*tbh)*Ws - 1.006*(tbs - tbh)) / (2501. + 1.86*tbs - 4.186*tbh)
+    hielo = ((2830. - 0.24*tbh)*Ws - 1.006*(tbs - tbh)) / (2830. + 1.86*tbs - 2.1*tbh)
+    W = np.maximum(np.where(tbh >= 0, agua, hielo), MIN_HUM_RATIO)
+
+    return _salida(np.where(tbh <= tbs, W, np.nan), out)
+
+def _razon_humedad_TBH_derivadas(tbs, tbh, P_atm) -> tuple:
+    """
+    Retorna las derivadas de la razón de humedad a la temperatura de bulbo humedo (sin el límite
+    MIN_HUM_RATIO) respecto a tbh, tbs y P_atm.
+    """
+    pvs = pres_vapor_sat(tbh)
+    Ws = 0.62198 * pvs / (P_atm - pvs)
+    dWs_dtbh = 0.62198 * P_atm / (P_atm - pvs)**2 * pvs * dLnPws(tbh)
+    dWs_dP = -0.62198 * pvs / (P_atm - pvs)**2
+
+    #Coeficientes (a - b*tbh, a + 1.86*tbs - c*tbh) sobre agua y sobre hielo
+    agua = tbh >= 0
+    a = np.where(agua, 2501., 2830.)
+    b = np.where(agua, 2.326, 0.24)
+    c = np.where(agua, 4.186, 2.1)
+    N = (a - b*tbh)*Ws - 1.006*(tbs - tbh)
+    D = a + 1.86*tbs - c*tbh
+
+    d_tbh = ((-b*Ws + (a - b*tbh)*dWs_dtbh + 1.006)*D + c*N) / D**2
+    d_tbs = (-1.006*D - 1.86*N) / D**2
+    d_P = (a - b*tbh)*dWs_dP / D
+    return d_tbh, d_tbs, d_P
+
+def _newton_tbh(tbs, tbh, W, P_atm, inferior, superior, tolerancia, max_iter) -> np.ndarray:
+    """
+    Refina tbh con Newton-Raphson sobre razon_humedad_TBH(tbs, tbh, P_atm) = W, sin salir del
+    intervalo [inferior, superior].
+    """
+    for _ in range(max_iter):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            paso = (razon_humedad_TBH(tbs, tbh, P_atm) - W) / _razon_humedad_TBH_derivadas(tbs, tbh, P_atm)[0]
+        paso = np.where(np.isfinite(paso), paso, 0)
+        tbh = np.clip(tbh - paso, inferior, superior)
+        if tolerancia is not None and not (np.abs(paso) > tolerancia).any():
+            break
+    return tbh
+
+def temp_bulbo_humedo(tbs, RH, P_atm, out=None, precision: str = 'estandar') -> np.ndarray:
+    """
+    Retorna la temperatura de bulbo humedo teniendo la temperatura de bulbo seco,
+    la humedad relativa y la presión atmosférica. Con la precisión 'estandar' se usa el mismo
+    método de bisección que la versión escalar, aplicado a todos los elementos a la vez; los
+    elementos que ya convergieron dejan de actualizarse.
+
+    Args:
+        tbs: Temperatura de bulbo seco en °C
+        RH: Humedad relativa en fracción
+        P_atm: Presión atmosférica en kPa
+        out: Arreglo preasignado donde se escribe el resultado (opcional)
+        precision: 'rapida' (fórmula empírica y dos pasos de Newton-Raphson para corregir la
+                   presión), 'estandar' (bisección con TOLERANCIA) o 'referencia' (bisección
+                   seguida de Newton-Raphson hasta 1e-9 °C)
+
+    Returns:
+        Temperatura de bulbo humedo en °C
+    """
+    tbs, RH, P_atm = np.broadcast_arrays(_arreglo(tbs), _arreglo(RH), _arreglo(P_atm))
+    nivel = _precision(precision)
+
+    W = razon_humedad(tbs, RH, P_atm)
+    W = np.where(W >= 0, W, np.nan)
+    lim_W = np.maximum(W, MIN_HUM_RATIO)
+
+    #Valores iniciales, la temperatura de punto de rocio es el limite inferior
+    tbh_inf = temp_punto_rocio(tbs, presion_vapor(RH, tbs), precision=precision)
+    tbh_inf = np.where(np.isnan(lim_W), np.nan, tbh_inf)
+    tbh_sup = np.where(np.isnan(tbh_inf), np.nan, tbs)
+
+    if nivel['TBH'] == 'empirica':
+        #La correlación de TPR no es un límite inferior seguro cerca de saturación, solo se usa tbs
+        inferior = np.where(np.isnan(tbh_inf), np.nan, -100)
+        tbh = np.clip(temp_bulbo_humedo1(tbs, RH), inferior, tbh_sup)
+        return _salida(_newton_tbh(tbs, tbh, lim_W, P_atm, inferior, tbh_sup, None, nivel['max_iter']), out)
+
+    tolerancia = max(nivel['tolerancia'], TOLERANCIA)
+    tbh = (tbh_inf + tbh_sup)/2
+
+    for _ in range(MAX_ITER):
+        activo = (tbh_sup - tbh_inf) > tolerancia
+        if not activo.any():
+            break
+        W_inicial = razon_humedad_TBH(tbs, tbh, P_atm)
+
+        #Obtener nuevos limites
+        mayor = W_inicial > lim_W
+        tbh_sup = np.where(activo & mayor, tbh, tbh_sup)
+        tbh_inf = np.where(activo & ~mayor, tbh, tbh_inf)
+        tbh = np.where(activo, (tbh_sup + tbh_inf)/2, tbh)
+    else:
+        #Los elementos que no convergieron se marcan como NaN
+        tbh = np.where((tbh_sup - tbh_inf) > tolerancia, np.nan, tbh)
+
+    if nivel['TBH'] == 'newton':
+        tbh = _newton_tbh(tbs, tbh, lim_W, P_atm, tbh_inf, tbh_sup, nivel['tolerancia'], nivel['max_iter'])
+
+    return _salida(tbh, out)
+
+def razon_hum_entalpia(T, h, out=None) -> np.ndarray:
+    """
+    Retorna la razón de humedad teniendo la temperatura de bulbo seco y la entalpía
+
+    Args:
+        T: Temperatura de bulbo seco en °C
+        h: Entalpía en kJ/kg
+        out: Arreglo preasignado donde se escribe el resultado (opcional)
+
+    Returns:
+        Razón de humedad
+    """
+    T = _arreglo(T)
+    return _salida((_arreglo(h) - 1.006*T) / (2501 + 1.805*T), out)
+
+def dLnPws(tbs, out=None) -> np.ndarray:
+    """
+    Función auxiliar que retorna la derivada del logaritmo natural de la presión de vapor a saturación
+    en función de la temperatura de bulbo seco.
+
+    Args:
+        tbs: Temperatura de bulbo seco en °C
+        out: Arreglo preasignado donde se escribe el resultado (opcional)
+
+    Returns:
+        Derivada del logaritmo natural de la presión de vapor a saturación en 1/K
+    """
+    tbs = _arreglo(tbs)
+    T = tbs + 273.15
+    hielo = -A_HIELO[0]/T**2 + A_HIELO[2] + 2*A_HIELO[3]*T + 3*A_HIELO[4]*T**2 + 4*A_HIELO[5]*T**3 + A_HIELO[6]/T
+    agua = -A_AGUA[0]/T**2 + A_AGUA[2] + 2*A_AGUA[3]*T + 3*A_AGUA[4]*T**2 + A_AGUA[6]/T
+
+    #Misma rama que pres_vapor_sat (hielo con tbs <= 0), para que sea su derivada en 0 < tbs <= 0.01
+    return _salida(np.where(tbs <= 0, hielo, agua), out)
+
+def propiedades(tbs, RH, P_atm, columnas: tuple = COLUMNAS, out: dict = None, precision: str = 'estandar') -> dict:
+    """
+    Retorna las variables psicrométricas de un conjunto de estados en una sola pasada,
+    calculando una sola vez los resultados intermedios que comparten.
+
+    Args:
+        tbs: Temperatura de bulbo seco en °C
+        RH: Humedad relativa en fracción
+        P_atm: Presión atmosférica en kPa
+        columnas: Variables a calcular (subconjunto de COLUMNAS); TBH solo se calcula si se pide
+        out: Diccionario {columna: arreglo preasignado} donde se escriben los resultados (opcional)
+        precision: Nivel de precisión de TPR y TBH (llave de PRECISIONES)
+
+    Returns:
+        Diccionario de arreglos con las llaves de columnas
+    """
+    tbs, RH, P_atm = np.broadcast_arrays(_arreglo(tbs), _arreglo(RH), _arreglo(P_atm))
+    _precision(precision)
+    out = out or {}
+
+    pvs = pres_vapor_sat(tbs)
+    pv = np.where((RH >= 0) & (RH <= 1), RH, np.nan) * pvs
+    ws = 0.62198 * pvs / (P_atm - pvs)
+    w = 0.62198 * pv / (P_atm - pv)
+
+    calculos = {
+        'PVS': lambda: pvs,
+        'PV': lambda: pv,
+        'WS': lambda: ws,
+        'W': lambda: w,
+        'MU': lambda: w/ws,
+        'VEH': lambda: vol_esp_aire_humedo(tbs, w, P_atm),
+        'TPR': lambda: temp_punto_rocio(tbs, pv, precision=precision),
+        'H': lambda: entalpia_W(tbs, w),
+        'TBH': lambda: temp_bulbo_humedo(tbs, RH, P_atm, precision=precision),
+    }
+
+    return {columna: _salida(calculos[columna](), out.get(columna)) for columna in columnas}
@@ -1,8 +1,7 @@
 import variables_psicrometricas as vp
 import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
+import carta
 
 #Altitud en metros
 Z = 2250
@@ -71,12 +70,6 @@ df = pd.DataFrame(dict)
 df.to_csv("VP.csv",index=False)
 
 ############################## Carta Psicrometrica #################################
-tbs_array = np.arange(5, 45, 0.1)       #Vector para temperatura de bulbo seco
-RH_array = np.arange(0, 1.1, 0.1)       #Vector para Humedad relativa
-tbh_array = np.arange(-10, 46, 2)       #Vector para temperatura de bulbo humedo    
-entalpia_array = np.arange(0, 100, 5)   #Vector de entalpias 
-pathc = []
-
 with open("VP.csv", "r", newline="") as file:
     next(file) # Eliminar cabecera
     #Se asigna cada columna de datos para obtener una tupla con la funcion ZIP 
@@ -85,59 +78,10 @@ with open("VP.csv", "r", newline="") as file:
 
 #Convertir tupla a lista para operar con  los datos
 TBS = list(TBS)
-RH = list(RH)
 W1 = list(W)
-RH_d = RH.copy()
-
-for i in range(len(RH_d)):
-    RH_d[i] /= 100
 
+#Se dibuja la carta a la presión de la altitud Z con los datos TBS y W
 _, ax = plt.subplots()
-
-for rh in RH_array:
-    W_array = []
-    for tbs in tbs_array:         
-        W = vp.razon_humedad(tbs,rh,P_atm)
-        W_array.append(W)
-    ax.plot(tbs_array, W_array, 'k')
-
-
-for tbh in tbh_array:
-    W_array = []
-    tbs_plot = []
-    for tbs in tbs_array:
-        if tbh <= tbs:
-            W = vp.razon_humedad_TBH(tbs,tbh,P_atm)
-            W_array.append(W)
-            tbs_plot.append(tbs) 
-    ax.plot(tbs_plot, W_array, 'b')
-
-for h in entalpia_array:
-    W_array = []
-    for tbs in tbs_array:
-        W = vp.razon_hum_entalpia(tbs,h)
-        W_array.append(W)
-    ax.plot(tbs_array, W_array, 'g')
-
-ax.vlines([5,10,15,20,25,30,35], ymin= 0, ymax= W_array[9], color='purple') 
-
-ax.plot(TBS, W1, 'x', color="r", label="Datos")
-
-black_patch = mpatches.Patch(color='k', label='Humedad relativa')
-pathc.append(black_patch)
-blue_patch = mpatches.Patch(color='blue', label='Lineas de saturación')
-pathc.append(blue_patch)
-green_patch = mpatches.Patch(color='green', label='Entalpía')
-pathc.append(green_patch)
-purple_patch = mpatches.Patch(color='purple', label='Temp bulbo seco')
-pathc.append(purple_patch)
-red_patch = mpatches.Patch(color='red', label='Datos')
-pathc.append(red_patch)
-
-ax.set(ylim=(0, 0.025), xlim=(5, 40), ylabel=r"Razón de humedad [$kg_{agua}/kg_{aire}$]", xlabel="Temperatura de bulbo seco[°C]")
-ax.yaxis.tick_right()
-ax.yaxis.set_label_position('right')
-plt.title("Carta Psicrométrica")
+carta.dibujar(ax, carta.geometria(P_atm), TBS, W1, xlim=(5, 40))
 plt.tight_layout()
-plt.legend(handles=pathc)
-plt.show()
\ No newline at end of file
+plt.show()
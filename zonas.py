@@ -0,0 +1,165 @@
+""" zonas.py
+
+Clasificación vectorizada de estados psicrométricos (puntos de la carta) en zonas como confort
+ASHRAE, ventana objetivo de invernadero, riesgo de condensación o enfriamiento evaporativo.
+
+Una zona es un diccionario con su nombre, un color para la carta y una de dos definiciones:
+
+    -poligono: lista de vértices (x, y) en el plano de las variables de 'ejes' (por defecto
+     ('tbs', 'W'), es decir, la carta psicrométrica)
+    -restricciones: diccionario {variable: (mínimo, máximo)} con las variables 'tbs' (°C),
+     'W' (kg_agua/kg_aire), 'RH' (fracción) y 'H' (kJ/kg); None significa sin límite
+
+La clasificación evalúa cada zona sobre todos los puntos a la vez (un ciclo por arista del
+polígono, no por punto), por lo que se pueden clasificar millones de observaciones de una sola vez.
+
+Example
+    >>> import zonas
+    >>> ids = zonas.clasificar(TBS, W, P_atm=77.9)
+    >>> zonas.horas_por_zona(TBS, W, P_atm=77.9, intervalo=10/60)
+    {'Riesgo de condensación': 79.2, 'Confort ASHRAE': 460.3, ...}
+"""
+
+import numpy as np
+
+import variables_psicrometricas_np as vpn
+
+#Zonas por defecto. El orden define la prioridad cuando un punto pertenece a varias zonas
+ZONAS = [
+    {'nombre': 'Riesgo de condensación', 'color': 'tab:blue',
+     'restricciones': {'RH': (0.9, None)}},
+    {'nombre': 'Confort ASHRAE', 'color': 'tab:green',
+     'poligono': [(20.5, 0.0), (27.0, 0.0), (26.0, 0.012), (19.5, 0.012)]},
+    {'nombre': 'Invernadero', 'color': 'tab:olive',
+     'restricciones': {'tbs': (18, 30), 'RH': (0.6, 0.85)}},
+    {'nombre': 'Enfriamiento evaporativo', 'color': 'tab:orange',
+     'restricciones': {'tbs': (24, None), 'W': (None, 0.010)}},
+]
+
+def variables(tbs, W, P_atm) -> dict:
+    """
+    Retorna las variables de la carta que usan las zonas a partir de tbs, W y la presión.
+
+    Args:
+        tbs: Temperatura de bulbo seco en °C
+        W: Razón de humedad en kg_agua/kg_aire
+        P_atm: Presión atmosférica en kPa
+
+    Returns:
+        Diccionario con las llaves 'tbs', 'W', 'RH' y 'H'
+    """
+    tbs = np.asarray(tbs, dtype=float)
+    W = np.asarray(W, dtype=float)
+    pv = np.asarray(P_atm, dtype=float) * W / (0.62198 + W)
+
+    return {
+        'tbs': tbs,
+        'W': W,
+        'RH': pv / vpn.pres_vapor_sat(tbs),
+        'H': vpn.entalpia_W(tbs, W),
+    }
+
+def dentro_poligono(x, y, poligono) -> np.ndarray:
+    """
+    Retorna un arreglo booleano que indica qué puntos (x, y) están dentro del polígono,
+    con el método de cruce de rayos aplicado a todos los puntos por cada arista.
+
+    Args:
+        x: Coordenadas x de los puntos
+        y: Coordenadas y de los puntos
+        poligono: Lista de vértices (x, y)
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    dentro = np.zeros(np.broadcast_shapes(x.shape, y.shape), dtype=bool)
+
+    vertices = np.asarray(poligono, dtype=float)
+    for (x1, y1), (x2, y2) in zip(vertices, np.roll(vertices, -1, axis=0)):
+        if y1 == y2:
+            continue
+        cruza = ((y1 > y) != (y2 > y)) & (x < (x2 - x1)*(y - y1)/(y2 - y1) + x1)
+        dentro ^= cruza
+
+    return dentro
+
+def pertenencia(datos: dict, zona: dict) -> np.ndarray:
+    """
+    Retorna un arreglo booleano que indica qué puntos pertenecen a la zona.
+
+    Args:
+        datos: Diccionario de variables (ver variables())
+        zona: Definición de la zona
+    """
+    if 'poligono' in zona:
+        x, y = zona.get('ejes', ('tbs', 'W'))
+        return dentro_poligono(datos[x], datos[y], zona['poligono'])
+
+    forma = np.broadcast_shapes(*(np.shape(v) for v in datos.values()))
+    mascara = np.ones(forma, dtype=bool)
+    for variable, (minimo, maximo) in zona['restricciones'].items():
+        if minimo is not None:
+            mascara &= datos[variable] >= minimo
+        if maximo is not None:
+            mascara &= datos[variable] <= maximo
+    return mascara
+
+def matriz_pertenencia(tbs, W, P_atm, zonas: list = ZONAS) -> np.ndarray:
+    """
+    Retorna la matriz booleana (zonas × puntos) de pertenencia de cada punto a cada zona.
+    """
+    datos = variables(tbs, W, P_atm)
+    return np.stack([pertenencia(datos, zona) for zona in zonas])
+
+def clasificar(tbs, W, P_atm, zonas: list = ZONAS) -> np.ndarray:
+    """
+    Retorna el identificador (índice en zonas) de la primera zona a la que pertenece cada punto,
+    o -1 si no pertenece a ninguna.
+
+    Args:
+        tbs: Temperatura de bulbo seco en °C
+        W: Razón de humedad en kg_agua/kg_aire
+        P_atm: Presión atmosférica en kPa
+        zonas: Lista de zonas en orden de prioridad
+    """
+    matriz = matriz_pertenencia(tbs, W, P_atm, zonas)
+    return np.where(matriz.any(axis=0), matriz.argmax(axis=0), -1)
+
+def horas_por_zona(tbs, W, P_atm, zonas: list = ZONAS, intervalo: float = 1.0) -> dict:
+    """
+    Retorna las horas que los datos pasan dentro de cada zona. Un punto que pertenece a varias
+    zonas cuenta en todas ellas.
+
+    Args:
+        tbs: Temperatura de bulbo seco en °C
+        W: Razón de humedad en kg_agua/kg_aire
+        P_atm: Presión atmosférica en kPa
+        zonas: Lista de zonas
+        intervalo: Horas que representa cada dato (10/60 para datos cada 10 minutos)
+    """
+    conteo = matriz_pertenencia(tbs, W, P_atm, zonas).reshape(len(zonas), -1).sum(axis=1)
+    return {zona['nombre']: float(n*intervalo) for zona, n in zip(zonas, conteo)}
+
+def dibujar(ax, P_atm: float, zonas: list = ZONAS, alpha: float = 0.3) -> list:
+    """
+    Dibuja las zonas sobre una carta psicrométrica (ejes tbs y W) y retorna los parches para
+    la leyenda. Las zonas se evalúan en una malla del área visible de la gráfica.
+
+    Args:
+        ax: Ejes de matplotlib de la carta
+        P_atm: Presión atmosférica en kPa
+        zonas: Lista de zonas
+        alpha: Transparencia del relleno
+    """
+    import matplotlib.patches as mpatches
+
+    x_min, x_max = ax.get_xlim()
+    y_min, y_max = ax.get_ylim()
+    X, Y = np.meshgrid(np.linspace(x_min, x_max, 400), np.linspace(y_min, y_max, 400))
+    #Solo se dibuja la región debajo de la curva de saturación
+    debajo = Y <= vpn.razon_hum_saturacion(P_atm, X)
+
+    parches = []
+    for zona, mascara in zip(zonas, matriz_pertenencia(X, Y, P_atm, zonas)):
+        ax.contourf(X, Y, (mascara & debajo).astype(float), levels=[0.5, 1.5], colors=[zona['color']], alpha=alpha)
+        parches.append(mpatches.Patch(color=zona['color'], alpha=alpha, label=zona['nombre']))
+    return parches